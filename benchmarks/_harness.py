@@ -0,0 +1,151 @@
+"""
+Utilitários compartilhados pelos benchmarks
+
+Cada benchmark produz um dicionário {"benchmark", "environment", "results"},
+em que results mapeia o nome da métrica para estatísticas em milissegundos.
+Os resultados podem ser salvos como baseline em JSON e comparados depois,
+falhando quando alguma métrica piora além do limite configurado.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import statistics
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_DIR = os.path.join(REPO_ROOT, "benchmarks", "baselines")
+
+
+def environment():
+    """Descreve a máquina em que o benchmark rodou"""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def summarize(samples_ms):
+    """Estatísticas de uma lista de tempos em milissegundos"""
+    return {
+        "median_ms": statistics.median(samples_ms),
+        "min_ms": min(samples_ms),
+        "max_ms": max(samples_ms),
+        "runs": len(samples_ms),
+    }
+
+
+def time_call(function, repeat=5, number=1, setup=None):
+    """Mede function() e retorna as estatísticas de ms por chamada
+
+    setup, se dado, roda antes de cada repetição e fora da medição.
+    """
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - start) * 1000 / number)
+    return summarize(samples)
+
+
+def make_report(name, results):
+    return {"benchmark": name, "environment": environment(), "results": results}
+
+
+def write_json(path, data):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+
+
+def load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def compare(report, baseline, threshold, min_delta_ms=1.0):
+    """Compara as medianas com a baseline
+
+    Retorna [(métrica, baseline_ms, atual_ms, variação)] e a lista das
+    métricas que pioraram mais que threshold (0.2 = 20%) e mais que
+    min_delta_ms em valor absoluto (evita alarmes em métricas de microssegundos).
+    """
+    rows = []
+    regressions = []
+    for metric, current in report["results"].items():
+        previous = baseline["results"].get(metric)
+        if previous is None:
+            continue
+        before = previous["median_ms"]
+        after = current["median_ms"]
+        change = (after - before) / before if before else 0.0
+        rows.append((metric, before, after, change))
+        if change > threshold and after - before > min_delta_ms:
+            regressions.append(metric)
+    return rows, regressions
+
+
+def print_comparison(rows, regressions, report, baseline):
+    if report["environment"] != baseline.get("environment"):
+        print("Aviso: a baseline foi gerada em outro ambiente; compare com cautela")
+    width = max([len(row[0]) for row in rows] + [7])
+    print(f"{'métrica':<{width}} {'baseline':>10} {'atual':>10} {'variação':>9}")
+    for metric, before, after, change in rows:
+        flag = "  REGRESSÃO" if metric in regressions else ""
+        print(f"{metric:<{width}} {before:>10.2f} {after:>10.2f} {change:>+8.1%}{flag}")
+
+
+def add_baseline_arguments(parser):
+    """Opções comuns: saída JSON, baseline e limite de regressão"""
+    parser.add_argument("--json", metavar="ARQUIVO", help="salva os resultados em JSON")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="grava os resultados como nova baseline")
+    parser.add_argument("--compare", action="store_true",
+                        help="compara com a baseline e falha se houver regressão")
+    parser.add_argument("--baseline", metavar="ARQUIVO",
+                        help="baseline a usar (padrão: benchmarks/baselines/<nome>.json)")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="piora máxima aceita na mediana (padrão: 0.2 = 20%%)")
+    parser.add_argument("--min-delta", type=float, default=1.0,
+                        help="piora mínima em ms para contar como regressão (padrão: 1.0)")
+
+
+def finish(report, args):
+    """Grava e compara os resultados conforme as opções; retorna o código de saída"""
+    path = args.baseline or baseline_path(report["benchmark"])
+    if args.json:
+        write_json(args.json, report)
+    if args.save_baseline:
+        write_json(path, report)
+        print(f"Baseline salva em {path}")
+    if args.compare:
+        if not os.path.exists(path):
+            print(f"Baseline não encontrada: {path}")
+            return 2
+        baseline = load_json(path)
+        rows, regressions = compare(report, baseline, args.threshold, args.min_delta)
+        print_comparison(rows, regressions, report, baseline)
+        if regressions:
+            print(f"{len(regressions)} métrica(s) acima do limite de {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+def setup_headless(chdir=True):
+    """Configura o SDL sem janela e o path dos módulos refatorados"""
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+    refactored = os.path.join(REPO_ROOT, "refactored")
+    if refactored not in sys.path:
+        sys.path.insert(0, refactored)
+    if chdir:
+        os.chdir(REPO_ROOT)
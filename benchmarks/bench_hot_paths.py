@@ -0,0 +1,268 @@
+"""
+Benchmark dos caminhos quentes do jogo e da análise de dados
+
+Roda sem janela (SDL dummy, matplotlib Agg) e mede:
+  render:     draw_playing_state, ArrowMode.draw, menu, instruções e highscores
+  simulation: Escalator.update com N personagens
+  collector:  vazão de record_mouse_position/record_click e tempo de
+              save_session_data conforme o tamanho da sessão
+  dataviz:    leitura do JSON e generate_comprehensive_report conforme o
+              número de sessões
+
+Os dados de sessão são gerados pelo próprio GameDataCollector, então têm
+exatamente o formato gravado pelo jogo. Tudo roda em um diretório
+temporário, sem gravar nada em playerdata/ do repositório.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_hot_paths.py [--only render simulation collector dataviz]
+                                         [--quick] [--json saida.json]
+                                         [--save-baseline | --compare]
+"""
+import os
+import sys
+import time
+import random
+import shutil
+import argparse
+import tempfile
+
+import _harness
+
+_harness.setup_headless()
+
+import matplotlib  # noqa: E402
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+
+from config import *  # noqa: E402,F401
+from characters import load_assets, CharacterFactory  # noqa: E402
+from ui_components import Button, Escalator  # noqa: E402
+from game_modes import ArrowMode  # noqa: E402
+from data_collector import GameDataCollector  # noqa: E402
+from bench_lane_simulation import build_lanes  # noqa: E402
+import rendering  # noqa: E402
+
+DATAVIZ_SRC = os.path.join(_harness.REPO_ROOT, "python-data-viz", "src")
+
+TRAIT_NAMES = ("head", "face", "body", "hat")
+
+
+def bench_render(factory, repeat):
+    """Custo por frame das telas principais"""
+    screen = runtime.screen
+    results = {}
+
+    buttons = [Button(WIDTH // 2 - 140, HEIGHT // 2 + 70 * i, 280, 60, label)
+               for i, label in enumerate(["Modo Aparição Única", "Modo Alternado",
+                                          "Modo Infinito", "Modo Seta Colorida",
+                                          "Como Jogar", "Melhores Pontuações"])]
+    back_button = Button(50, HEIGHT - 100, 160, 50, "Voltar")
+    highscores = {"infinite": [{"name": f"Jogador {i}", "score": 50 - i, "date": "01/01/2025 10:00"}
+                               for i in range(10)],
+                  "arrow": [{"name": f"Jogador {i}", "score": 40 - i, "date": "01/01/2025 10:00"}
+                            for i in range(10)]}
+
+    results["render.menu"] = _harness.time_call(
+        lambda: rendering.draw_menu(screen, buttons), repeat, number=20)
+    results["render.instructions"] = _harness.time_call(
+        lambda: rendering.draw_instructions(screen, back_button), repeat, number=20)
+    results["render.highscores"] = _harness.time_call(
+        lambda: rendering.draw_highscores(screen, highscores, back_button), repeat, number=20)
+
+    # Escadas no regime permanente: personagens espaçados como no jogo
+    escalators = []
+    for i, speed in enumerate(ESCALATOR_SPEEDS):
+        x = ESCALATOR_START_X + i * (ESCALATOR_WIDTH + ESCALATOR_SPACING)
+        escalator = Escalator(x, ESCALATOR_WIDTH, speed, (100, 100, 100), pool=factory.pool)
+        for frame in range(600):
+            if escalator.entry_is_clear(SPAWN_MIN_GAP):
+                escalator.add_character(factory.create_random_character(
+                    x + (ESCALATOR_WIDTH - CHARACTER_SIZE) // 2, -CHARACTER_SIZE))
+            escalator.update()
+        escalators.append(escalator)
+    target = factory.create_random_character(0, 0)
+    start_time = time.time()
+    results["render.playing_state"] = _harness.time_call(
+        lambda: rendering.draw_playing_state(screen, escalators, GAME_MODE_INFINITE, 10,
+                                             60, start_time, target.traits, False),
+        repeat, number=20)
+
+    arrow = ArrowMode()
+
+    def draw_arrow():
+        arrow.update()
+        arrow.draw(screen)
+
+    results["render.arrow_mode"] = _harness.time_call(draw_arrow, repeat, number=20)
+    return results
+
+
+def bench_simulation(factory, repeat, sizes, frames=100):
+    """Escalator.update com N personagens (backend python e numpy)"""
+    results = {}
+    for count in sizes:
+        lanes = {}
+
+        def rebuild():
+            lanes["python"], lanes["numpy"] = build_lanes(factory, count)
+
+        for backend in ("python", "numpy"):
+            results[f"simulation.escalator_update.{backend}.n{count}"] = _harness.time_call(
+                lambda: lanes[backend].update(), repeat, number=frames, setup=rebuild)
+    return results
+
+
+def random_traits(rng):
+    return {slot: {"name": f"{slot}_{rng.randrange(8)}"} for slot in TRAIT_NAMES}
+
+
+def fill_session(collector, rng, game_mode, trials, mouse_samples_per_trial):
+    """Simula uma sessão completa usando a API do coletor"""
+    collector.create_new_session(game_mode)
+    for _ in range(trials):
+        collector.start_new_trial(game_mode)
+        if game_mode != GAME_MODE_ARROW:
+            collector.record_target_spawn(random_traits(rng))
+        for _ in range(mouse_samples_per_trial):
+            collector.record_mouse_position((rng.randrange(WIDTH), rng.randrange(HEIGHT)),
+                                            GAME_STATE_PLAYING)
+        success = rng.random() < 0.8
+        collector.record_click((rng.randrange(WIDTH), rng.randrange(HEIGHT)), success)
+        if game_mode == GAME_MODE_ARROW:
+            quadrant = rng.randrange(4)
+            collector.record_arrow_selection(success, quadrant, quadrant,
+                                             rng.uniform(0, 360), 4.0, success)
+        else:
+            collector.record_selection(success)
+
+
+def new_collector(workdir):
+    collector = GameDataCollector(journal_path=os.path.join(workdir, "journal", "trials.jsonl"))
+    return collector
+
+
+def bench_collector(workdir, repeat, session_seconds):
+    """Vazão do registro de eventos e tempo de salvar sessões de vários tamanhos"""
+    results = {}
+    rng = random.Random(1)
+    collector = new_collector(workdir)
+    collector.create_new_session(GAME_MODE_INFINITE)
+    collector.start_new_trial(GAME_MODE_INFINITE)
+    positions = [(rng.randrange(WIDTH), rng.randrange(HEIGHT)) for _ in range(10000)]
+
+    def record_mouse():
+        for position in positions:
+            collector.record_mouse_position(position, GAME_STATE_PLAYING)
+
+    def reset_tracking():
+        collector.current_session["mouse_tracking"] = []
+
+    results["collector.record_mouse_position.x10000"] = _harness.time_call(
+        record_mouse, repeat, setup=reset_tracking)
+
+    def record_clicks():
+        for position in positions:
+            collector.record_click(position, True)
+
+    def reset_clicks():
+        collector.clicks_positions = []
+
+    results["collector.record_click.x10000"] = _harness.time_call(
+        record_clicks, repeat, setup=reset_clicks)
+    collector.journal.discard()
+
+    # Sessões de N segundos a 60 amostras de mouse por segundo, um acerto a cada 5 s
+    for seconds in session_seconds:
+        collectors = []
+
+        def prepare():
+            collector = new_collector(workdir)
+            fill_session(collector, rng, GAME_MODE_INFINITE, max(1, seconds // 5), 300)
+            collectors.append(collector)
+
+        def save():
+            collectors[-1].save_session_data()
+
+        results[f"collector.save_session_data.{seconds}s"] = _harness.time_call(
+            save, repeat, setup=prepare)
+    return results
+
+
+def write_dataset(workdir, sessions, rng):
+    """Gera um arquivo de dados com N sessões e retorna o caminho"""
+    collector = new_collector(workdir)
+    for i in range(sessions):
+        fill_session(collector, rng, i % 4, 20, 60)
+    collector.create_new_session()
+    path = os.path.join(workdir, f"dataset_{sessions}.json")
+    from persistence import atomic_write_json
+    atomic_write_json(path, collector.all_sessions)
+    collector.journal.discard()
+    return path
+
+
+def bench_dataviz(workdir, repeat, sizes):
+    """Leitura e relatório do python-data-viz conforme o tamanho do arquivo"""
+    sys.path.append(DATAVIZ_SRC)
+    from utils.json_reader import read_json
+    from visualization.game_mode_analysis import generate_comprehensive_report
+
+    results = {}
+    rng = random.Random(2)
+    for sessions in sizes:
+        path = write_dataset(workdir, sessions, rng)
+        data = read_json(path)
+
+        def report():
+            generated = generate_comprehensive_report(data)
+            for figure in generated["figures"].values():
+                plt.close(figure)
+
+        results[f"dataviz.load.{sessions}_sessions"] = _harness.time_call(
+            lambda: read_json(path), repeat)
+        results[f"dataviz.report.{sessions}_sessions"] = _harness.time_call(report, repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    groups = ["render", "simulation", "collector", "dataviz"]
+    parser.add_argument("--only", nargs="+", choices=groups, default=groups)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="tamanhos menores, para CI")
+    _harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    runtime.init()
+    factory = CharacterFactory(load_assets())
+
+    lane_sizes = [10, 100] if args.quick else [10, 100, 1000]
+    session_seconds = [60, 300] if args.quick else [60, 300, 1200]
+    dataset_sizes = [10, 50] if args.quick else [10, 50, 200]
+
+    workdir = tempfile.mkdtemp(prefix="bench_hot_paths_")
+    os.symlink(os.path.join(_harness.REPO_ROOT, "assets"), os.path.join(workdir, "assets"))
+    os.chdir(workdir)
+    results = {}
+    try:
+        if "render" in args.only:
+            results.update(bench_render(factory, args.repeat))
+        if "simulation" in args.only:
+            results.update(bench_simulation(factory, args.repeat, lane_sizes))
+        if "collector" in args.only:
+            results.update(bench_collector(workdir, args.repeat, session_seconds))
+        if "dataviz" in args.only:
+            results.update(bench_dataviz(workdir, args.repeat, dataset_sizes))
+    finally:
+        os.chdir(_harness.REPO_ROOT)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'métrica':<52} {'mediana (ms)':>12} {'mín (ms)':>10}")
+    for metric, stats in results.items():
+        print(f"{metric:<52} {stats['median_ms']:>12.3f} {stats['min_ms']:>10.3f}")
+
+    sys.exit(_harness.finish(_harness.make_report("hot_paths", results), args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmark da simulação das escadas: backend python (Character) x numpy
+
+Mede o custo por frame de Escalator.update com N personagens se movendo ao
+mesmo tempo e confere que os dois backends geram posições idênticas.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_lane_simulation.py [--sizes 100 1000 10000] [--frames 200]
+"""
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(REPO_ROOT, "refactored"))
+os.chdir(REPO_ROOT)
+
+from config import HEIGHT, CHARACTER_SIZE  # noqa: E402
+from characters import load_assets, CharacterFactory  # noqa: E402
+from ui_components import Escalator  # noqa: E402
+from lane_simulation import VectorizedEscalator  # noqa: E402
+
+
+def build_lanes(factory, count, speed=3):
+    """Cria as duas escadas com os mesmos N personagens espalhados na tela"""
+    python_lane = Escalator(0, 150, speed, (100, 100, 100), pool=factory.pool)
+    numpy_lane = VectorizedEscalator(0, 150, speed, (100, 100, 100), factory)
+    steps_on_screen = (HEIGHT + CHARACTER_SIZE) // 20
+    for i in range(count):
+        # Escalonados de baixo para cima (o primeiro é o mais adiantado),
+        # mantendo a ordem de chegada de uma escada real
+        position = (steps_on_screen - 3) * (count - i) / count - 3
+        current_step = int(position // 1)
+        step_position = position - current_step
+
+        if factory.sampler.remaining == 0:
+            factory.reset()
+        character = factory.create_random_character(0, -CHARACTER_SIZE)
+        traits = character.traits
+        python_lane.add_character(character)
+        character.current_step = current_step
+        character.step_position = step_position
+
+        numpy_lane.add_character(factory.pool.acquire(0, -CHARACTER_SIZE, traits))
+        numpy_lane.lane.current_step[i] = current_step
+        numpy_lane.lane.step_position[i] = step_position
+    return python_lane, numpy_lane
+
+
+def time_updates(lane, frames):
+    start = time.perf_counter()
+    for _ in range(frames):
+        lane.update()
+    return (time.perf_counter() - start) / frames * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 5000, 20000])
+    parser.add_argument("--frames", type=int, default=200)
+    args = parser.parse_args()
+
+    factory = CharacterFactory(load_assets())
+
+    print(f"{'N':>8} {'python (ms/frame)':>18} {'numpy (ms/frame)':>17} {'speedup':>8}  posições")
+    for count in args.sizes:
+        python_lane, numpy_lane = build_lanes(factory, count)
+        python_ms = time_updates(python_lane, args.frames)
+        numpy_ms = time_updates(numpy_lane, args.frames)
+
+        python_y = [c.y for c in python_lane.characters]
+        numpy_y = numpy_lane.lane.y[:numpy_lane.lane.count].tolist()
+        identical = python_y == numpy_y
+
+        print(f"{count:>8} {python_ms:>18.3f} {numpy_ms:>17.3f} "
+              f"{python_ms / numpy_ms:>7.1f}x  {'idênticas' if identical else 'DIFERENTES'}")
+        if not identical:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
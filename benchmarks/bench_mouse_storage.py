@@ -0,0 +1,147 @@
+"""
+Benchmark do armazenamento do mouse: lista JSON x blocos comprimidos
+
+Gera sessões com o mouse amostrado a 60 Hz (movimentos com pausas, uma
+tentativa a cada 5 s) e mede:
+  tamanho:  JSON do jogo (indent=2), JSON compacto, JSON + gzip e arquivo .mouse
+  gravação: write_sessions (lado do jogo) x atomic_write_json da lista inline
+  leitura:  uma tentativa (~5 s) do arquivo .mouse com o índice já aberto e
+            abrindo o arquivo, x ler o JSON inteiro e filtrar
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_mouse_storage.py [--minutes 1 10 60] [--repeat 5]
+                                             [--json saida.json] [--save-baseline | --compare]
+"""
+import os
+import sys
+import gzip
+import json
+import math
+import random
+import shutil
+import argparse
+import tempfile
+
+import _harness
+
+_harness.setup_headless()
+
+from config import GAME_STATE_PLAYING, WIDTH, HEIGHT  # noqa: E402
+from mouse_chunks import write_sessions  # noqa: E402
+from persistence import atomic_write_json  # noqa: E402
+
+sys.path.append(os.path.join(_harness.REPO_ROOT, "python-data-viz", "src"))
+from utils.mouse_store import MouseChunkFile, mouse_samples  # noqa: E402
+from utils.dataset import load_sessions  # noqa: E402
+
+SAMPLE_RATE = 60
+TRIAL_SECONDS = 5
+
+
+def make_session(rng, minutes, start=1.75e9):
+    """Sessão no formato do GameDataCollector com minutes minutos de mouse"""
+    samples, trials = [], []
+    x, y = WIDTH / 2, HEIGHT / 2
+    target = (x, y)
+    count = int(minutes * 60 * SAMPLE_RATE)
+    for i in range(count):
+        t = start + i / SAMPLE_RATE + rng.uniform(-0.002, 0.002)
+        if i % (TRIAL_SECONDS * SAMPLE_RATE) == 0:
+            trials.append({"trial_start_time": t, "selection_time": t + TRIAL_SECONDS - 0.1,
+                           "game_mode": 2, "success": True, "reaction_time": 1.0})
+        if rng.random() < 0.02:
+            target = (rng.uniform(0, WIDTH), rng.uniform(0, HEIGHT))
+        # Aproxima-se do alvo e fica parado ao chegar, como um movimento real
+        distance = math.hypot(target[0] - x, target[1] - y)
+        if distance > 2:
+            step = min(distance, 25) / distance
+            x += (target[0] - x) * step
+            y += (target[1] - y) * step
+        samples.append({"timestamp": t, "x": int(x), "y": int(y),
+                        "game_state": GAME_STATE_PLAYING})
+    return {"session_id": f"bench_{minutes}", "username": "bench", "game_mode": 2,
+            "trials": trials, "mouse_tracking": samples, "session_metrics": {}}
+
+
+def file_size(path):
+    return os.path.getsize(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--minutes", type=float, nargs="+", default=[1, 10, 60])
+    parser.add_argument("--repeat", type=int, default=5)
+    _harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    workdir = tempfile.mkdtemp(prefix="bench_mouse_storage_")
+    results = {}
+    sizes = []
+    try:
+        for minutes in args.minutes:
+            session = make_session(rng, minutes)
+            data = {"sessions": [session]}
+            samples = len(session["mouse_tracking"])
+            inline_path = os.path.join(workdir, f"inline_{minutes}.json")
+            chunked_path = os.path.join(workdir, f"chunked_{minutes}.json")
+
+            def write_inline():
+                atomic_write_json(inline_path, data, indent=2)
+
+            def write_chunked():
+                atomic_write_json(chunked_path, {"sessions": write_sessions(chunked_path, data["sessions"])},
+                                  indent=2)
+
+            label = f"{minutes:g}min"
+            results[f"write.inline_json.{label}"] = _harness.time_call(write_inline, args.repeat)
+            results[f"write.chunked.{label}"] = _harness.time_call(write_chunked, args.repeat)
+
+            compact = json.dumps(data, separators=(",", ":")).encode()
+            mouse_path = os.path.splitext(chunked_path)[0] + ".mouse"
+            chunked_size = file_size(chunked_path) + file_size(mouse_path)
+            sizes.append((label, samples, file_size(inline_path), len(compact),
+                          len(gzip.compress(compact)), chunked_size,
+                          results[f"write.chunked.{label}"]["median_ms"]))
+
+            # Uma tentativa no meio da sessão
+            trial = session["trials"][len(session["trials"]) // 2]
+            window = (trial["trial_start_time"], trial["selection_time"])
+            chunked_session = load_sessions(chunked_path)[0]
+            chunk_file = MouseChunkFile(mouse_path)
+
+            def read_warm():
+                chunk_file.read(session["session_id"], *window)
+
+            def read_cold():
+                MouseChunkFile(mouse_path).read(session["session_id"], *window)
+
+            def read_inline():
+                mouse_samples(load_sessions(inline_path)[0], *window)
+
+            results[f"read_trial.chunked_warm.{label}"] = _harness.time_call(read_warm, args.repeat, 20)
+            results[f"read_trial.chunked_cold.{label}"] = _harness.time_call(read_cold, args.repeat, 5)
+            results[f"read_trial.inline_json.{label}"] = _harness.time_call(read_inline, args.repeat)
+            results[f"read_session.chunked.{label}"] = _harness.time_call(
+                lambda: mouse_samples(chunked_session), args.repeat)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'sessão':>8} {'amostras':>9} {'JSON jogo':>11} {'JSON compacto':>14} "
+          f"{'JSON+gzip':>10} {'blocos':>9} {'razão':>7} {'gravação (amostras/s)':>22}")
+    for label, samples, inline, compact, gzipped, chunked, write_ms in sizes:
+        print(f"{label:>8} {samples:>9} {inline:>11} {compact:>14} {gzipped:>10} {chunked:>9} "
+              f"{inline / chunked:>6.1f}x {samples / (write_ms / 1000):>22,.0f}")
+    print()
+    print(f"{'métrica':<40} {'mediana (ms)':>12} {'mín (ms)':>10}")
+    for metric, stats in results.items():
+        print(f"{metric:<40} {stats['median_ms']:>12.3f} {stats['min_ms']:>10.3f}")
+
+    report = _harness.make_report("mouse_storage", results)
+    report["sizes"] = [dict(zip(("session", "samples", "json_bytes", "compact_json_bytes",
+                                 "gzip_json_bytes", "chunked_bytes"), row[:6])) for row in sizes]
+    sys.exit(_harness.finish(report, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Benchmark do tempo de inicialização até o primeiro frame interativo
+
+Mede refactored/main.py e game.py (e, com --entry dataviz, a ferramenta de
+análise python-data-viz) em processos novos, com duas condições:
+  cold: cache de bytecode vazio (PYTHONPYCACHEPREFIX novo a cada execução),
+        como na primeira execução depois de instalar/atualizar o jogo
+  warm: bytecode já compilado, como nas reinicializações entre participantes
+O cache de disco do sistema operacional não é limpo (exigiria root).
+
+Cada execução é dividida em fases (interpretador, imports, criação do Game,
+primeiro frame e, no refatorado, as etapas registradas em runtime.timings).
+Uma execução extra com -X importtime lista os módulos mais caros.
+
+Uso (na raiz do repositório):
+    python benchmarks/bench_startup.py [--runs 5] [--entry refactored game dataviz]
+                                       [--json saida.json] [--save-baseline | --compare]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+import _harness
+
+# Código executado no processo filho; imprime as fases em JSON
+CHILD_TEMPLATES = {
+    "refactored": """
+import time
+start = time.perf_counter()
+import sys, json
+sys.path[:0] = [{repo!r}, {refactored!r}]
+import refactored.main as entry
+imported = time.perf_counter()
+game = entry.Game()
+created = time.perf_counter()
+game.handle_events(); game.update(); game.draw()
+ready = time.perf_counter()
+phases = {{"phase." + name: seconds * 1000 for name, seconds in entry.runtime.timings.items()}}
+""",
+    "game": """
+import time
+start = time.perf_counter()
+import sys, json
+sys.path[:0] = [{repo!r}]
+import game as entry
+imported = time.perf_counter()
+game = entry.Game()
+created = time.perf_counter()
+game.handle_events(); game.update(); game.draw()
+ready = time.perf_counter()
+phases = {{}}
+""",
+    # Ferramenta de análise: import até a janela; init = pré-carregamento das bibliotecas
+    "dataviz": """
+import time
+start = time.perf_counter()
+import sys, json
+sys.path[:0] = [{dataviz!r}]
+import main as entry
+imported = time.perf_counter()
+entry.visualization.preload()
+created = ready = time.perf_counter()
+phases = {{}}
+""",
+}
+
+ENTRY_MODULES = {"refactored": "refactored.main", "game": "game", "dataviz": "main"}
+
+CHILD_REPORT = """
+phases.update({"import": (imported - start) * 1000,
+               "init": (created - imported) * 1000,
+               "first_frame": (ready - created) * 1000})
+print("BENCH_RESULT " + json.dumps(phases))
+"""
+
+
+def make_workdir():
+    """Diretório temporário com os assets, para os dados gerados não sujarem o repositório"""
+    workdir = tempfile.mkdtemp(prefix="bench_startup_")
+    os.symlink(os.path.join(_harness.REPO_ROOT, "assets"), os.path.join(workdir, "assets"))
+    return workdir
+
+
+def run_child(entry, workdir, pycache_prefix, extra_args=()):
+    """Executa uma inicialização; retorna (fases em ms, stderr)"""
+    code = CHILD_TEMPLATES[entry].format(
+        repo=_harness.REPO_ROOT,
+        refactored=os.path.join(_harness.REPO_ROOT, "refactored"),
+        dataviz=os.path.join(_harness.REPO_ROOT, "python-data-viz", "src")) + CHILD_REPORT
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy",
+               PYTHONPYCACHEPREFIX=pycache_prefix)
+    # O cache warm só existe se o bytecode puder ser gravado
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    spawned = time.perf_counter()
+    process = subprocess.run([sys.executable, *extra_args, "-c", code], cwd=workdir, env=env,
+                             capture_output=True, text=True, timeout=300)
+    wall = (time.perf_counter() - spawned) * 1000
+    if process.returncode != 0:
+        raise RuntimeError(f"{entry} falhou:\n{process.stderr}")
+    line = next(l for l in process.stdout.splitlines() if l.startswith("BENCH_RESULT "))
+    phases = json.loads(line[len("BENCH_RESULT "):])
+    # Inclui o tempo de subir o interpretador e de encerrar o processo
+    phases["total"] = wall
+    phases["interpreter"] = wall - phases["import"] - phases["init"] - phases["first_frame"]
+    return phases, process.stderr
+
+
+def parse_importtime(stderr, entry_module, top=15):
+    """Lê a saída de -X importtime
+
+    Retorna os módulos com maior tempo próprio e os imports feitos
+    diretamente pelo módulo de entrada, ordenados pelo tempo acumulado.
+    """
+    modules = []
+    children = []
+    entry_children = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        module = {"module": name.strip(), "depth": depth,
+                  "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000}
+        modules.append(module)
+        # Os filhos aparecem antes do módulo que os importou
+        if depth == 1:
+            children.append(module)
+        elif depth == 0:
+            if module["module"] == entry_module:
+                entry_children = children
+            children = []
+    by_self = sorted(modules, key=lambda m: m["self_ms"], reverse=True)[:top]
+    by_entry = sorted(entry_children, key=lambda m: m["cumulative_ms"], reverse=True)[:top]
+    return {"top_self": by_self, "entry_imports": by_entry}
+
+
+def benchmark_entry(entry, runs, workdir):
+    """Coleta as fases de runs execuções cold e runs warm"""
+    samples = {}
+    warm_cache = tempfile.mkdtemp(prefix="bench_pycache_")
+    try:
+        for condition in ("cold", "warm"):
+            if condition == "warm":
+                run_child(entry, workdir, warm_cache)  # compila o bytecode
+            for _ in range(runs):
+                if condition == "cold":
+                    cache = tempfile.mkdtemp(prefix="bench_pycache_")
+                    phases, _ = run_child(entry, workdir, cache)
+                    shutil.rmtree(cache, ignore_errors=True)
+                else:
+                    phases, _ = run_child(entry, workdir, warm_cache)
+                for phase, ms in phases.items():
+                    samples.setdefault(f"{entry}.{condition}.{phase}", []).append(ms)
+
+        _, stderr = run_child(entry, workdir, warm_cache, ("-X", "importtime"))
+        imports = parse_importtime(stderr, ENTRY_MODULES[entry])
+    finally:
+        shutil.rmtree(warm_cache, ignore_errors=True)
+    return {metric: _harness.summarize(values) for metric, values in samples.items()}, imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--entry", nargs="+", choices=sorted(CHILD_TEMPLATES),
+                        default=["refactored", "game"])
+    _harness.add_baseline_arguments(parser)
+    args = parser.parse_args()
+
+    workdir = make_workdir()
+    results = {}
+    imports = {}
+    try:
+        for entry in args.entry:
+            entry_results, imports[entry] = benchmark_entry(entry, args.runs, workdir)
+            results.update(entry_results)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    print(f"{'métrica':<40} {'mediana (ms)':>12} {'mín (ms)':>10}")
+    for metric, stats in results.items():
+        print(f"{metric:<40} {stats['median_ms']:>12.1f} {stats['min_ms']:>10.1f}")
+    for entry, entry_imports in imports.items():
+        print(f"\nImports mais caros de {ENTRY_MODULES[entry]} (warm, acumulado):")
+        for module in entry_imports["entry_imports"][:8]:
+            print(f"  {module['module']:<36} {module['cumulative_ms']:>8.1f} ms")
+
+    report = _harness.make_report("startup", results)
+    report["imports"] = imports
+    sys.exit(_harness.finish(report, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ import time
 import os
 import json
 from datetime import datetime
+from refactored.trait_space import CombinationSampler
 
 # Inicializa o pygame
 pygame.init()
@@ -266,7 +267,18 @@ class CharacterFactory:
         self.assets = assets
         self.created_characters = []
         self.all_possible_combinations = self._generate_all_possible_combinations()
-        self.available_combinations = self.all_possible_combinations.copy()
+        # Sorteio sem repetição em O(1) sobre os índices das combinações (o mesmo da versão refatorada)
+        self.sampler = CombinationSampler(len(self.all_possible_combinations))
+        self.combination_codes = {self._traits_key(traits): code
+                                  for code, traits in enumerate(self.all_possible_combinations)}
+    
+    @staticmethod
+    def _traits_key(traits):
+        return tuple(traits[trait]["name"] for trait in ("head", "face", "body", "hat"))
+    
+    def code_for_traits(self, traits):
+        # Índice da combinação de características (usado para excluí-la do sorteio)
+        return self.combination_codes[self._traits_key(traits)]
     
     def _generate_all_possible_combinations(self):
         # Gera todas as combinações possíveis de características
@@ -286,19 +298,21 @@ class CharacterFactory:
     
     def reset(self):
         # Reinicia as combinações disponíveis
-        self.available_combinations = self.all_possible_combinations.copy()
+        self.sampler.reset()
         self.created_characters = []
     
-    def create_random_character(self, x, y):
+    def create_random_character(self, x, y, exclude=()):
         # Cria um personagem aleatório com características únicas
-        if not self.available_combinations:
+        # exclude: índices de combinações que não podem ser sorteadas (ex.: o alvo)
+        index = self.sampler.draw(exclude)
+        if index is None:
             print("Aviso: Não há mais combinações únicas disponíveis!")
             # Se usamos todas as combinações, regeneramos a lista
-            self.available_combinations = self.all_possible_combinations.copy()
-        
-        # Obtém uma combinação aleatória de características
-        traits = random.choice(self.available_combinations)
-        self.available_combinations.remove(traits)
+            self.sampler.reset()
+            index = self.sampler.draw(exclude)
+            if index is None:
+                raise ValueError("Todas as combinações de características estão excluídas")
+        traits = self.all_possible_combinations[index]
         
         # Cria e retorna um novo personagem
         character = Character(x, y, traits)
@@ -863,6 +877,7 @@ class Game:
         self.game_mode = GAME_MODE_SINGLE
         self.target_character = None
         self.target_traits = None
+        self.target_code = None
         self.display_target_time = 4  # segundos para exibir o alvo
         self.is_first_target = True  # Para controlar se é o primeiro alvo ou não
         self.target_display_start = 0
@@ -1138,6 +1153,7 @@ class Game:
             HEIGHT//2 - CHARACTER_SIZE//2
         )
         self.target_traits = self.target_character.traits
+        self.target_code = self.character_factory.code_for_traits(self.target_traits)
         self.target_display_start = time.time()
         self.has_target_spawned = False
         self.target_spawn_count = 0
@@ -1365,11 +1381,9 @@ class Game:
             self.target_spawn_count += 1
             self.data_collector.record_target_spawn(self.target_traits)
         else:
-            # Cria um personagem aleatório (garante que não seja igual ao alvo)
-            while True:
-                character = self.character_factory.create_random_character(char_x, char_y)
-                if character.traits != self.target_traits:
-                    break
+            # Cria um personagem aleatório, sem sortear a combinação do alvo
+            exclude = () if self.target_code is None else (self.target_code,)
+            character = self.character_factory.create_random_character(char_x, char_y, exclude=exclude)
         
         escalator.add_character(character)
     
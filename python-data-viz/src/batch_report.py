@@ -0,0 +1,269 @@
+"""
+Geração de relatórios em lote, sem interface gráfica
+
+Roda as mesmas análises da janela de relatório (analyze_reaction_times,
+analyze_success_rates, os gráficos plot_* e o mapa de calor) com o backend
+Agg sobre todos os arquivos de dados de um diretório e grava:
+  <saída>/geral/                     tabela de jogos e relatório de todos os dados
+  <saída>/modos/<modo>/              relatório de cada modo de jogo
+  <saída>/participantes/<jogador>/   relatório e mapa de calor de cada jogador
+
+Os arquivos são lidos e os relatórios renderizados em um pool de processos.
+Nos segmentos diários (um arquivo com muitos participantes), a tarefa de cada
+participante lê só as suas sessões, com um seek na posição registrada no
+índice do quiosque.
+
+Uso (em python-data-viz/src):
+    python batch_report.py ../../playerdata --output ../relatorios
+    python batch_report.py dados1.json dados2.json --formats png csv --workers 8
+"""
+import os
+import sys
+import time
+import argparse
+import traceback
+import multiprocessing
+
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+from matplotlib.backends.backend_pdf import PdfPages
+import pandas as pd
+
+from utils.dataset import (
+    find_data_files,
+    load_sessions,
+    safe_name,
+    build_tables,
+    trials_by_mode_from_table
+)
+from utils.cache import DatasetCache
+from utils.mouse_store import mouse_records
+from utils.schema import check_file
+from utils.session_index import segment_positions, read_sessions_at
+from visualization.game_mode_analysis import (
+    build_report,
+    get_mode_name,
+    GAME_MODE_INFINITE,
+    GAME_MODE_ARROW
+)
+from visualization.heatmap import build_heatmap_figure
+from config.settings import CACHE_DIR
+
+FORMATS = ("png", "pdf", "csv")
+HEATMAP_MAX_POINTS = 5000
+
+
+def index_file(task):
+    """Lê um arquivo e extrai o que o processo principal precisa para distribuir o trabalho
+
+    Retorna os índices das sessões de cada jogador (com as posições delas, nos
+    segmentos .jsonl), as linhas da tabela de jogos e as tentativas por modo
+    (sem o rastreamento do mouse). Com cache_dir, as
+    tabelas vêm do DatasetCache e o JSON só é lido se o arquivo for novo. Com
+    validate, um arquivo fora do esquema é recusado com a posição dos problemas.
+    """
+    path, cache_dir, validate = task
+    try:
+        if cache_dir:
+            if validate:
+                check_file(path)
+            tables, _ = DatasetCache(cache_dir).get_tables(path)
+        else:
+            tables = build_tables(load_sessions(path, validate=validate))
+        games = tables['games']
+        positions = segment_positions(path)
+        participants = {}
+        for username, indices in games.groupby('Nome do Usuário')['session_index']:
+            indices = sorted(set(indices.tolist()))
+            participants[username] = (indices, [positions[index] for index in indices]
+                                      if positions is not None else None)
+        rows = games.drop(columns='session_index').to_dict('records')
+        for row in rows:
+            row['Arquivo'] = path
+        trials_by_mode = trials_by_mode_from_table(tables['trials'])
+        return {'path': path, 'participants': participants, 'rows': rows,
+                'trials_by_mode': trials_by_mode, 'mouse_features': tables['mouse_features'],
+                'error': None}
+    except Exception as e:
+        return {'path': path, 'error': f"{type(e).__name__}: {e}"}
+
+
+def participant_sessions(path, indices, positions):
+    """Sessões de um participante no arquivo: seek nos segmentos, leitura completa nos JSON antigos"""
+    if positions is not None:
+        return read_sessions_at(path, positions)
+    return load_sessions(path, indices=indices)
+
+
+def write_report(directory, report, formats, dpi, tables=None):
+    """Grava as tabelas em CSV, cada figura em PNG e todas as figuras em um único PDF"""
+    os.makedirs(directory, exist_ok=True)
+    figures = report['figures']
+    try:
+        if 'csv' in formats:
+            report['reaction_time_stats'].to_csv(
+                os.path.join(directory, 'tempos_de_reacao.csv'), index=False)
+            report['success_rate_stats'].to_csv(
+                os.path.join(directory, 'taxas_de_sucesso.csv'), index=False)
+            report['trajectory_stats'].to_csv(
+                os.path.join(directory, 'trajetorias.csv'), index=False)
+            for name, table in (tables or {}).items():
+                table.to_csv(os.path.join(directory, f'{name}.csv'), index=False)
+        if 'png' in formats:
+            for name, figure in figures.items():
+                figure.savefig(os.path.join(directory, f'{name}.png'), dpi=dpi)
+        if 'pdf' in formats:
+            with PdfPages(os.path.join(directory, 'relatorio.pdf')) as pdf:
+                for figure in figures.values():
+                    pdf.savefig(figure)
+    finally:
+        for figure in figures.values():
+            plt.close(figure)
+
+
+def render_task(task):
+    """Renderiza um relatório (geral, de um modo ou de um participante) em um processo do pool
+
+    Retorna (tipo, nome, diretório, segundos, erro).
+    """
+    kind, name, payload, options = task
+    started = time.perf_counter()
+    if kind == 'participante':
+        directory = os.path.join(options['output'], 'participantes', safe_name(name))
+    elif kind == 'modo':
+        directory = os.path.join(options['output'], 'modos', safe_name(get_mode_name(name)))
+    else:
+        directory = os.path.join(options['output'], 'geral')
+    try:
+        tables = {}
+        if kind == 'participante':
+            trials, games, features, mouse_tracking = [], [], [], []
+            for path, indices, positions in payload:
+                sessions = None
+                if options['cache_dir']:
+                    file_tables, _ = DatasetCache(options['cache_dir']).get_tables(path)
+                    file_tables = {name: table[table['session_index'].isin(indices)]
+                                   for name, table in file_tables.items()}
+                else:
+                    # Sem cache, as tabelas vêm só das sessões do participante
+                    sessions = participant_sessions(path, indices, positions)
+                    # Volta à numeração das sessões no arquivo
+                    file_index = dict(enumerate(indices))
+                    file_tables = {name: table.assign(session_index=table['session_index'].map(file_index))
+                                   for name, table in build_tables(sessions).items()}
+                trials.append(file_tables['trials'])
+                games.append(file_tables['games'].drop(columns='session_index'))
+                features.append(file_tables['mouse_features'])
+                if options['heatmap']:
+                    # O rastreamento do mouse não fica no cache; só ele exige ler as sessões (e os blocos)
+                    if sessions is None:
+                        sessions = participant_sessions(path, indices, positions)
+                    for session in sessions:
+                        mouse_tracking.extend(mouse_records(session))
+            features = pd.concat(features)
+            report = build_report(trials_by_mode_from_table(pd.concat(trials)), features)
+            tables['jogos'] = pd.concat(games)
+            tables['trajetorias_por_tentativa'] = features
+            if options['heatmap']:
+                report['figures']['mapa_de_calor'] = build_heatmap_figure(
+                    {'mouse_tracking': mouse_tracking}, max_points=HEATMAP_MAX_POINTS)
+        else:
+            trials_by_mode, features = payload
+            report = build_report(trials_by_mode, features)
+            if kind == 'modo' and name not in (GAME_MODE_INFINITE, GAME_MODE_ARROW):
+                # A progressão de pontuação só existe nos modos Infinito e Seta
+                plt.close(report['figures'].pop('score_progression'))
+        write_report(directory, report, options['formats'], options['dpi'], tables)
+        return kind, name, directory, time.perf_counter() - started, None
+    except Exception:
+        return kind, name, directory, time.perf_counter() - started, traceback.format_exc()
+
+
+def run_batch(paths, output, formats=FORMATS, workers=None, heatmap=True, dpi=100,
+              participants=True, modes=True, cache_dir=CACHE_DIR, validate=False, log=print):
+    """Gera os relatórios de todos os arquivos em paths; retorna a lista de erros"""
+    files = find_data_files(paths)
+    if not files:
+        log("Nenhum arquivo JSON encontrado")
+        return ["nenhum arquivo"]
+    workers = workers or os.cpu_count() or 1
+    options = {'output': output, 'formats': tuple(formats), 'heatmap': heatmap, 'dpi': dpi,
+               'cache_dir': cache_dir}
+    errors = []
+
+    with multiprocessing.Pool(workers) as pool:
+        # Etapa 1: leitura dos arquivos
+        by_participant = {}
+        all_trials = {}
+        all_features = []
+        rows = []
+        for result in pool.imap_unordered(index_file, [(path, cache_dir, validate)
+                                                          for path in files]):
+            if result['error']:
+                errors.append(f"{result['path']}: {result['error']}")
+                log(f"Erro ao ler {result['path']}: {result['error']}")
+                continue
+            for username, (indices, positions) in result['participants'].items():
+                by_participant.setdefault(username, []).append(
+                    (result['path'], indices, positions))
+            for mode, trials in result['trials_by_mode'].items():
+                all_trials.setdefault(mode, []).extend(trials)
+            all_features.append(result['mouse_features'])
+            rows.extend(result['rows'])
+        log(f"{len(files)} arquivo(s), {len(by_participant)} participante(s), {len(rows)} jogo(s)")
+
+        # Etapa 2: relatórios em paralelo
+        features = pd.concat(all_features, ignore_index=True) if all_features else None
+        tasks = [('geral', 'geral', (all_trials, features), options)]
+        if modes:
+            tasks.extend(('modo', mode, ({mode: trials}, features[features['game_mode'] == mode]),
+                          options)
+                         for mode, trials in sorted(all_trials.items()) if trials)
+        if participants:
+            tasks.extend(('participante', username, sources, options)
+                         for username, sources in sorted(by_participant.items()))
+        for done, (kind, name, directory, seconds, error) in enumerate(
+                pool.imap_unordered(render_task, tasks), start=1):
+            label = get_mode_name(name) if kind == 'modo' else name
+            if error:
+                errors.append(f"{kind} {label}: {error}")
+                log(f"[{done}/{len(tasks)}] Erro em {kind} {label}:\n{error}")
+            else:
+                log(f"[{done}/{len(tasks)}] {kind} {label} -> {directory} ({seconds:.1f} s)")
+
+    if 'csv' in formats and rows:
+        os.makedirs(os.path.join(output, 'geral'), exist_ok=True)
+        pd.DataFrame(rows).to_csv(os.path.join(output, 'geral', 'jogos.csv'), index=False)
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera relatórios de análise em lote, sem interface gráfica")
+    parser.add_argument("paths", nargs="+", help="arquivos JSON ou diretórios (busca recursiva)")
+    parser.add_argument("--output", default="relatorios", help="diretório de saída")
+    parser.add_argument("--formats", nargs="+", choices=FORMATS, default=list(FORMATS))
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--dpi", type=int, default=100)
+    parser.add_argument("--no-heatmap", action="store_true", help="não gera os mapas de calor")
+    parser.add_argument("--no-participants", action="store_true",
+                        help="não gera os relatórios por participante")
+    parser.add_argument("--no-modes", action="store_true", help="não gera os relatórios por modo")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="diretório do cache de tabelas")
+    parser.add_argument("--no-cache", action="store_true", help="reprocessa todos os arquivos")
+    parser.add_argument("--validate", action="store_true",
+                        help="confere os arquivos com o esquema e ignora os inválidos")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    errors = run_batch(args.paths, args.output, args.formats, args.workers,
+                       heatmap=not args.no_heatmap, dpi=args.dpi,
+                       participants=not args.no_participants, modes=not args.no_modes,
+                       cache_dir=None if args.no_cache else args.cache_dir,
+                       validate=args.validate)
+    print(f"Concluído em {time.perf_counter() - started:.1f} s com {len(errors)} erro(s)")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
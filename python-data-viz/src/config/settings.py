@@ -1,4 +1,5 @@
 # settings.py
+import os
 
 # Configuração de visualização de dados para o jogo
 DATA_FILE_PATH = 'path/to/your/game_output.json'
@@ -6,4 +7,9 @@ HEATMAP_COLOR_MAP = 'viridis'
 HEATMAP_TITLE = 'Heat Map Movimento do Mouse'
 HEATMAP_X_LABEL = 'Modo de Jogo'
 HEATMAP_Y_LABEL = 'Pontuação'
-HEATMAP_SAVE_PATH = 'output/heatmap.png'
\ No newline at end of file
+HEATMAP_SAVE_PATH = 'output/heatmap.png'
+
+# Cache das tabelas derivadas (tentativas, jogos, características do mouse)
+CACHE_DIR = os.environ.get(
+    'DATAVIZ_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'memory-escalator-dataviz'))
@@ -1,10 +1,25 @@
+import time
+_START = time.perf_counter()
+
+import queue
+import threading
 from tkinter import filedialog, simpledialog
 import tkinter as tk
 from utils.json_reader import read_json
-from visualization.heatmap import generate_heatmap
-from visualization.game_mode_analysis import generate_comprehensive_report, display_report_window
+from utils.dataset import (
+    summarize_games,
+    get_sessions,
+    trials_by_mode_from_table,
+    attach_mouse_chunks
+)
+from utils.cache import DatasetCache
+from utils.session_index import SessionReader
+# Leve: pandas, matplotlib e seaborn só carregam no primeiro uso (ver preload_in_background)
+import visualization
+
+_IMPORT_TIME = time.perf_counter() - _START
 
-def display_data_table(data, on_heatmap_request=None):
+def display_data_table(data, on_heatmap_request=None, tables=None, path=None):
     """
     Exibe os dados do jogo em formato tabular incluindo ID do jogador, tempo médio de reação, etc.
     Para cada modo de jogo jogado em uma sessão, mostrando entradas separadas para cada "novo jogo".
@@ -12,140 +27,49 @@ def display_data_table(data, on_heatmap_request=None):
     Args:
         data: Os dados JSON carregados contendo as sessões de jogo
         on_heatmap_request: Função de callback para gerar mapa de calor para a sessão selecionada
+        tables: Tabelas derivadas do cache (DatasetCache.get_tables); se dadas, a tabela
+            de jogos e o relatório usam as colunas prontas em vez de reprocessar as sessões
+        path: Arquivo de dados; com data None (tabelas do cache), as sessões são lidas
+            dele só quando pedidas (mapa de calor, detalhes e exportação)
     """
     try:
         import pandas as pd
         from tkinter import Toplevel, ttk
         
-        # Obtém todas as sessões dos dados
-        sessions = data.get('sessions', [])
-        
-        # Se os dados não estiverem no novo formato (com sessões), tenta tratar como uma única sessão
-        if not sessions and isinstance(data, dict):
-            sessions = [data]
+        # Obtém todas as sessões dos dados (None se as tabelas vieram do cache sem ler o JSON)
+        sessions = None
+        if data is not None:
+            sessions = data.get('sessions', [])
             
-        if not sessions:
+            # Se os dados não estiverem no novo formato (com sessões), tenta tratar como uma única sessão
+            if not sessions and isinstance(data, dict):
+                sessions = [data]
+                
+            if not sessions:
+                tk.messagebox.showerror("Erro de Dados", "Nenhuma sessão de jogo válida encontrada no arquivo selecionado.")
+                return
+        elif tables is None:
             tk.messagebox.showerror("Erro de Dados", "Nenhuma sessão de jogo válida encontrada no arquivo selecionado.")
             return
+        
+        # Sessões lidas sob demanda: seek no segmento diário ou uma única leitura do JSON
+        reader = SessionReader(path) if sessions is None else None
+        loaded_sessions = {}
+        
+        def session_at(session_idx):
+            if sessions is not None:
+                return sessions[session_idx]
+            if session_idx not in loaded_sessions:
+                loaded_sessions[session_idx] = reader[session_idx]
+            return loaded_sessions[session_idx]
             
-        # Prepara os dados da tabela
-        table_data = []
-        session_index_map = {}  # Mapeia linhas da tabela para índices de sessão
-        
-        # Processa cada sessão
-        for session_idx, session in enumerate(sessions):
-            username = session.get('username', 'Unknown')
-            session_id = session.get('session_id', f'Session {session_idx+1}')
-            
-            # Obtém todas as tentativas para esta sessão
-            all_trials = session.get('trials', [])
-            
-            # Analisa tentativas em jogos - cada mudança de "modo de jogo" ou quebra de sequência indica um novo jogo
-            games = []
-            current_game = {"trials": [], "game_mode": None}
-            
-            for i, trial in enumerate(all_trials):
-                trial_game_mode = trial.get('game_mode', None)
-                trial_start_time = trial.get('trial_start_time', None)
-                
-                # Verifica se este é um novo jogo (mudança de modo ou primeira tentativa)
-                if current_game["game_mode"] is None:
-                    current_game["game_mode"] = trial_game_mode
-                    current_game["start_time"] = trial_start_time
-                    
-                # Se o modo de jogo mudar ou houver uma lacuna significativa de tempo, este é um novo jogo
-                elif trial_game_mode != current_game["game_mode"]:
-                    # Salva o jogo anterior
-                    if current_game["trials"]:
-                        games.append(current_game)
-                    # Inicia um novo jogo
-                    current_game = {
-                        "trials": [],
-                        "game_mode": trial_game_mode,
-                        "start_time": trial_start_time
-                    }
-                
-                # Adiciona a tentativa ao jogo atual
-                current_game["trials"].append(trial)
-            
-            # Não esqueça de adicionar o último jogo
-            if current_game["trials"]:
-                games.append(current_game)
-            
-            # Processa cada jogo dentro desta sessão
-            for i, game in enumerate(games):
-                game_mode = game["game_mode"]
-                trials = game["trials"]
-                
-                # Torna o modo de jogo mais amigável para o usuário
-                game_mode_display = game_mode
-                if game_mode == 0 or game_mode == "0":
-                    game_mode_display = "Modo de Aparição Única"
-                elif game_mode == 1 or game_mode == "1":
-                    game_mode_display = "Modo Alternado"
-                elif game_mode == 2 or game_mode == "2":
-                    game_mode_display = "Modo Infinito"
-                elif game_mode == 3 or game_mode == "3":
-                    game_mode_display = "Modo Seta Colorida"
-                else:
-                    game_mode_display = f"Modo Desconhecido ({game_mode})"
-                    
-                # Calcula pontuação e taxa de sucesso
-                successful_trials = sum(1 for trial in trials if trial.get('success', False))
-                total_trials = len(trials)
-                score = successful_trials
-                success_rate = f"{(successful_trials / total_trials * 100):.1f}%" if total_trials > 0 else "N/A"
-                
-                # Calcula tempo médio de reação
-                reaction_times = []
-                for trial in trials:
-                    if trial.get('reaction_time') is not None:
-                        reaction_times.append(trial.get('reaction_time'))
-                
-                avg_reaction_time = sum(reaction_times) / len(reaction_times) if reaction_times else 'N/A'
-                if avg_reaction_time != 'N/A':
-                    avg_reaction_time = f"{avg_reaction_time:.2f} seg"
-                
-                # Formata a hora de início do jogo, se disponível
-                game_start = game.get("start_time", "Unknown")
-                if game_start != "Unknown" and isinstance(game_start, (int, float)):
-                    try:
-                        from datetime import datetime
-                        dt = datetime.fromtimestamp(game_start) 
-                        game_start_time = dt.strftime("%d/%m/%Y %H:%M:%S")
-                    except Exception:
-                        game_start_time = str(game_start)
-                else:
-                    # Tenta analisar o session_id como um timestamp se parecer um
-                    if isinstance(session_id, str) and '_' in session_id:
-                        try:
-                            from datetime import datetime
-                            date_part = session_id.split('_')[0]
-                            if len(date_part) == 8:  # Formato AAAAMMDD
-                                dt = datetime.strptime(date_part, "%Y%m%d")
-                                game_start_time = dt.strftime("%d/%m/%Y")
-                            else:
-                                game_start_time = "Desconhecido"
-                        except Exception:
-                            game_start_time = "Desconhecido"
-                    else:
-                        game_start_time = "Desconhecido"
-                    
-                # Adiciona os dados deste jogo à tabela
-                row_index = len(table_data)
-                table_data.append({
-                    'ID da Sessão': session_id,
-                    'Nome do Usuário': username,
-                    'Jogo #': i+1,
-                    'Modo de Jogo': game_mode_display,
-                    'Pontuação': score,
-                    'Taxa de Sucesso': success_rate,
-                    'Hora de Início': game_start_time,
-                    'Tempo Médio de Reação': avg_reaction_time
-                })
-                
-                # Armazena o mapeamento da linha da tabela para o índice da sessão
-                session_index_map[row_index] = session_idx
+        # Prepara os dados da tabela: uma linha por jogo de cada sessão
+        if tables is not None:
+            games = tables['games']
+            table_data = games.drop(columns='session_index').to_dict('records')
+            session_index_map = dict(enumerate(games['session_index'].tolist()))
+        else:
+            table_data, session_index_map = summarize_games(sessions)
         
         if not table_data:
             tk.messagebox.showerror("Erro de Dados", "Nenhum jogo válido encontrado nas sessões.")
@@ -227,7 +151,7 @@ def display_data_table(data, on_heatmap_request=None):
             session_idx = session_index_map.get(selected_row)
             
             if session_idx is not None and on_heatmap_request is not None:
-                selected_session = sessions[session_idx]
+                selected_session = session_at(session_idx)
                 on_heatmap_request(selected_session)
             else:
                 tk.messagebox.showerror("Erro", "Não foi possível recuperar os dados da sessão para a linha selecionada.")
@@ -240,8 +164,12 @@ def display_data_table(data, on_heatmap_request=None):
         def on_generate_mode_analysis():
             # Gera análise completa por modo de jogo
             try:
-                report = generate_comprehensive_report(data)
-                display_report_window(report)
+                if tables is not None:
+                    report = visualization.build_report(trials_by_mode_from_table(tables['trials']),
+                                                        tables['mouse_features'])
+                else:
+                    report = visualization.generate_comprehensive_report(data)
+                visualization.display_report_window(report)
             except Exception as e:
                 import traceback
                 traceback.print_exc()
@@ -250,18 +178,9 @@ def display_data_table(data, on_heatmap_request=None):
         mode_analysis_button = tk.Button(button_frame, text="Análise por Modo de Jogo", command=on_generate_mode_analysis)
         mode_analysis_button.pack(side=tk.LEFT, padx=5)
         
-        # Adiciona botão de exportação
+        # Adiciona botão de exportação (em segundo plano, ver utils.export)
         def export_data():
-            export_path = filedialog.asksaveasfilename(
-                defaultextension=".csv",
-                filetypes=[("Arquivos CSV", "*.csv"), ("Arquivos Excel", "*.xlsx")]
-            )
-            if export_path:
-                if export_path.endswith('.csv'):
-                    df.to_csv(export_path, index=False)
-                else:
-                    df.to_excel(export_path, index=False)
-                tk.messagebox.showinfo("Exportação Bem-Sucedida", f"Dados exportados para {export_path}")
+            open_export_dialog(table_window, df, sessions, path)
         
         export_button = tk.Button(button_frame, text="Exportar Dados", command=export_data)
         export_button.pack(side=tk.RIGHT, padx=5)
@@ -302,7 +221,7 @@ def display_data_table(data, on_heatmap_request=None):
             session_idx = session_index_map.get(selected_row)
             
             if session_idx is not None:
-                selected_session = sessions[session_idx]
+                selected_session = session_at(session_idx)
                 selected_session_data['session'] = selected_session
                 
                 # Atualiza o widget de texto com os dados JSON
@@ -324,25 +243,194 @@ def display_data_table(data, on_heatmap_request=None):
         print(f"Erro ao exibir a tabela de dados: {e}")
         traceback.print_exc()
         
+EXPORT_LEVELS = [("Resumo dos jogos (tabela)", None),
+                 ("Tentativas (uma linha por tentativa)", "trials"),
+                 ("Mouse (uma linha por amostra)", "mouse")]
+EXPORT_FORMATS = [("CSV", "Arquivos CSV", ".csv"),
+                  ("Parquet", "Arquivos Parquet", ".parquet"),
+                  ("Excel (.xlsx)", "Arquivos Excel", ".xlsx")]
+
+
+def open_export_dialog(parent, summary, sessions, data_path=None):
+    """Escolhe o nível e o arquivo e exporta em uma thread, mostrando o progresso
+
+    Com sessions None, as sessões são lidas de data_path uma de cada vez durante a exportação.
+    """
+    from tkinter import Toplevel, ttk
+    from utils.export import ExportJob, iter_file_sessions, available_formats
+
+    dialog = Toplevel(parent)
+    dialog.title("Exportar Dados")
+    dialog.resizable(False, False)
+    choice = tk.IntVar(value=0)
+    tk.Label(dialog, text="O que exportar:", anchor='w').pack(fill='x', padx=10, pady=(10, 0))
+    for index, (label, _) in enumerate(EXPORT_LEVELS):
+        tk.Radiobutton(dialog, text=label, variable=choice, value=index, anchor='w').pack(fill='x', padx=20)
+    total = len(sessions) if sessions is not None else None
+    progress = ttk.Progressbar(dialog, length=320, maximum=max(total or 0, 1),
+                               mode='determinate' if total is not None else 'indeterminate')
+    progress.pack(padx=10, pady=10)
+    # Parquet e Excel só aparecem se as bibliotecas opcionais estiverem instaladas
+    formats = [item for item in EXPORT_FORMATS if item[2] in available_formats()]
+    status = tk.Label(dialog, text="Formatos: " + ", ".join(name for name, _, _ in formats), anchor='w')
+    status.pack(fill='x', padx=10)
+    buttons = tk.Frame(dialog)
+    buttons.pack(fill='x', padx=10, pady=10)
+    job = {'current': None}
+
+    def poll():
+        current = job['current']
+        if current is None or not dialog.winfo_exists():
+            return
+        while True:
+            try:
+                event = current.events.get_nowait()
+            except queue.Empty:
+                break
+            kind = event[0]
+            if kind == 'progresso':
+                if total is not None:
+                    progress['value'] = event[1]
+                    status.config(text=f"{event[1]}/{total} sessões, {event[2]} linhas gravadas")
+                else:
+                    progress.step()
+                    status.config(text=f"{event[1]} sessões, {event[2]} linhas gravadas")
+                continue
+            job['current'] = None
+            start_button.config(state='normal')
+            cancel_button.config(text="Fechar")
+            if kind == 'concluido':
+                progress['value'] = progress['maximum']
+                status.config(text=f"{event[1]} linhas exportadas para {event[2]}")
+            elif kind == 'cancelado':
+                status.config(text="Exportação cancelada")
+            else:
+                status.config(text="Falha na exportação")
+                tk.messagebox.showerror("Erro na Exportação", event[1], parent=dialog)
+            return
+        dialog.after(100, poll)
+
+    def start():
+        path = filedialog.asksaveasfilename(
+            parent=dialog,
+            defaultextension=".csv",
+            filetypes=[(label, "*" + extension) for _, label, extension in formats]
+        )
+        if not path:
+            return
+        level = EXPORT_LEVELS[choice.get()][1]
+        try:
+            if level is None:
+                job['current'] = ExportJob(path, frame=summary)
+            else:
+                source = sessions if sessions is not None else iter_file_sessions([data_path])
+                job['current'] = ExportJob(path, level, sessions=source)
+        except ValueError as e:
+            tk.messagebox.showerror("Erro na Exportação", str(e), parent=dialog)
+            return
+        progress['value'] = 0
+        status.config(text="Exportando...")
+        start_button.config(state='disabled')
+        cancel_button.config(text="Cancelar")
+        job['current'].start()
+        poll()
+
+    def cancel():
+        if job['current'] is not None:
+            job['current'].cancel()
+        else:
+            dialog.destroy()
+
+    def close():
+        # Fechar a janela no meio da exportação cancela a gravação
+        if job['current'] is not None:
+            job['current'].cancel()
+        dialog.destroy()
+
+    start_button = tk.Button(buttons, text="Exportar...", command=start)
+    start_button.pack(side=tk.LEFT)
+    cancel_button = tk.Button(buttons, text="Fechar", command=cancel)
+    cancel_button.pack(side=tk.RIGHT)
+    dialog.protocol("WM_DELETE_WINDOW", close)
+    return dialog
+
+def preload_in_background(timings):
+    """Importa as bibliotecas de análise em uma thread enquanto o usuário escolhe o arquivo"""
+    def load():
+        start = time.perf_counter()
+        visualization.preload()
+        timings['preload'] = time.perf_counter() - start
+
+    thread = threading.Thread(target=load, name="preload-visualization", daemon=True)
+    thread.start()
+    return thread
+
+def open_dataset(path, cache=None):
+    """Tabelas derivadas e dados do arquivo, consultando o cache antes de ler o JSON
+
+    Retorna (data, tables). Se as tabelas já estiverem no cache (pelo índice
+    tamanho/mtime/hash), data é None e o JSON não é lido; as sessões ficam para
+    quando forem pedidas. Caso contrário o JSON é lido e as tabelas são
+    calculadas e guardadas. (None, None) se o arquivo não puder ser lido.
+    """
+    if cache is None:
+        cache = DatasetCache()
+    try:
+        start = time.perf_counter()
+        tables = cache.cached_tables(path)
+        if tables is not None:
+            print(f"Tabelas do cache em {(time.perf_counter() - start) * 1000:.0f} ms")
+            return None, tables
+    except Exception as e:
+        print(f"Aviso: cache indisponível ({e}); processando os dados diretamente")
+        cache = None
+
+    # Lê o arquivo JSON selecionado
+    data = read_json(path)
+    if not data:
+        return None, None
+
+    # O mouse gravado em blocos fica em um arquivo .mouse ao lado do JSON
+    attach_mouse_chunks(get_sessions(data), path)
+
+    # Tabelas derivadas; ficam no cache para as próximas aberturas do arquivo
+    tables = None
+    if cache is not None:
+        try:
+            start = time.perf_counter()
+            tables, _ = cache.get_tables(path, get_sessions(data))
+            print(f"Tabelas calculadas e guardadas no cache em {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"Aviso: cache indisponível ({e}); processando os dados diretamente")
+    return data, tables
+
 def main():
+    timings = {'imports': _IMPORT_TIME}
+    preload_in_background(timings)
+
     # Cria uma janela oculta do Tkinter
     root = tk.Tk()
     root.withdraw()
+    timings['window'] = time.perf_counter() - _START
+    print(f"Inicialização: janela pronta em {timings['window'] * 1000:.0f} ms "
+          f"(imports {timings['imports'] * 1000:.0f} ms)")
 
     # Abre filedialog para selecionar o arquivo JSON
     json_file_path = filedialog.askopenfilename(
         title="Selecionar arquivo JSON",
-        filetypes=[("Arquivos JSON", "*.json")]
+        filetypes=[("Arquivos de dados", "*.json *.jsonl"), ("Arquivos JSON", "*.json")]
     )
 
     if not json_file_path:
         print("Nenhum arquivo selecionado. Saindo...")
         return
 
-    # Lê o arquivo JSON selecionado	
-    data = read_json(json_file_path)
+    # Tabelas do cache; o JSON só é lido se o arquivo for novo ou tiver mudado
+    data, tables = open_dataset(json_file_path)
+    if 'preload' in timings:
+        print(f"Bibliotecas de análise carregadas em segundo plano em {timings['preload'] * 1000:.0f} ms")
     
-    if not data:
+    if data is None and tables is None:
         tk.messagebox.showerror("Erro", "Não foi possível ler os dados JSON ou o arquivo está vazio.")
         return
     
@@ -351,14 +439,15 @@ def main():
         if session_data:
             # Gera mapa de calor para a sessão selecionada
             try:
-                generate_heatmap(session_data)
+                visualization.generate_heatmap(session_data)
             except Exception as e:
                 import traceback
                 traceback.print_exc()
                 tk.messagebox.showerror("Erro no Mapa de Calor", f"Erro ao gerar mapa de calor: {str(e)}")
     
     # Sempre exibe a tabela de dados primeiro com capacidade de geração de mapa de calor
-    table_window = display_data_table(data, on_heatmap_request=on_heatmap_request)
+    table_window = display_data_table(data, on_heatmap_request=on_heatmap_request, tables=tables,
+                                      path=json_file_path)
     
     # Trata corretamente o fechamento da janela
     if table_window:
@@ -0,0 +1,140 @@
+"""
+Cache em disco das tabelas derivadas de cada arquivo de dados
+
+As tabelas de build_tables (tentativas, jogos e características do mouse) são
+guardadas em formato colunar, em um diretório com o nome do hash SHA-256 do
+conteúdo do arquivo. Reabrir o mesmo arquivo (mesmo que renomeado ou copiado)
+lê só as colunas prontas; arquivos novos ou alterados são processados de novo.
+
+Usa Parquet quando o pyarrow está instalado e pickle do pandas caso contrário.
+Um índice caminho -> (tamanho, mtime, hash) evita recalcular o hash de
+arquivos que não mudaram.
+"""
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import importlib.util
+
+from config.settings import CACHE_DIR
+from utils.dataset import load_sessions, build_tables
+
+# Incrementar quando o formato ou o cálculo das tabelas mudar
+CACHE_VERSION = 3
+TABLES = ('trials', 'games', 'mouse_features')
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def columnar_format():
+    """'parquet' se o pyarrow estiver disponível, senão 'pickle'"""
+    return 'parquet' if importlib.util.find_spec('pyarrow') else 'pickle'
+
+
+def file_digest(path):
+    """Hash SHA-256 do conteúdo do arquivo, lido em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """Tabelas derivadas por arquivo, indexadas pelo hash do conteúdo"""
+    def __init__(self, directory=CACHE_DIR, storage_format=None):
+        self.directory = directory
+        self.format = storage_format or columnar_format()
+        self.index_path = os.path.join(directory, 'index.json')
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r', encoding='utf-8') as f:
+                    self._index = json.load(f)
+            except (OSError, ValueError):
+                self._index = {}
+        return self._index
+
+    def _save_index(self):
+        os.makedirs(self.directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._index, f)
+        os.replace(temp_path, self.index_path)
+
+    def digest(self, path):
+        """Hash do arquivo, reaproveitado enquanto o tamanho e o mtime não mudarem"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        entry = self._load_index().get(key)
+        if entry and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+            return entry['digest']
+        digest = file_digest(path)
+        self._index[key] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'digest': digest}
+        self._save_index()
+        return digest
+
+    def _entry_dir(self, digest):
+        return os.path.join(self.directory, f'v{CACHE_VERSION}', digest[:2], digest)
+
+    def _table_path(self, entry_dir, name):
+        extension = 'parquet' if self.format == 'parquet' else 'pkl'
+        return os.path.join(entry_dir, f'{name}.{extension}')
+
+    def read(self, digest):
+        """Tabelas guardadas para o hash, ou None se não estiverem no cache"""
+        import pandas as pd
+
+        entry_dir = self._entry_dir(digest)
+        paths = {name: self._table_path(entry_dir, name) for name in TABLES}
+        if not all(os.path.exists(path) for path in paths.values()):
+            return None
+        if self.format == 'parquet':
+            return {name: pd.read_parquet(path) for name, path in paths.items()}
+        return {name: pd.read_pickle(path) for name, path in paths.items()}
+
+    def write(self, digest, tables):
+        """Grava as tabelas em um diretório temporário e o renomeia de uma vez"""
+        entry_dir = self._entry_dir(digest)
+        parent = os.path.dirname(entry_dir)
+        os.makedirs(parent, exist_ok=True)
+        temp_dir = tempfile.mkdtemp(dir=parent, prefix=digest[:8] + '.')
+        try:
+            for name, table in tables.items():
+                path = self._table_path(temp_dir, name)
+                if self.format == 'parquet':
+                    table.to_parquet(path, index=False)
+                else:
+                    table.to_pickle(path)
+            os.replace(temp_dir, entry_dir)
+        except OSError:
+            # Outro processo gravou a mesma entrada primeiro
+            if not os.path.isdir(entry_dir):
+                raise
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def cached_tables(self, path):
+        """Tabelas do arquivo se já estiverem no cache, ou None; nunca lê o JSON"""
+        return self.read(self.digest(path))
+
+    def get_tables(self, path, sessions=None):
+        """Tabelas derivadas do arquivo, do cache ou processando o JSON
+
+        sessions, se já tiverem sido lidas do arquivo, evitam lê-lo de novo.
+        Retorna (tabelas, veio_do_cache).
+        """
+        digest = self.digest(path)
+        tables = self.read(digest)
+        if tables is not None:
+            return tables, True
+        tables = build_tables(sessions if sessions is not None else load_sessions(path))
+        self.write(digest, tables)
+        return tables, False
+
+    def clear(self):
+        """Apaga todo o cache"""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self._index = None
@@ -0,0 +1,293 @@
+"""
+Funções para carregar e organizar os dados de sessões sem interface gráfica
+"""
+import os
+import re
+
+from utils.json_reader import read_json
+from utils.schema import check_file, mark_validated, is_validated
+
+
+def get_sessions(data):
+    """Retorna a lista de sessões, aceitando também um arquivo com uma única sessão"""
+    sessions = data.get('sessions', [])
+    if not sessions and isinstance(data, dict):
+        sessions = [data]
+    return sessions
+
+
+def summarize_games(sessions):
+    """
+    Divide as sessões em jogos e resume cada jogo em uma linha da tabela
+    
+    Args:
+        sessions: Lista de sessões do arquivo de dados
+        
+    Returns:
+        tuple: Lista de linhas (dicionários) e o mapa linha -> índice da sessão
+    """
+    # Prepara os dados da tabela
+    table_data = []
+    session_index_map = {}  # Mapeia linhas da tabela para índices de sessão
+
+    # Processa cada sessão
+    for session_idx, session in enumerate(sessions):
+        username = session.get('username', 'Unknown')
+        session_id = session.get('session_id', f'Session {session_idx+1}')
+
+        # Obtém todas as tentativas para esta sessão
+        all_trials = session.get('trials', [])
+
+        # Analisa tentativas em jogos - cada mudança de "modo de jogo" ou quebra de sequência indica um novo jogo
+        games = []
+        current_game = {"trials": [], "game_mode": None}
+
+        for i, trial in enumerate(all_trials):
+            trial_game_mode = trial.get('game_mode', None)
+            trial_start_time = trial.get('trial_start_time', None)
+
+            # Verifica se este é um novo jogo (mudança de modo ou primeira tentativa)
+            if current_game["game_mode"] is None:
+                current_game["game_mode"] = trial_game_mode
+                current_game["start_time"] = trial_start_time
+
+            # Se o modo de jogo mudar ou houver uma lacuna significativa de tempo, este é um novo jogo
+            elif trial_game_mode != current_game["game_mode"]:
+                # Salva o jogo anterior
+                if current_game["trials"]:
+                    games.append(current_game)
+                # Inicia um novo jogo
+                current_game = {
+                    "trials": [],
+                    "game_mode": trial_game_mode,
+                    "start_time": trial_start_time
+                }
+
+            # Adiciona a tentativa ao jogo atual
+            current_game["trials"].append(trial)
+
+        # Não esqueça de adicionar o último jogo
+        if current_game["trials"]:
+            games.append(current_game)
+
+        # Processa cada jogo dentro desta sessão
+        for i, game in enumerate(games):
+            game_mode = game["game_mode"]
+            trials = game["trials"]
+
+            # Torna o modo de jogo mais amigável para o usuário
+            game_mode_display = game_mode
+            if game_mode == 0 or game_mode == "0":
+                game_mode_display = "Modo de Aparição Única"
+            elif game_mode == 1 or game_mode == "1":
+                game_mode_display = "Modo Alternado"
+            elif game_mode == 2 or game_mode == "2":
+                game_mode_display = "Modo Infinito"
+            elif game_mode == 3 or game_mode == "3":
+                game_mode_display = "Modo Seta Colorida"
+            else:
+                game_mode_display = f"Modo Desconhecido ({game_mode})"
+
+            # Calcula pontuação e taxa de sucesso
+            successful_trials = sum(1 for trial in trials if trial.get('success', False))
+            total_trials = len(trials)
+            score = successful_trials
+            success_rate = f"{(successful_trials / total_trials * 100):.1f}%" if total_trials > 0 else "N/A"
+
+            # Calcula tempo médio de reação
+            reaction_times = []
+            for trial in trials:
+                if trial.get('reaction_time') is not None:
+                    reaction_times.append(trial.get('reaction_time'))
+
+            avg_reaction_time = sum(reaction_times) / len(reaction_times) if reaction_times else 'N/A'
+            if avg_reaction_time != 'N/A':
+                avg_reaction_time = f"{avg_reaction_time:.2f} seg"
+
+            # Formata a hora de início do jogo, se disponível
+            game_start = game.get("start_time", "Unknown")
+            if game_start != "Unknown" and isinstance(game_start, (int, float)):
+                try:
+                    from datetime import datetime
+                    dt = datetime.fromtimestamp(game_start) 
+                    game_start_time = dt.strftime("%d/%m/%Y %H:%M:%S")
+                except Exception:
+                    game_start_time = str(game_start)
+            else:
+                # Tenta analisar o session_id como um timestamp se parecer um
+                if isinstance(session_id, str) and '_' in session_id:
+                    try:
+                        from datetime import datetime
+                        date_part = session_id.split('_')[0]
+                        if len(date_part) == 8:  # Formato AAAAMMDD
+                            dt = datetime.strptime(date_part, "%Y%m%d")
+                            game_start_time = dt.strftime("%d/%m/%Y")
+                        else:
+                            game_start_time = "Desconhecido"
+                    except Exception:
+                        game_start_time = "Desconhecido"
+                else:
+                    game_start_time = "Desconhecido"
+
+            # Adiciona os dados deste jogo à tabela
+            row_index = len(table_data)
+            table_data.append({
+                'ID da Sessão': session_id,
+                'Nome do Usuário': username,
+                'Jogo #': i+1,
+                'Modo de Jogo': game_mode_display,
+                'Pontuação': score,
+                'Taxa de Sucesso': success_rate,
+                'Hora de Início': game_start_time,
+                'Tempo Médio de Reação': avg_reaction_time
+            })
+
+            # Armazena o mapeamento da linha da tabela para o índice da sessão
+            session_index_map[row_index] = session_idx
+    
+    return table_data, session_index_map
+
+
+def is_data_file(name):
+    """Arquivo de sessões: JSON antigo ou segmento diário (sessions_AAAAMMDD.jsonl)"""
+    return name.endswith('.json') or (name.startswith('sessions_') and name.endswith('.jsonl'))
+
+
+def find_data_files(paths):
+    """Lista os arquivos de dados dos caminhos dados, percorrendo diretórios recursivamente"""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                files.extend(os.path.join(directory, name) for name in names
+                             if is_data_file(name))
+        else:
+            files.append(path)
+    return sorted(files)
+
+
+def attach_mouse_chunks(sessions, json_path):
+    """Guarda nas sessões o caminho do arquivo .mouse referenciado pelo JSON (ver utils.mouse_store)"""
+    directory = os.path.dirname(os.path.abspath(json_path))
+    for session in sessions:
+        reference = session.get('mouse_tracking_chunks')
+        if reference and 'path' not in reference:
+            reference['path'] = os.path.join(directory, reference['file'])
+    return sessions
+
+
+def load_sessions(path, indices=None, validate=False):
+    """Lê as sessões de um arquivo; indices, se dado, seleciona apenas algumas
+
+    Com validate, o arquivo é conferido com o esquema (utils.schema) antes da
+    leitura, levantando SchemaError se houver problemas, e as sessões
+    retornadas ficam marcadas como validadas.
+    """
+    if validate:
+        check_file(path)
+    sessions = attach_mouse_chunks(get_sessions(read_json(path)), path)
+    if indices is not None:
+        sessions = [sessions[i] for i in indices]
+    return mark_validated(sessions) if validate else sessions
+
+
+def safe_name(text):
+    """Converte um nome de jogador em um nome de arquivo válido"""
+    return re.sub(r'[^\w.-]+', '_', str(text)).strip('._') or 'sem_nome'
+
+
+# Campos das métricas da seta copiados para a tabela de tentativas
+ARROW_COLUMNS = ('target_quadrant', 'clicked_quadrant', 'arrow_in_target_zone',
+                 'arrow_rotation_speed', 'timing_error_deg', 'timing_error_ms')
+
+TRIAL_COLUMNS = ['session_index', 'session_id', 'username', 'trial_index', 'game_mode',
+                 'trial_start_time', 'target_spawn_time', 'selection_time', 'success',
+                 'reaction_time', 'score', 'mouse_movements', 'hesitation_time',
+                 'clicks_before_success', 'average_mouse_speed', 'mouse_path_length',
+                 'n_clicks', *ARROW_COLUMNS]
+
+
+def trial_rows(session_index, session, trusted=False):
+    """Linhas da tabela de tentativas de uma sessão (trusted: sessão validada pelo esquema)"""
+    rows = []
+    for trial_index, trial in enumerate(session['trials'] if trusted else session.get('trials', [])):
+        if trusted:
+            # Sessões validadas já têm os tipos do esquema: dispensa as conversões defensivas
+            game_mode, success = trial['game_mode'], trial['success']
+        else:
+            game_mode = trial.get('game_mode')
+            game_mode = int(game_mode) if game_mode is not None else None
+            success = bool(trial.get('success', False))
+        metrics = trial.get('trial_metrics', {})
+        arrow = trial.get('arrow_metrics', {})
+        row = {
+            'session_index': session_index,
+            'session_id': session.get('session_id'),
+            'username': session.get('username', 'Anônimo'),
+            'trial_index': trial_index,
+            'game_mode': game_mode,
+            'trial_start_time': trial.get('trial_start_time'),
+            'target_spawn_time': trial.get('target_spawn_time'),
+            'selection_time': trial.get('selection_time'),
+            'success': success,
+            'reaction_time': trial.get('reaction_time'),
+            'score': trial.get('score', 0),
+            'mouse_movements': metrics.get('mouse_movements'),
+            'hesitation_time': metrics.get('hesitation_time'),
+            'clicks_before_success': metrics.get('clicks_before_success'),
+            'average_mouse_speed': metrics.get('average_mouse_speed'),
+            'mouse_path_length': metrics.get('mouse_path_length'),
+            'n_clicks': len(trial.get('clicks', []))
+        }
+        for column in ARROW_COLUMNS:
+            row[column] = arrow.get(column)
+        rows.append(row)
+    return rows
+
+
+def trials_table(sessions):
+    """Tabela normalizada com uma linha por tentativa de todas as sessões"""
+    import pandas as pd
+
+    trusted = is_validated(sessions)
+    rows = []
+    for session_index, session in enumerate(sessions):
+        rows.extend(trial_rows(session_index, session, trusted))
+    return pd.DataFrame(rows, columns=TRIAL_COLUMNS)
+
+
+def games_table(sessions):
+    """Tabela de jogos de summarize_games, com o índice da sessão de cada linha"""
+    import pandas as pd
+
+    rows, session_index_map = summarize_games(sessions)
+    table = pd.DataFrame(rows)
+    table['session_index'] = [session_index_map[row] for row in range(len(rows))]
+    return table
+
+
+def mouse_features_table(sessions):
+    """Características cinemáticas do mouse por tentativa (ver utils.trajectory)"""
+    from utils.trajectory import trajectory_features
+
+    return trajectory_features(sessions)
+
+
+def build_tables(sessions):
+    """Todas as tabelas derivadas de um arquivo, como guardadas no cache"""
+    return {
+        'trials': trials_table(sessions),
+        'games': games_table(sessions),
+        'mouse_features': mouse_features_table(sessions)
+    }
+
+
+def trials_by_mode_from_table(trials):
+    """Converte a tabela de tentativas no formato de extract_trials_by_mode"""
+    trials_by_mode = {0: [], 1: [], 2: [], 3: []}
+    # None no lugar de NaN, como nos dados originais
+    records = trials.astype(object).where(trials.notna(), None).to_dict('records')
+    for record in records:
+        if record['game_mode'] in trials_by_mode:
+            trials_by_mode[record['game_mode']].append(record)
+    return trials_by_mode
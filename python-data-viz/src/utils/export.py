@@ -0,0 +1,360 @@
+"""
+Exportação em blocos das tentativas e do rastreamento do mouse
+
+As linhas são geradas sessão por sessão e gravadas em blocos de até
+CHUNK_ROWS linhas, então a memória usada não depende do tamanho da coorte:
+  CSV      pandas.to_csv acrescentando cada bloco ao mesmo arquivo
+  Parquet  pyarrow.parquet.ParquetWriter, um grupo de linhas por bloco
+  Excel    xlsxwriter no modo constant_memory (ou openpyxl write_only), com
+           uma nova planilha a cada 1.048.576 linhas (limite do Excel)
+O arquivo é gravado com um nome temporário e só recebe o nome final ao terminar.
+pyarrow, xlsxwriter e openpyxl são opcionais (ver USAGE_GUIDE.md); só os
+formatos com as bibliotecas instaladas são oferecidos (available_formats).
+
+ExportJob roda a exportação em uma thread e publica o progresso em uma fila,
+para a janela da tabela acompanhar sem travar (ver main.py).
+
+Uso (em python-data-viz/src), exportando uma coorte inteira sem interface:
+    python -m utils.export ../../playerdata --level trials --output tentativas.parquet
+    python -m utils.export ../../playerdata --level mouse --output mouse.csv
+"""
+import os
+import json
+import queue
+import argparse
+import threading
+import importlib.util
+
+from utils.dataset import TRIAL_COLUMNS, trial_rows, attach_mouse_chunks, find_data_files
+from utils.schema import iter_sessions
+
+CHUNK_ROWS = 50000
+EXCEL_MAX_ROWS = 1048576
+FORMATS = ('.csv', '.parquet', '.xlsx')
+# Bibliotecas opcionais de cada formato (basta uma delas); o CSV só usa o pandas
+FORMAT_MODULES = {'.csv': (), '.parquet': ('pyarrow',), '.xlsx': ('xlsxwriter', 'openpyxl')}
+FORMAT_INSTALL = {'.parquet': 'pip install pyarrow', '.xlsx': 'pip install xlsxwriter'}
+
+# Tipos fixos das colunas: todos os blocos (e grupos de linhas do Parquet) têm o mesmo esquema
+TRIAL_DTYPES = {
+    'session_index': 'int64', 'session_id': 'string', 'username': 'string',
+    'trial_index': 'int64', 'game_mode': 'Int64', 'trial_start_time': 'float64',
+    'target_spawn_time': 'float64', 'selection_time': 'float64', 'success': 'boolean',
+    'reaction_time': 'float64', 'score': 'Int64', 'mouse_movements': 'Int64',
+    'hesitation_time': 'float64', 'clicks_before_success': 'Int64',
+    'average_mouse_speed': 'float64', 'mouse_path_length': 'float64', 'n_clicks': 'int64',
+    'target_quadrant': 'Int64', 'clicked_quadrant': 'Int64',
+    'arrow_in_target_zone': 'boolean', 'arrow_rotation_speed': 'float64',
+    'timing_error_deg': 'float64', 'timing_error_ms': 'float64'
+}
+MOUSE_DTYPES = {
+    'session_index': 'int64', 'session_id': 'string', 'username': 'string',
+    'trial_index': 'Int64', 'timestamp': 'float64', 'x': 'float64', 'y': 'float64',
+    'game_state': 'int64'
+}
+LEVELS = ('trials', 'mouse')
+
+
+# --- Fontes -----------------------------------------------------------------
+
+def iter_file_sessions(paths):
+    """Sessões dos arquivos de dados, uma de cada vez (sem carregar arquivos inteiros)"""
+    for path in find_data_files(paths):
+        if path.endswith('.jsonl'):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith('\n') and line.strip():
+                        yield attach_mouse_chunks([json.loads(line)], path)[0]
+        else:
+            for _, session in iter_sessions(path):
+                yield attach_mouse_chunks([session], path)[0]
+
+
+def _trial_frames(session_index, session, chunk_rows):
+    import pandas as pd
+
+    rows = trial_rows(session_index, session)
+    if rows:
+        yield pd.DataFrame(rows, columns=TRIAL_COLUMNS)
+
+
+def _mouse_frames(session_index, session, chunk_rows):
+    """Amostras do mouse da sessão, com a tentativa em andamento em cada amostra"""
+    import numpy as np
+    import pandas as pd
+    from utils.mouse_store import mouse_samples
+
+    t, x, y, state = mouse_samples(session)
+    if not len(t):
+        return
+    starts = [(trial['trial_start_time'], index) for index, trial in enumerate(session.get('trials', []))
+              if trial.get('trial_start_time') is not None]
+    starts.sort()
+    start_times = np.array([start for start, _ in starts], dtype=float)
+    trial_ids = np.array([index for _, index in starts] or [0])
+    position = np.searchsorted(start_times, t, side='right') - 1
+    trial_index = pd.array(trial_ids[np.maximum(position, 0)], dtype='Int64')
+    trial_index[position < 0] = pd.NA  # antes da primeira tentativa
+    for begin in range(0, len(t), chunk_rows):
+        end = begin + chunk_rows
+        yield pd.DataFrame({
+            'session_index': session_index,
+            'session_id': session.get('session_id'),
+            'username': session.get('username', 'Anônimo'),
+            'trial_index': trial_index[begin:end],
+            'timestamp': t[begin:end],
+            'x': x[begin:end],
+            'y': y[begin:end],
+            'game_state': state[begin:end]
+        })
+
+
+FRAMES = {'trials': (_trial_frames, TRIAL_DTYPES), 'mouse': (_mouse_frames, MOUSE_DTYPES)}
+
+
+def iter_chunks(sessions, level, chunk_rows=CHUNK_ROWS, on_session=None):
+    """Blocos (DataFrames de até chunk_rows linhas) do nível pedido
+
+    on_session(sessões_processadas), se dado, é chamado ao fim de cada sessão.
+    """
+    import pandas as pd
+
+    frames_of, dtypes = FRAMES[level]
+    pending, pending_rows = [], 0
+    written = False
+    for session_index, session in enumerate(sessions):
+        for frame in frames_of(session_index, session, chunk_rows):
+            pending.append(frame)
+            pending_rows += len(frame)
+            while pending_rows >= chunk_rows:
+                combined = pd.concat(pending, ignore_index=True)
+                yield combined.iloc[:chunk_rows].astype(dtypes)
+                written = True
+                rest = combined.iloc[chunk_rows:]
+                pending, pending_rows = ([rest] if len(rest) else []), len(rest)
+        if on_session:
+            on_session(session_index + 1)
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True).astype(dtypes)
+    elif not written:
+        # Sem linhas: um bloco vazio ainda grava o cabeçalho (e o esquema do Parquet)
+        yield pd.DataFrame({column: pd.Series(dtype=dtype) for column, dtype in dtypes.items()})
+
+
+# --- Gravação ---------------------------------------------------------------
+
+class CsvWriter:
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.header = True
+
+    def write(self, frame):
+        frame.to_csv(self.file, header=self.header, index=False)
+        self.header = False
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    def __init__(self, path):
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ImportError("Exportar para Parquet requer o pacote pyarrow (pip install pyarrow)")
+        self.path = path
+        self.writer = None
+
+    def write(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if self.writer is None:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            self.writer = pq.ParquetWriter(self.path, table.schema)
+        else:
+            table = pa.Table.from_pandas(frame, schema=self.writer.schema, preserve_index=False)
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class ExcelWriter:
+    """Planilha gravada linha a linha sem manter as linhas já escritas em memória"""
+    def __init__(self, path):
+        self.sheets = 0
+        self.row = EXCEL_MAX_ROWS
+        try:
+            import xlsxwriter
+        except ImportError:
+            xlsxwriter = None
+        if xlsxwriter is not None:
+            self.workbook = xlsxwriter.Workbook(path, {'constant_memory': True})
+            self.add_sheet = self.workbook.add_worksheet
+            self.write_row = lambda sheet, row, values: sheet.write_row(row, 0, values)
+            self.save = self.workbook.close
+            return
+        try:
+            import openpyxl
+        except ImportError:
+            raise ImportError("Exportar para Excel requer o pacote xlsxwriter (pip install xlsxwriter)")
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.add_sheet = self.workbook.create_sheet
+        self.write_row = lambda sheet, row, values: sheet.append(values)
+        self.save = lambda: self.workbook.save(path)
+
+    def write(self, frame):
+        columns = list(frame.columns)
+        values = frame.astype(object).where(frame.notna(), None)
+        for row in values.itertuples(index=False, name=None):
+            if self.row >= EXCEL_MAX_ROWS:
+                self.sheets += 1
+                self.sheet = self.add_sheet(f'Dados {self.sheets}')
+                self.write_row(self.sheet, 0, columns)
+                self.row = 1
+            self.write_row(self.sheet, self.row, row)
+            self.row += 1
+
+    def close(self):
+        if not self.sheets:
+            self.add_sheet('Dados 1')
+        self.save()
+
+
+WRITERS = {'.csv': CsvWriter, '.parquet': ParquetWriter, '.xlsx': ExcelWriter}
+
+
+def available_formats():
+    """Extensões que podem ser exportadas com as bibliotecas instaladas"""
+    return tuple(extension for extension in FORMATS
+                 if not FORMAT_MODULES[extension]
+                 or any(importlib.util.find_spec(name) for name in FORMAT_MODULES[extension]))
+
+
+def export_format(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in WRITERS:
+        raise ValueError(f"Formato não suportado: {extension or path} (use {', '.join(FORMATS)})")
+    return extension
+
+
+def write_chunks(chunks, path, on_chunk=None, cancel=None):
+    """Grava os blocos em path (formato pela extensão); retorna o número de linhas
+
+    O arquivo só aparece com o nome final se todos os blocos forem gravados;
+    com cancel (threading.Event) acionado, a gravação para e nada é mantido.
+    """
+    extension = export_format(path)
+    directory, name = os.path.split(os.path.abspath(path))
+    temp_path = os.path.join(directory, f'.{name}.{os.getpid()}.partial{extension}')
+    rows = 0
+    writer = WRITERS[extension](temp_path)
+    try:
+        for frame in chunks:
+            if cancel is not None and cancel.is_set():
+                break
+            writer.write(frame)
+            rows += len(frame)
+            if on_chunk:
+                on_chunk(rows)
+        writer.close()
+        if cancel is not None and cancel.is_set():
+            os.remove(temp_path)
+            return rows
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return rows
+
+
+def export_sessions(sessions, level, path, chunk_rows=CHUNK_ROWS, on_progress=None, cancel=None):
+    """Exporta tentativas ou amostras do mouse das sessões; retorna o número de linhas
+
+    on_progress(sessões_processadas, linhas_gravadas) acompanha o andamento.
+    """
+    if level not in FRAMES:
+        raise ValueError(f"Nível desconhecido: {level} (use {', '.join(LEVELS)})")
+    state = {'sessions': 0, 'rows': 0}
+
+    def on_session(done):
+        state['sessions'] = done
+        if on_progress:
+            on_progress(done, state['rows'])
+
+    def on_chunk(rows):
+        state['rows'] = rows
+        if on_progress:
+            on_progress(state['sessions'], rows)
+
+    chunks = iter_chunks(sessions, level, chunk_rows, on_session)
+    return write_chunks(chunks, path, on_chunk, cancel)
+
+
+class ExportJob:
+    """Exportação em uma thread de fundo; o progresso chega pela fila events
+
+    Eventos: ('progresso', sessões, linhas), ('concluido', linhas, caminho),
+    ('cancelado', linhas, caminho) e ('erro', mensagem, caminho).
+    """
+    def __init__(self, path, level=None, sessions=None, frame=None, chunk_rows=CHUNK_ROWS):
+        export_format(path)
+        self.path = path
+        self.level = level
+        self.sessions = sessions
+        self.frame = frame
+        self.chunk_rows = chunk_rows
+        self.total = len(sessions) if hasattr(sessions, '__len__') else None
+        self.events = queue.SimpleQueue()
+        self.cancel_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, name='export', daemon=True)
+
+    def start(self):
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def _progress(self, sessions, rows):
+        self.events.put(('progresso', sessions, rows))
+
+    def _run(self):
+        try:
+            if self.frame is not None:
+                # Tabela já pronta (resumo dos jogos): um único bloco
+                rows = write_chunks([self.frame], self.path, cancel=self.cancel_event)
+            else:
+                rows = export_sessions(self.sessions, self.level, self.path, self.chunk_rows,
+                                       self._progress, self.cancel_event)
+        except Exception as e:
+            self.events.put(('erro', f"{type(e).__name__}: {e}", self.path))
+            return
+        kind = 'cancelado' if self.cancel_event.is_set() else 'concluido'
+        self.events.put((kind, rows, self.path))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Exporta tentativas ou o mouse de uma coorte em blocos')
+    parser.add_argument('paths', nargs='+', help='arquivos de dados ou diretórios (busca recursiva)')
+    parser.add_argument('--level', choices=LEVELS, default='trials')
+    parser.add_argument('--output', required=True, help='arquivo de saída (.csv, .parquet ou .xlsx)')
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS)
+    args = parser.parse_args()
+    extension = export_format(args.output)
+    if extension not in available_formats():
+        parser.error(f'{extension} requer uma biblioteca opcional ({FORMAT_INSTALL[extension]})')
+
+    def on_progress(sessions, rows):
+        print(f'\r{sessions} sessão(ões), {rows} linha(s) gravadas', end='', flush=True)
+
+    rows = export_sessions(iter_file_sessions(args.paths), args.level, args.output,
+                           args.chunk_rows, on_progress)
+    print(f'\n{rows} linha(s) exportadas para {args.output}')
+
+
+if __name__ == '__main__':
+    main()
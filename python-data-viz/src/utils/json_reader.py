@@ -1,7 +1,24 @@
 def read_json(file_path):
     import json
 
+    if file_path.endswith('.jsonl'):
+        return read_json_lines(file_path)
+
     with open(file_path, 'r') as file:
         data = json.load(file)
 
-    return data
\ No newline at end of file
+    return data
+
+
+def read_json_lines(file_path):
+    """Lê um segmento de sessões (uma sessão JSON por linha) no formato {'sessions': [...]}"""
+    import json
+
+    sessions = []
+    with open(file_path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if not line.endswith('\n'):
+                break  # última linha ainda sendo gravada
+            if line.strip():
+                sessions.append(json.loads(line))
+    return {'sessions': sessions}
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""
+Leitura do rastreamento do mouse guardado em blocos comprimidos
+
+O jogo pode gravar o mouse de cada sessão em um arquivo .mouse ao lado do
+JSON (refactored/mouse_chunks.py), deixando na sessão só a referência
+'mouse_tracking_chunks'. Este módulo lê o índice do arquivo uma vez e
+descomprime apenas os blocos que cobrem o intervalo de tempo pedido (uma
+tentativa, a janela de um mapa de calor). Sessões antigas, com a lista
+'mouse_tracking' no próprio JSON, são lidas pela mesma interface.
+"""
+import os
+import json
+import zlib
+import struct
+from functools import lru_cache
+
+import numpy as np
+
+FILE_MAGIC = b'MTCK'
+FOOTER = struct.Struct('<QI4s')
+FOOTER_MAGIC = b'MTIX'
+CHUNK_HEADER = struct.Struct('<Idii')
+COLUMNS = ('timestamp', 'x', 'y', 'game_state')
+
+
+class MouseChunkFile:
+    """Arquivo de blocos do mouse com o índice carregado na abertura"""
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            if f.read(4) != FILE_MAGIC:
+                raise ValueError(f'{path} não é um arquivo de blocos do mouse')
+            f.seek(-FOOTER.size, os.SEEK_END)
+            offset, length, magic = FOOTER.unpack(f.read(FOOTER.size))
+            if magic != FOOTER_MAGIC:
+                raise ValueError(f'{path} está incompleto (sem índice)')
+            f.seek(offset)
+            index = json.loads(zlib.decompress(f.read(length)))
+        self.time_unit = index['time_unit']
+        # Blocos de cada sessão em ordem de tempo
+        self.sessions = {}
+        for chunk in index['chunks']:
+            self.sessions.setdefault(chunk['session'], []).append(chunk)
+        for chunks in self.sessions.values():
+            chunks.sort(key=lambda chunk: chunk['start'])
+
+    def chunks(self, session_id, start=None, end=None):
+        """Entradas do índice da sessão que se sobrepõem a [start, end]"""
+        return [chunk for chunk in self.sessions.get(session_id, [])
+                if (start is None or chunk['end'] >= start) and
+                   (end is None or chunk['start'] <= end)]
+
+    def _decode(self, data):
+        payload = zlib.decompress(data)
+        count, t0, x0, y0 = CHUNK_HEADER.unpack_from(payload)
+        offset = CHUNK_HEADER.size
+        columns = []
+        for _ in range(3):
+            columns.append(np.frombuffer(payload, '<i4', count, offset).astype(np.int64))
+            offset += 4 * count
+        dt, dx, dy = columns
+        states = np.frombuffer(payload, np.uint8, count, offset)
+        return (t0 + np.cumsum(dt) * self.time_unit, x0 + np.cumsum(dx), y0 + np.cumsum(dy),
+                states.astype(np.int64))
+
+    def read(self, session_id, start=None, end=None):
+        """Amostras da sessão em [start, end] como arrays (timestamp, x, y, game_state)
+
+        Só os blocos que cobrem o intervalo são lidos do disco e descomprimidos.
+        """
+        selected = self.chunks(session_id, start, end)
+        parts = []
+        with open(self.path, 'rb') as f:
+            for chunk in selected:
+                f.seek(chunk['offset'])
+                parts.append(self._decode(f.read(chunk['length'])))
+        if not parts:
+            return _empty()
+        t, x, y, state = (np.concatenate(column) for column in zip(*parts))
+        mask = np.ones(len(t), dtype=bool)
+        if start is not None:
+            mask &= t >= start
+        if end is not None:
+            mask &= t <= end
+        return t[mask], x[mask], y[mask], state[mask]
+
+
+def _empty():
+    return np.empty(0), np.empty(0, np.int64), np.empty(0, np.int64), np.empty(0, np.int64)
+
+
+@lru_cache(maxsize=32)
+def open_chunk_file(path):
+    """MouseChunkFile reaproveitado entre chamadas (o índice é lido uma vez)"""
+    return MouseChunkFile(path)
+
+
+def has_chunks(session):
+    return bool(session.get('mouse_tracking_chunks'))
+
+
+def mouse_samples(session, start=None, end=None):
+    """Arrays (timestamp, x, y, game_state) do mouse da sessão em [start, end]"""
+    reference = session.get('mouse_tracking_chunks')
+    if reference:
+        if 'path' not in reference:
+            raise ValueError('Sessão sem o caminho do arquivo de blocos; use attach_mouse_chunks')
+        return open_chunk_file(reference['path']).read(session['session_id'], start, end)
+    samples = [(s['timestamp'], s['x'], s['y'], s.get('game_state', 0))
+               for s in session.get('mouse_tracking', [])
+               if 'x' in s and 'y' in s and
+               (start is None or s['timestamp'] >= start) and
+               (end is None or s['timestamp'] <= end)]
+    if not samples:
+        return _empty()
+    t, x, y, state = np.array(samples, dtype=float).T
+    return t, x, y, state.astype(np.int64)
+
+
+def mouse_records(session, start=None, end=None):
+    """Amostras no formato da lista 'mouse_tracking' do JSON"""
+    if not has_chunks(session):
+        return [s for s in session.get('mouse_tracking', [])
+                if (start is None or s['timestamp'] >= start) and
+                   (end is None or s['timestamp'] <= end)]
+    t, x, y, state = mouse_samples(session, start, end)
+    return [dict(zip(COLUMNS, values))
+            for values in zip(t.tolist(), x.tolist(), y.tolist(), state.tolist())]
@@ -0,0 +1,554 @@
+"""
+Esquema dos arquivos de sessão e validação rápida, inclusive em streaming
+
+SESSION_SCHEMA e TRIAL_SCHEMA descrevem (em JSON Schema) o que o jogo grava.
+compile_schema transforma o esquema, uma única vez, em funções Python
+aninhadas que só respondem se o valor é válido; é esse caminho que roda para
+cada registro. Quando um registro falha, o jsonschema (se instalado) é usado
+só para explicar o erro com o caminho do campo.
+
+validate_file lê um arquivo {"sessions": [...]} sessão por sessão, sem
+carregá-lo inteiro, e informa a posição (em bytes) de cada sessão inválida.
+validate_jsonl faz o mesmo para arquivos JSON Lines (segmentos diários de
+sessões, o índice e o journal de tentativas) e pode continuar de onde parou
+enquanto o arquivo ainda está sendo escrito.
+
+Sessões validadas (ver mark_validated) dispensam as verificações defensivas
+campo a campo em utils.dataset e na análise por modo.
+
+Uso (em python-data-viz/src):
+    python -m utils.schema ../../playerdata
+    python -m utils.schema ../../playerdata/sessions/quiosque1/2026-05/sessions_20260512.jsonl --follow
+"""
+import os
+import sys
+import json
+import time
+import codecs
+import argparse
+from collections import namedtuple
+
+NULLABLE_NUMBER = {'type': ['number', 'null']}
+
+MOUSE_SAMPLE_SCHEMA = {
+    'type': 'object',
+    'required': ['timestamp', 'x', 'y'],
+    'properties': {
+        'timestamp': {'type': 'number'},
+        'x': {'type': 'number'},
+        'y': {'type': 'number'},
+        'game_state': {'type': 'integer'}
+    }
+}
+
+CLICK_SCHEMA = {
+    'type': 'object',
+    'required': ['x', 'y', 'timestamp'],
+    'properties': {
+        'x': {'type': 'number'},
+        'y': {'type': 'number'},
+        'timestamp': {'type': 'number'},
+        'success': {'type': 'boolean'}
+    }
+}
+
+TRAITS_SCHEMA = {
+    'type': 'object',
+    'required': ['head', 'face', 'body', 'hat'],
+    'properties': {
+        part: {'type': 'object', 'required': ['name'], 'properties': {'name': {'type': 'string'}}}
+        for part in ('head', 'face', 'body', 'hat')
+    }
+}
+
+TRIAL_SCHEMA = {
+    'type': 'object',
+    'required': ['trial_start_time', 'game_mode', 'success', 'reaction_time'],
+    'properties': {
+        'trial_start_time': {'type': 'number'},
+        'game_mode': {'type': 'integer', 'enum': [0, 1, 2, 3]},
+        'target_spawn_time': NULLABLE_NUMBER,
+        'selection_time': NULLABLE_NUMBER,
+        'success': {'type': 'boolean'},
+        'reaction_time': NULLABLE_NUMBER,
+        'score': {'type': 'integer'},
+        'lapse': {'type': 'boolean'},
+        'trial_metrics': {
+            'type': 'object',
+            'properties': {
+                'mouse_movements': {'type': 'integer'},
+                'hesitation_time': {'type': 'number'},
+                'clicks_before_success': {'type': 'integer'},
+                'average_mouse_speed': {'type': 'number'},
+                'mouse_path_length': {'type': 'number'}
+            }
+        },
+        'clicks': {'type': 'array', 'items': CLICK_SCHEMA},
+        'target_character': TRAITS_SCHEMA,
+        'arrow_metrics': {
+            'type': 'object',
+            'properties': {
+                'clicked_quadrant': {'type': ['integer', 'null']},
+                'target_quadrant': {'type': 'integer'},
+                'arrow_in_target_zone': {'type': 'boolean'},
+                'arrow_rotation_speed': {'type': 'number'}
+            }
+        },
+        'distractors': {
+            'type': 'array',
+            'items': {
+                'type': 'object',
+                'required': ['spawn_time', 'differing_traits'],
+                'properties': {
+                    'spawn_time': {'type': 'number'},
+                    'character': TRAITS_SCHEMA,
+                    'differing_traits': {'type': 'integer', 'minimum': 0, 'maximum': 4}
+                }
+            }
+        }
+    }
+}
+
+SESSION_SCHEMA = {
+    'type': 'object',
+    'required': ['session_id', 'username', 'trials'],
+    'properties': {
+        'session_id': {'type': 'string'},
+        'username': {'type': 'string'},
+        'game_mode': {'type': ['integer', 'null']},
+        'trials': {'type': 'array', 'items': TRIAL_SCHEMA},
+        'mouse_tracking': {'type': 'array', 'items': MOUSE_SAMPLE_SCHEMA},
+        'mouse_tracking_chunks': {
+            'type': 'object',
+            'required': ['file', 'samples'],
+            'properties': {'file': {'type': 'string'}, 'samples': {'type': 'integer', 'minimum': 0}}
+        },
+        'session_metrics': {'type': 'object'},
+        'recovered_from_journal': {'type': 'boolean'}
+    }
+}
+
+# Linha do journal de tentativas (refactored/persistence.py)
+JOURNAL_RECORD_SCHEMA = {
+    'type': 'object',
+    'required': ['session_id', 'username', 'game_mode', 'trial'],
+    'properties': {
+        'session_id': {'type': 'string'},
+        'username': {'type': 'string'},
+        'game_mode': {'type': ['integer', 'null']},
+        'trial': TRIAL_SCHEMA
+    }
+}
+
+# Linha do índice das sessões (refactored/session_store.py)
+INDEX_ENTRY_SCHEMA = {
+    'type': 'object',
+    'required': ['session_id', 'username', 'trials', 'segment', 'offset', 'length'],
+    'properties': {
+        'session_id': {'type': 'string'},
+        'username': {'type': 'string'},
+        'game_mode': {'type': ['integer', 'null']},
+        'modes': {'type': 'array', 'items': {'type': 'integer'}},
+        'trials': {'type': 'integer', 'minimum': 0},
+        'start': NULLABLE_NUMBER,
+        'end': NULLABLE_NUMBER,
+        'kiosk': {'type': 'string'},
+        'segment': {'type': 'string'},
+        'offset': {'type': 'integer', 'minimum': 0},
+        'length': {'type': 'integer', 'minimum': 1},
+        'mouse': {'type': ['string', 'null']}
+    }
+}
+
+ValidationIssue = namedtuple('ValidationIssue', 'path offset line record message')
+ValidationReport = namedtuple('ValidationReport', 'path records issues seconds')
+
+
+class SchemaError(ValueError):
+    """Arquivo com registros fora do esquema; issues tem a posição de cada problema"""
+    def __init__(self, issues):
+        self.issues = issues
+        shown = '; '.join(format_issue(issue) for issue in issues[:3])
+        more = f' (+{len(issues) - 3})' if len(issues) > 3 else ''
+        super().__init__(f'{len(issues)} problema(s) de esquema: {shown}{more}')
+
+
+# --- Compilação do esquema -------------------------------------------------
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_integer(value):
+    return (isinstance(value, int) and not isinstance(value, bool)) or \
+        (isinstance(value, float) and value.is_integer())
+
+
+TYPE_CHECKS = {
+    'object': lambda value: isinstance(value, dict),
+    'array': lambda value: isinstance(value, list),
+    'string': lambda value: isinstance(value, str),
+    'number': _is_number,
+    'integer': _is_integer,
+    'boolean': lambda value: isinstance(value, bool),
+    'null': lambda value: value is None
+}
+SUPPORTED_KEYWORDS = {'type', 'properties', 'required', 'items', 'enum', 'minimum', 'maximum'}
+
+
+def compile_schema(schema):
+    """Converte o esquema em uma função valor -> bool (subconjunto do JSON Schema)"""
+    unsupported = set(schema) - SUPPORTED_KEYWORDS
+    if unsupported:
+        raise ValueError(f'Palavras-chave não suportadas pelo compilador: {sorted(unsupported)}')
+    checks = []
+
+    types = schema.get('type')
+    if types is not None:
+        type_checks = [TYPE_CHECKS[name] for name in ([types] if isinstance(types, str) else types)]
+        if len(type_checks) == 1:
+            checks.append(type_checks[0])
+        else:
+            checks.append(lambda value: any(check(value) for check in type_checks))
+
+    if 'enum' in schema:
+        allowed = schema['enum']
+        checks.append(lambda value: value in allowed and not isinstance(value, bool))
+    if 'minimum' in schema:
+        minimum = schema['minimum']
+        checks.append(lambda value: not _is_number(value) or value >= minimum)
+    if 'maximum' in schema:
+        maximum = schema['maximum']
+        checks.append(lambda value: not _is_number(value) or value <= maximum)
+
+    required = tuple(schema.get('required', ()))
+    properties = tuple((name, compile_schema(subschema))
+                       for name, subschema in schema.get('properties', {}).items())
+    if required or properties:
+        def check_object(value):
+            if not isinstance(value, dict):
+                return True  # o tipo é verificado à parte
+            for name in required:
+                if name not in value:
+                    return False
+            for name, check in properties:
+                if name in value and not check(value[name]):
+                    return False
+            return True
+        checks.append(check_object)
+
+    if 'items' in schema:
+        check_item = compile_schema(schema['items'])
+        checks.append(lambda value: not isinstance(value, list) or all(map(check_item, value)))
+
+    if not checks:
+        return lambda value: True
+    if len(checks) == 1:
+        return checks[0]
+    return lambda value: all(check(value) for check in checks)
+
+
+_compiled = {}
+
+
+def validator_for(schema):
+    """Validador compilado do esquema, reaproveitado entre chamadas"""
+    key = id(schema)
+    if key not in _compiled:
+        _compiled[key] = compile_schema(schema)
+    return _compiled[key]
+
+
+def describe_errors(schema, value, limit=3):
+    """Mensagens dos primeiros erros do valor, com o caminho de cada campo"""
+    try:
+        from jsonschema import Draft7Validator
+    except ImportError:
+        return ['registro não corresponde ao esquema (instale jsonschema para detalhes)']
+    messages = []
+    for error in Draft7Validator(schema).iter_errors(value):
+        path = ''.join(f'[{part}]' if isinstance(part, int) else f'.{part}'
+                       for part in error.absolute_path)
+        messages.append(f'{path.lstrip(".") or "<raiz>"}: {error.message}')
+        if len(messages) >= limit:
+            break
+    # O compilador trata 1.0 como inteiro, o jsonschema também; sem erro aqui, avisa genericamente
+    return messages or ['registro não corresponde ao esquema']
+
+
+# --- Leitura em streaming --------------------------------------------------
+
+class _TextStream:
+    """Texto de um arquivo lido em blocos, com a posição em bytes do início do buffer"""
+    def __init__(self, f, chunk_size):
+        self.f = f
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.position = 0
+        self.byte_offset = 0
+        self.eof = False
+
+    def read_more(self, size=None):
+        data = self.f.read(size or self.chunk_size)
+        self.eof = not data
+        self.buffer += self.decoder.decode(data, final=self.eof)
+        return not self.eof
+
+    def skip_whitespace(self):
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position].isspace():
+                self.position += 1
+            if self.position < len(self.buffer) or not self.read_more():
+                return
+
+    def peek(self):
+        self.skip_whitespace()
+        return self.buffer[self.position] if self.position < len(self.buffer) else ''
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"esperado '{char}' na posição {self.offset()}")
+        self.position += 1
+
+    def offset(self):
+        """Posição atual em bytes no arquivo"""
+        return self.byte_offset + len(self.buffer[:self.position].encode('utf-8'))
+
+    def consume(self):
+        """Descarta o texto já lido, mantendo byte_offset correto"""
+        self.byte_offset += len(self.buffer[:self.position].encode('utf-8'))
+        self.buffer = self.buffer[self.position:]
+        self.position = 0
+
+    def decode_value(self, decoder):
+        """Decodifica o próximo valor JSON, lendo mais do arquivo se ele estiver incompleto"""
+        self.skip_whitespace()
+        self.consume()
+        size = self.chunk_size
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buffer, 0)
+            except json.JSONDecodeError as e:
+                if self.eof:
+                    e.file_offset = self.byte_offset + len(self.buffer[:e.pos].encode('utf-8'))
+                    raise
+                # Provavelmente incompleto: lê o dobro para o custo total continuar linear
+                self.read_more(size)
+                size *= 2
+                continue
+            if end == len(self.buffer) and not self.eof:
+                # Um número no fim do buffer pode continuar no próximo bloco
+                self.read_more()
+                continue
+            self.position = end
+            return value
+
+
+def iter_sessions(path, chunk_size=1024 * 1024):
+    """Gera (posição em bytes, sessão) de um arquivo de dados sem carregá-lo inteiro
+
+    Arquivos que não começam com {"sessions": [ são lidos de uma vez
+    (por exemplo, um arquivo com uma única sessão).
+    """
+    decoder = json.JSONDecoder()
+    with open(path, 'rb') as f:
+        stream = _TextStream(f, chunk_size)
+        if stream.peek() == '{':
+            stream.position += 1
+            if stream.peek() == '"':
+                key = stream.decode_value(decoder)
+                stream.expect(':')
+                if key == 'sessions' and stream.peek() == '[':
+                    stream.position += 1
+                    if stream.peek() == ']':
+                        return
+                    while True:
+                        stream.skip_whitespace()
+                        offset = stream.offset()
+                        yield offset, stream.decode_value(decoder)
+                        separator = stream.peek()
+                        stream.position += 1
+                        if separator == ']':
+                            return
+                        if separator != ',':
+                            raise json.JSONDecodeError(
+                                "esperado ',' ou ']'", stream.buffer, stream.position - 1)
+        f.seek(0)
+        data = json.load(f)
+    sessions = data.get('sessions') if isinstance(data, dict) else None
+    if sessions is None:
+        sessions = [data]
+    for session in sessions:
+        yield 0, session
+
+
+def _issue(path, offset, line, record, schema, value):
+    return [ValidationIssue(path, offset, line, record, message)
+            for message in describe_errors(schema, value)]
+
+
+def jsonl_schema_for(path):
+    """Esquema das linhas de um arquivo JSON Lines, pelo nome do arquivo"""
+    name = os.path.basename(path)
+    if name.startswith('sessions_'):
+        return SESSION_SCHEMA
+    if name == 'index.jsonl':
+        return INDEX_ENTRY_SCHEMA
+    return JOURNAL_RECORD_SCHEMA
+
+
+def validate_file(path, max_issues=100, schema=SESSION_SCHEMA):
+    """Valida as sessões de um arquivo em streaming; retorna um ValidationReport
+
+    Arquivos .jsonl (segmentos diários, índices e journals) são validados
+    linha a linha com o esquema correspondente.
+    """
+    started = time.perf_counter()
+    if path.endswith('.jsonl'):
+        issues, records, _, _ = validate_jsonl(path, schema=jsonl_schema_for(path),
+                                               max_issues=max_issues)
+        return ValidationReport(path, records, issues, time.perf_counter() - started)
+    check = validator_for(schema)
+    issues = []
+    records = 0
+    try:
+        for offset, session in iter_sessions(path):
+            if not check(session):
+                issues.extend(_issue(path, offset, None, records, schema, session))
+            records += 1
+            if len(issues) >= max_issues:
+                break
+    except (ValueError, UnicodeDecodeError) as e:
+        # JSON malformado: não há como continuar depois do erro
+        message = e.msg if isinstance(e, json.JSONDecodeError) else str(e)
+        issues.append(ValidationIssue(path, getattr(e, 'file_offset', None), None, records,
+                                      f'JSON inválido: {message}'))
+    return ValidationReport(path, records, issues, time.perf_counter() - started)
+
+
+def check_file(path):
+    """Valida o arquivo e levanta SchemaError se houver problemas"""
+    report = validate_file(path)
+    if report.issues:
+        raise SchemaError(report.issues)
+    return report
+
+
+def validate_jsonl(path, offset=0, line=1, schema=JOURNAL_RECORD_SCHEMA, max_issues=100):
+    """Valida as linhas completas de um arquivo JSON Lines a partir de offset
+
+    Retorna (problemas, registros, próxima posição, próxima linha); uma última
+    linha ainda sem quebra de linha fica para a próxima chamada, então dá para
+    acompanhar um arquivo enquanto ele é escrito.
+    """
+    check = validator_for(schema)
+    issues = []
+    records = 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for raw in f:
+            if not raw.endswith(b'\n'):
+                break  # linha ainda sendo escrita
+            if raw.strip():
+                try:
+                    record = json.loads(raw)
+                except ValueError as e:
+                    issues.append(ValidationIssue(path, offset, line, records, f'JSON inválido: {e}'))
+                else:
+                    if not check(record):
+                        issues.extend(_issue(path, offset, line, records, schema, record))
+                records += 1
+            offset += len(raw)
+            line += 1
+            if len(issues) >= max_issues:
+                break
+    return issues, records, offset, line
+
+
+# --- Sessões validadas ------------------------------------------------------
+
+class ValidatedSessions(list):
+    """Lista de sessões que passou pela validação do esquema"""
+    validated = True
+
+
+def mark_validated(sessions):
+    return ValidatedSessions(sessions)
+
+
+def is_validated(sessions):
+    """True se as sessões foram validadas e dispensam verificações defensivas"""
+    return getattr(sessions, 'validated', False)
+
+
+def validate_sessions(sessions, schema=SESSION_SCHEMA):
+    """Valida sessões já carregadas; retorna (sessões marcadas ou originais, problemas)"""
+    check = validator_for(schema)
+    issues = []
+    for index, session in enumerate(sessions):
+        if not check(session):
+            issues.extend(_issue(None, None, None, index, schema, session))
+    return (sessions if issues else mark_validated(sessions)), issues
+
+
+def format_issue(issue):
+    location = issue.path or '<memória>'
+    if issue.line is not None:
+        location += f':{issue.line}'
+    if issue.offset is not None:
+        location += f' (byte {issue.offset})'
+    return f'{location} registro {issue.record}: {issue.message}'
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Valida arquivos de sessão e journals JSON Lines')
+    parser.add_argument('paths', nargs='+', help='arquivos .json/.jsonl ou diretórios')
+    parser.add_argument('--follow', action='store_true',
+                        help='continua validando os .jsonl conforme novas linhas são escritas')
+    parser.add_argument('--interval', type=float, default=1.0)
+    args = parser.parse_args()
+
+    files = []
+    for path in args.paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.extend(os.path.join(root, name) for name in sorted(names)
+                             if name.endswith(('.json', '.jsonl')))
+        else:
+            files.append(path)
+
+    total_issues = 0
+    positions = {}
+    for path in files:
+        if path.endswith('.jsonl'):
+            issues, records, offset, line = validate_jsonl(path, schema=jsonl_schema_for(path))
+            positions[path] = (offset, line)
+            seconds = None
+        else:
+            report = validate_file(path)
+            issues, records, seconds = report.issues, report.records, report.seconds
+        for issue in issues:
+            print(format_issue(issue))
+        total_issues += len(issues)
+        timing = f' em {seconds * 1000:.0f} ms' if seconds is not None else ''
+        print(f'{path}: {records} registro(s), {len(issues)} problema(s){timing}')
+
+    while args.follow and positions:
+        time.sleep(args.interval)
+        for path, (offset, line) in positions.items():
+            if not os.path.exists(path) or os.path.getsize(path) < offset:
+                positions[path] = (0, 1)  # journal descartado ou recriado
+                continue
+            issues, records, offset, line = validate_jsonl(path, offset, line,
+                                                           jsonl_schema_for(path))
+            positions[path] = (offset, line)
+            for issue in issues:
+                print(format_issue(issue))
+            if records:
+                print(f'{path}: +{records} registro(s), {len(issues)} problema(s)')
+    sys.exit(1 if total_issues else 0)
+
+
+if __name__ == '__main__':
+    main()
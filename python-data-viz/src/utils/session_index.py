@@ -0,0 +1,201 @@
+"""
+Consulta ao índice das sessões gravadas em segmentos diários
+
+O jogo acrescenta cada sessão a um segmento por quiosque e por dia
+(sessions/<quiosque>/<AAAA-MM>/sessions_<AAAAMMDD>.jsonl) e registra no
+índice do quiosque (sessions/<quiosque>/index.jsonl) o id, o jogador, os
+modos, o número de tentativas, o intervalo de tempo e a posição da sessão no
+segmento (ver refactored/session_store.py). Aqui as sessões são listadas e
+filtradas lendo só os índices; as sessões escolhidas são lidas com um seek
+direto nos segmentos. SessionReader faz o mesmo para uma sessão pela sua
+posição no arquivo (a tabela abre um segmento sem lê-lo inteiro).
+
+Uso (em python-data-viz/src):
+    python -m utils.session_index ../../playerdata/sessions
+    python -m utils.session_index ../../playerdata/sessions --user Ana --mode 3 --since 2026-03-01
+"""
+import os
+import json
+import argparse
+from datetime import datetime
+
+from utils.dataset import attach_mouse_chunks, load_sessions
+
+INDEX_NAME = 'index.jsonl'
+
+
+def find_indexes(root):
+    """Índices dos quiosques sob o diretório de sessões"""
+    paths = []
+    if os.path.exists(os.path.join(root, INDEX_NAME)):
+        # root é o diretório de um único quiosque
+        return [os.path.join(root, INDEX_NAME)]
+    for name in sorted(os.listdir(root)):
+        path = os.path.join(root, name, INDEX_NAME)
+        if os.path.exists(path):
+            paths.append(path)
+    return paths
+
+
+def _timestamp(value, end_of_day=False):
+    """Converte data, datetime ou texto AAAA-MM-DD em segundos desde a época"""
+    if value is None or isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        value = datetime.strptime(value, '%Y-%m-%d').date()
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.max.time() if end_of_day else datetime.min.time())
+    return value.timestamp()
+
+
+def read_index(root, username=None, mode=None, since=None, until=None, kiosk=None):
+    """Entradas do índice de todos os quiosques, com filtros opcionais
+
+    mode seleciona sessões com tentativas do modo; since e until (datas,
+    datetimes ou AAAA-MM-DD, inclusive) filtram pelo horário das tentativas.
+    Cada entrada ganha 'path', o caminho do segmento.
+    """
+    since, until = _timestamp(since), _timestamp(until, end_of_day=True)
+    entries = []
+    for index_path in find_indexes(root):
+        store_root = os.path.dirname(os.path.dirname(index_path))
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # linha interrompida por uma queda
+                if username is not None and entry.get('username') != username:
+                    continue
+                if mode is not None and mode not in entry.get('modes', []):
+                    continue
+                if kiosk is not None and entry.get('kiosk') != kiosk:
+                    continue
+                if since is not None and (entry.get('end') is None or entry['end'] < since):
+                    continue
+                if until is not None and (entry.get('start') is None or entry['start'] > until):
+                    continue
+                entry['path'] = os.path.join(store_root, *entry['segment'].split('/'))
+                entries.append(entry)
+    entries.sort(key=lambda entry: entry.get('start') or 0)
+    return entries
+
+
+def index_table(entries):
+    """Entradas do índice como DataFrame (uma linha por sessão)"""
+    import pandas as pd
+
+    table = pd.DataFrame(entries)
+    if not table.empty:
+        table['inicio'] = pd.to_datetime(table['start'], unit='s')
+    return table
+
+
+def load_indexed_sessions(entries):
+    """Lê as sessões das entradas, agrupando as leituras por segmento"""
+    by_path = {}
+    for position, entry in enumerate(entries):
+        by_path.setdefault(entry['path'], []).append((entry['offset'], entry['length'], position))
+    sessions = [None] * len(entries)
+    for path, items in by_path.items():
+        with open(path, 'rb') as f:
+            for offset, length, position in sorted(items):
+                f.seek(offset)
+                sessions[position] = json.loads(f.read(length))
+        attach_mouse_chunks([sessions[position] for _, _, position in items], path)
+    return sessions
+
+
+def segment_positions(path):
+    """(offset, tamanho) de cada sessão de um segmento .jsonl, na ordem do arquivo
+
+    As posições vêm do index.jsonl do quiosque; as sessões do fim do segmento
+    que ainda não estiverem no índice (queda entre o segmento e o índice) são
+    localizadas percorrendo as linhas, sem decodificar o JSON. Retorna None para
+    arquivos que não são segmentos.
+    """
+    if not path.endswith('.jsonl'):
+        return None
+    kiosk_dir = os.path.dirname(os.path.dirname(os.path.abspath(path)))
+    store_root = os.path.dirname(kiosk_dir)
+    target = os.path.normcase(os.path.abspath(path))
+    positions = []
+    index_path = os.path.join(kiosk_dir, INDEX_NAME)
+    if os.path.exists(index_path):
+        with open(index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # linha interrompida por uma queda
+                segment = os.path.join(store_root, *entry['segment'].split('/'))
+                if os.path.normcase(segment) == target:
+                    positions.append((entry['offset'], entry['length']))
+        positions.sort()
+    offset = positions[-1][0] + positions[-1][1] if positions else 0
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b'\n'):
+                break  # última linha ainda sendo gravada
+            if line.strip():
+                positions.append((offset, len(line)))
+            offset += len(line)
+    return positions
+
+
+def read_sessions_at(path, positions):
+    """Lê as sessões nas posições (offset, tamanho) do arquivo, com um seek em cada"""
+    sessions = []
+    with open(path, 'rb') as f:
+        for offset, length in positions:
+            f.seek(offset)
+            sessions.append(json.loads(f.read(length)))
+    return attach_mouse_chunks(sessions, path)
+
+
+class SessionReader:
+    """Sessões de um arquivo de dados lidas sob demanda pela posição no arquivo
+
+    Segmentos .jsonl: cada sessão é lida com um seek (segment_positions).
+    JSON antigos: o arquivo é lido uma única vez, no primeiro pedido, e todas
+    as sessões ficam guardadas.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._positions = None
+        self._sessions = None
+
+    def __getitem__(self, index):
+        if self.path.endswith('.jsonl'):
+            if self._positions is None:
+                self._positions = segment_positions(self.path)
+            return read_sessions_at(self.path, [self._positions[index]])[0]
+        if self._sessions is None:
+            self._sessions = load_sessions(self.path)
+        return self._sessions[index]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Lista as sessões dos índices dos quiosques')
+    parser.add_argument('root', help='diretório das sessões (playerdata/sessions)')
+    parser.add_argument('--user', help='nome do jogador')
+    parser.add_argument('--mode', type=int, choices=[0, 1, 2, 3])
+    parser.add_argument('--kiosk')
+    parser.add_argument('--since', help='data inicial (AAAA-MM-DD)')
+    parser.add_argument('--until', help='data final (AAAA-MM-DD)')
+    args = parser.parse_args()
+
+    entries = read_index(args.root, username=args.user, mode=args.mode,
+                         since=args.since, until=args.until, kiosk=args.kiosk)
+    for entry in entries:
+        started = datetime.fromtimestamp(entry['start']).strftime('%Y-%m-%d %H:%M') \
+            if entry.get('start') else '-'
+        modes = ','.join(str(mode) for mode in entry.get('modes', []))
+        print(f"{started}  {entry.get('kiosk', ''):<12} {entry['username']:<20} "
+              f"modos {modes:<8} {entry['trials']:>4} tentativas  {entry['session_id']}")
+    print(f"{len(entries)} sessão(ões), {sum(entry['trials'] for entry in entries)} tentativa(s)")
+
+
+if __name__ == '__main__':
+    main()
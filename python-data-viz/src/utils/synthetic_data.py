@@ -0,0 +1,493 @@
+"""
+Gerador de dados sintéticos de jogadores para testes de escala
+
+Escreve arquivos no mesmo formato que o GameDataCollector do jogo grava
+(prepare_session_for_saving): {"sessions": [...]}, com tentativas, cliques,
+métricas da seta, rastreamento do mouse e métricas da sessão. Cada jogador
+simula uma execução do jogo (um arquivo em <saída>/<AAAA-MM-DD>/) com várias
+partidas, e os tempos de reação seguem uma distribuição ex-Gaussiana
+(normal + exponencial), como tempos de reação reais.
+
+Os jogadores são gerados em processos paralelos e as sessões são escritas
+uma a uma no arquivo, então a memória usada não depende do tamanho total.
+
+Com --layout segments, as sessões seguem o armazenamento atual do jogo
+(refactored/session_store.py): uma linha JSON por sessão no segmento diário
+de cada quiosque (<saída>/<quiosque>/<AAAA-MM>/sessions_<AAAAMMDD>.jsonl) e o
+índice do quiosque em <saída>/<quiosque>/index.jsonl. Cada segmento é gravado
+por um único processo, com todas as execuções do dia naquele quiosque. As
+linhas são codificadas por refactored/session_format.py, o mesmo módulo do
+SessionStore, carregado pelo caminho.
+
+Uso (em python-data-viz/src):
+    python -m utils.synthetic_data --players 200 --output ../synthetic_playerdata
+    python -m utils.synthetic_data --target-size 2GB --workers 8
+    python -m utils.synthetic_data --players 500 --layout segments --kiosks 3 --output ../synthetic_sessions
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import importlib.util
+import multiprocessing
+from datetime import datetime
+
+import numpy as np
+
+GAME_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "..", "refactored")
+
+
+def _load_game_module(name):
+    """Carrega um módulo de refactored/ pelo caminho (o jogo não é um pacote)"""
+    spec = importlib.util.spec_from_file_location(f"jogo_{name}", os.path.join(GAME_DIR, f"{name}.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Formato das linhas do segmento e do índice, o mesmo usado pelo SessionStore
+session_format = _load_game_module("session_format")
+
+# Geometria e constantes do jogo (refactored/config.py, game_modes.py e
+# characters.py; conferidas em refactored/test_modules.py)
+WIDTH, HEIGHT = 1400, 1000
+ESCALATOR_WIDTH = 150
+ESCALATOR_SPACING = 100
+ESCALATOR_START_X = (WIDTH - (3 * ESCALATOR_WIDTH + 2 * ESCALATOR_SPACING)) // 2
+GAME_STATE_PLAYING = 2
+GAME_MODE_ARROW = 3
+SINGLE_MODE_TARGET_DELAY = 5
+TARGET_INTERARRIVAL = (3.0, 7.0)
+ARROW_NOMINAL_FPS = 60
+QUADRANT_ZONE_CENTERS = {0: 225, 1: 315, 2: 135, 3: 45}
+QUADRANT_CLICK_POSITIONS = {0: (WIDTH // 4, HEIGHT // 4), 1: (3 * WIDTH // 4, HEIGHT // 4),
+                            2: (WIDTH // 4, 3 * HEIGHT // 4), 3: (3 * WIDTH // 4, 3 * HEIGHT // 4)}
+
+# Nomes dos traços como em characters.load_assets (prefixo, quantidade)
+TRAITS = {"head": ("Cabeça", 3), "face": ("Rosto", 15), "body": ("Corpo", 2), "hat": ("Chapéu", 10)}
+
+# Parâmetros ex-Gaussianos por modo: (mu, sigma, tau) em segundos
+EX_GAUSSIAN_PARAMS = {0: (0.95, 0.20, 0.45), 1: (1.10, 0.25, 0.50),
+                      2: (1.00, 0.22, 0.45), 3: (0.55, 0.10, 0.25)}
+SUCCESS_RATES = {0: 0.85, 1: 0.85, 2: 0.80, 3: 0.70}
+DEFAULT_TRIALS_PER_MODE = {0: 1, 1: 8, 2: 15, 3: 20}
+MIN_REACTION_TIME = 0.15
+
+LAYOUTS = ("files", "segments")
+
+SIZE_UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3, "TB": 1024 ** 4}
+
+
+def ex_gaussian(rng, mu, sigma, tau, size=None):
+    """Amostra tempos de reação ex-Gaussianos (normal(mu, sigma) + exponencial(tau))"""
+    samples = rng.normal(mu, sigma, size) + rng.exponential(tau, size)
+    return np.maximum(samples, MIN_REACTION_TIME)
+
+
+def player_profile(rng):
+    """Sorteia a habilidade de um jogador: parâmetros ex-Gaussianos e taxa de acerto por modo"""
+    speed = rng.lognormal(0.0, 0.15)
+    attention = rng.lognormal(0.0, 0.30)
+    accuracy = rng.normal(0.0, 0.06)
+    return {
+        mode: {
+            "mu": mu * speed,
+            "sigma": sigma * speed,
+            "tau": tau * attention,
+            "success_rate": float(np.clip(SUCCESS_RATES[mode] + accuracy, 0.3, 0.99)),
+        }
+        for mode, (mu, sigma, tau) in EX_GAUSSIAN_PARAMS.items()
+    }
+
+
+def random_traits(rng):
+    return {slot: {"name": f"{prefix} {int(rng.integers(1, count + 1))}"}
+            for slot, (prefix, count) in TRAITS.items()}
+
+
+def escalator_click(rng):
+    """Posição de clique sobre um personagem em uma das três escadas"""
+    lane = int(rng.integers(3))
+    x = ESCALATOR_START_X + lane * (ESCALATOR_WIDTH + ESCALATOR_SPACING) + ESCALATOR_WIDTH // 2
+    return int(x + rng.integers(-30, 31)), int(rng.integers(80, HEIGHT - 80))
+
+
+def arrow_metrics(rng, success):
+    """Métricas da seta no formato de record_arrow_selection com click_timing"""
+    target = int(rng.integers(4))
+    speed = float(rng.uniform(2.0, 8.0))
+    angular_velocity = speed * ARROW_NOMINAL_FPS
+    if success:
+        clicked, error_deg = target, float(np.clip(rng.normal(0, 18), -44.9, 44.9))
+    elif rng.random() < 0.5:
+        # Quadrante certo, fora da zona
+        clicked, error_deg = target, float(rng.choice([-1, 1]) * rng.uniform(45.1, 120))
+    else:
+        clicked, error_deg = int((target + rng.integers(1, 4)) % 4), float(rng.normal(0, 40))
+    in_zone = abs(error_deg) < 45
+    angle = (QUADRANT_ZONE_CENTERS[target] + error_deg) % 360
+    return clicked, {
+        "clicked_quadrant": clicked,
+        "target_quadrant": target,
+        "arrow_angle_at_click": angle,
+        "arrow_rotation_speed": speed,
+        "arrow_in_target_zone": in_zone,
+        "timing_accuracy": "perfect" if in_zone else "missed_timing",
+        "quadrant_accuracy": "correct" if clicked == target else "wrong_quadrant",
+        "timing_error_deg": error_deg,
+        "timing_error_ms": error_deg / angular_velocity * 1000,
+        "arrow_angle_at_frame": (angle - angular_velocity * float(rng.uniform(0, 1 / 60))) % 360,
+    }
+
+
+def mouse_trajectory(rng, waypoints, start, end, mouse_rate):
+    """Amostras do mouse a mouse_rate Hz passando pelos pontos de clique
+
+    waypoints é uma lista (tempo, x, y). Retorna os arrays de tempo, x e y.
+    """
+    times = np.arange(start, end, 1.0 / mouse_rate)
+    way_t, way_x, way_y = (np.array(column, dtype=float) for column in zip(*waypoints))
+    x = np.interp(times, way_t, way_x) + rng.normal(0, 2.0, times.size)
+    y = np.interp(times, way_t, way_y) + rng.normal(0, 2.0, times.size)
+    return times, np.clip(np.rint(x), 0, WIDTH - 1), np.clip(np.rint(y), 0, HEIGHT - 1)
+
+
+def trial_mouse_metrics(times, x, y, start, end):
+    """mouse_movements, mouse_path_length e average_mouse_speed como o coletor calcula"""
+    first, last = np.searchsorted(times, [start, end])
+    distances = np.hypot(np.diff(x[first:last]), np.diff(y[first:last]))
+    moved = distances[distances > 5]
+    path = float(moved.sum())
+    duration = end - start
+    speed = path / duration if path > 0 and duration > 0 else 0
+    return int(moved.size), (path if path > 0 else 0), speed
+
+
+def generate_session(rng, username, game_mode, start_time, n_trials, mouse_rate, profile):
+    """Gera uma partida completa; retorna a sessão e o instante em que terminou"""
+    params = profile[game_mode]
+    reaction_times = ex_gaussian(rng, params["mu"], params["sigma"], params["tau"], n_trials)
+    is_arrow = game_mode == GAME_MODE_ARROW
+
+    trials = []
+    waypoints = [(start_time, WIDTH / 2, HEIGHT / 2)]
+    now = start_time
+    score = 0
+    for reaction_time in reaction_times:
+        reaction_time = float(reaction_time)
+        trial_start = now
+        if is_arrow:
+            spawn_time = None
+            selection_time = trial_start + reaction_time
+        else:
+            delay = (SINGLE_MODE_TARGET_DELAY if game_mode == 0
+                     else rng.uniform(*TARGET_INTERARRIVAL))
+            spawn_time = trial_start + delay
+            selection_time = spawn_time + reaction_time
+        success = bool(rng.random() < params["success_rate"])
+        score += success
+
+        trial = {
+            "trial_start_time": trial_start,
+            "game_mode": game_mode,
+            "target_spawn_time": spawn_time,
+            "selection_time": selection_time,
+            "success": success,
+            "reaction_time": reaction_time,
+            "score": score,
+            "trial_metrics": {
+                "mouse_movements": 0,
+                "hesitation_time": 0 if is_arrow else selection_time - spawn_time,
+                "clicks_before_success": 1,
+                "average_mouse_speed": 0,
+                "mouse_path_length": 0
+            }
+        }
+        if is_arrow:
+            clicked, trial["arrow_metrics"] = arrow_metrics(rng, success)
+            base_x, base_y = QUADRANT_CLICK_POSITIONS[clicked]
+            click_x = int(base_x + rng.integers(-100, 101))
+            click_y = int(base_y + rng.integers(-100, 101))
+        else:
+            trial["target_character"] = random_traits(rng)
+            click_x, click_y = escalator_click(rng)
+        trial["clicks"] = [{"x": click_x, "y": click_y,
+                            "timestamp": selection_time, "success": success}]
+        trials.append(trial)
+        waypoints.append((selection_time, click_x, click_y))
+
+        now = selection_time + float(rng.uniform(0.0, 0.3))
+        # Um erro encerra a partida nos modos com vidas; no infinito só custa tempo
+        if not success and game_mode != 2:
+            break
+
+    end_time = now
+    times, x, y = mouse_trajectory(rng, waypoints, start_time, end_time, mouse_rate)
+    for trial in trials:
+        movements, path, speed = trial_mouse_metrics(
+            times, x, y, trial["trial_start_time"], trial["selection_time"])
+        trial["trial_metrics"]["mouse_movements"] = movements
+        if path > 0:
+            trial["trial_metrics"]["mouse_path_length"] = path
+            trial["trial_metrics"]["average_mouse_speed"] = speed
+
+    correct = sum(trial["success"] for trial in trials)
+    session = {
+        "session_id": datetime.fromtimestamp(start_time).strftime("%Y%m%d_%H%M%S_%f"),
+        "username": username,
+        "game_mode": game_mode,
+        "trials": trials,
+        "mouse_tracking": [
+            {"timestamp": t, "x": int(px), "y": int(py), "game_state": GAME_STATE_PLAYING}
+            for t, px, py in zip(times.tolist(), x.tolist(), y.tolist())
+        ],
+        "session_metrics": {
+            "total_clicks": len(trials),
+            "correct_clicks": correct,
+            "incorrect_clicks": len(trials) - correct,
+            "missed_targets": 0,
+            "false_positives": len(trials) - correct,
+            "session_duration": trials[-1]["selection_time"] - trials[0]["trial_start_time"],
+            "focus_breaks": 0
+        }
+    }
+    return session, end_time
+
+
+def player_start_time(index, options):
+    # Uma execução a cada 15 minutos, a partir de start_time
+    return options["start_time"] + index * 900
+
+
+def player_sessions(index, options):
+    """Gera as partidas de uma execução do jogo do jogador index, uma de cada vez"""
+    rng = np.random.default_rng([options["seed"], index])
+    profile = player_profile(rng)
+    username = f"Jogador_{index + 1:05d}"
+    modes = options["modes"]
+    now = player_start_time(index, options)
+    for number in range(options["sessions"]):
+        game_mode = modes[(index + number) % len(modes)]
+        session, now = generate_session(rng, username, game_mode, now,
+                                        options["trials_per_mode"][game_mode],
+                                        options["mouse_rate"], profile)
+        yield session
+        # Intervalo entre partidas (menu, nome, instruções)
+        now += float(rng.uniform(5, 30))
+
+
+def generate_player_file(task):
+    """Gera o arquivo de um jogador; roda nos processos de trabalho
+
+    Retorna (caminho, bytes, sessões, tentativas, amostras de mouse).
+    """
+    index, options = task
+    started = datetime.fromtimestamp(player_start_time(index, options))
+    directory = os.path.join(options["output"], started.strftime("%Y-%m-%d"))
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"game_data_{started.strftime('%Y%m%d_%H%M%S')}.json")
+
+    trials_total = mouse_total = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{\n  "sessions": [')
+        for number, session in enumerate(player_sessions(index, options)):
+            trials_total += len(session["trials"])
+            mouse_total += len(session["mouse_tracking"])
+            f.write(",\n" if number else "\n")
+            json.dump(session, f, indent=options["indent"], ensure_ascii=False)
+        f.write("\n  ]\n}\n")
+    return path, os.path.getsize(path), options["sessions"], trials_total, mouse_total
+
+
+def kiosk_name(index, kiosks):
+    # Os jogadores se revezam entre os quiosques
+    return f"quiosque_{index % kiosks + 1}"
+
+
+def segment_groups(players, start_time, kiosks):
+    """Jogadores de cada segmento (quiosque e dia), na ordem em que jogaram"""
+    groups = {}
+    for index in range(players):
+        day = datetime.fromtimestamp(start_time + index * 900).strftime("%Y%m%d")
+        groups.setdefault((kiosk_name(index, kiosks), day), []).append(index)
+    return list(groups.values())
+
+
+def generate_segment_file(task):
+    """Gera o segmento diário de um quiosque com as execuções do dia; roda nos processos de trabalho
+
+    Retorna (caminho, bytes, sessões, tentativas, amostras de mouse, entradas do índice).
+    """
+    indices, options = task
+    kiosk = kiosk_name(indices[0], options["kiosks"])
+    day = datetime.fromtimestamp(player_start_time(indices[0], options))
+    segment = session_format.segment_path(kiosk, day)
+    path = os.path.join(options["output"], *segment.split("/"))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    entries = []
+    trials_total = mouse_total = 0
+    with open(path, "wb") as f:
+        for index in indices:
+            for session in player_sessions(index, options):
+                line = session_format.encode_record(session)
+                entries.append(session_format.index_entry(session, segment, f.tell(), len(line), kiosk))
+                f.write(line)
+                trials_total += len(session["trials"])
+                mouse_total += len(session["mouse_tracking"])
+    return path, os.path.getsize(path), len(entries), trials_total, mouse_total, entries
+
+
+def write_indexes(output, entries):
+    """Grava o index.jsonl de cada quiosque com as entradas em ordem de início"""
+    by_kiosk = {}
+    for entry in entries:
+        by_kiosk.setdefault(entry["kiosk"], []).append(entry)
+    for kiosk, kiosk_entries in by_kiosk.items():
+        kiosk_entries.sort(key=lambda entry: (entry["start"] or 0, entry["segment"], entry["offset"]))
+        with open(os.path.join(output, kiosk, session_format.INDEX_NAME), "wb") as f:
+            f.writelines(session_format.encode_record(entry) for entry in kiosk_entries)
+
+
+def parse_size(text):
+    """Converte '500MB', '2GB' ou '1024' (bytes) em bytes"""
+    text = text.strip().upper()
+    for unit, factor in SIZE_UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def parse_trials_per_mode(text):
+    """Converte '0=1,1=8,2=15,3=20' em {modo: tentativas}"""
+    trials = dict(DEFAULT_TRIALS_PER_MODE)
+    for item in text.split(","):
+        mode, count = item.split("=")
+        trials[int(mode)] = int(count)
+    return trials
+
+
+def generate_dataset(output, players, sessions=8, trials_per_mode=None, mouse_rate=60,
+                     modes=(0, 1, 2, 3), workers=None, seed=0, indent=2,
+                     start_time=None, progress=None, layout="files", kiosks=1):
+    """Gera os arquivos de players jogadores em paralelo
+
+    layout "files" grava um JSON por jogador; "segments" grava os segmentos
+    diários de kiosks quiosques e os índices (indent é ignorado: o SessionStore
+    grava JSON compacto). progress, se dado, é chamado com o resultado de cada
+    arquivo concluído. Retorna a lista de resultados
+    (caminho, bytes, sessões, tentativas, amostras de mouse).
+    """
+    options = {
+        "output": output,
+        "sessions": sessions,
+        "trials_per_mode": trials_per_mode or dict(DEFAULT_TRIALS_PER_MODE),
+        "mouse_rate": mouse_rate,
+        "modes": list(modes),
+        "seed": seed,
+        "indent": indent,
+        "start_time": start_time if start_time is not None else time.time() - players * 900,
+        "kiosks": kiosks,
+    }
+    if layout == "segments":
+        worker = generate_segment_file
+        tasks = [(indices, options)
+                 for indices in segment_groups(players, options["start_time"], kiosks)]
+    else:
+        worker = generate_player_file
+        tasks = [(index, options) for index in range(players)]
+    results = []
+    entries = []
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        outputs = map(worker, tasks)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(workers)
+        outputs = pool.imap_unordered(worker, tasks)
+    try:
+        for result in outputs:
+            if layout == "segments":
+                entries.extend(result[5])
+                result = result[:5]
+            results.append(result)
+            if progress:
+                progress(result)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    if layout == "segments":
+        # Só o processo principal grava os índices, depois de todos os segmentos
+        write_indexes(output, entries)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos de jogadores")
+    parser.add_argument("--output", default="synthetic_playerdata", help="diretório de saída")
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--sessions", type=int, default=8, help="partidas por jogador")
+    parser.add_argument("--trials-per-mode", type=parse_trials_per_mode,
+                        default=dict(DEFAULT_TRIALS_PER_MODE),
+                        help="máximo de tentativas por partida, ex.: 0=1,1=8,2=15,3=20")
+    parser.add_argument("--mouse-rate", type=float, default=60, help="amostras de mouse por segundo")
+    parser.add_argument("--modes", type=int, nargs="+", default=[0, 1, 2, 3], choices=[0, 1, 2, 3])
+    parser.add_argument("--target-size", type=parse_size,
+                        help="tamanho total aproximado (ex.: 2GB); substitui --players")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-date", type=lambda text: datetime.strptime(text, "%Y-%m-%d"),
+                        help="data da primeira execução (AAAA-MM-DD); padrão: termina agora")
+    parser.add_argument("--compact", action="store_true",
+                        help="JSON sem indentação (o jogo grava com indent=2)")
+    parser.add_argument("--layout", choices=LAYOUTS, default="files",
+                        help="files: um JSON por execução (formato antigo); "
+                             "segments: segmentos diários por quiosque com índice")
+    parser.add_argument("--kiosks", type=int, default=1, help="quiosques (com --layout segments)")
+    args = parser.parse_args()
+
+    settings = dict(sessions=args.sessions, trials_per_mode=args.trials_per_mode,
+                    mouse_rate=args.mouse_rate, modes=args.modes, seed=args.seed,
+                    indent=None if args.compact else 2,
+                    start_time=args.start_date.timestamp() if args.start_date else None,
+                    layout=args.layout, kiosks=max(1, args.kiosks))
+    players = args.players
+    if args.target_size:
+        # Estima o tamanho por jogador com uma amostra descartável
+        sample_dir = os.path.join(args.output, ".sample")
+        sample = generate_dataset(sample_dir, 1, workers=1, **settings)
+        shutil.rmtree(sample_dir)
+        players = max(1, -(-args.target_size // sample[0][1]))
+    if settings["start_time"] is None:
+        settings["start_time"] = time.time() - players * 900
+    files = players if args.layout == "files" else \
+        len(segment_groups(players, settings["start_time"], settings["kiosks"]))
+
+    print(f"Gerando {players} jogador(es) em {args.output} com {args.workers} processo(s)")
+    totals = {"bytes": 0, "files": 0, "sessions": 0, "trials": 0, "mouse": 0}
+    started = time.perf_counter()
+
+    def progress(result):
+        _, size, sessions, trials, mouse = result
+        totals["bytes"] += size
+        totals["files"] += 1
+        totals["sessions"] += sessions
+        totals["trials"] += trials
+        totals["mouse"] += mouse
+        if totals["files"] % max(1, files // 20) == 0 or totals["files"] == files:
+            elapsed = time.perf_counter() - started
+            print(f"  {totals['files']}/{files} arquivos, "
+                  f"{totals['bytes'] / 1024 ** 2:.1f} MB, "
+                  f"{totals['bytes'] / 1024 ** 2 / max(elapsed, 1e-9):.1f} MB/s")
+
+    generate_dataset(args.output, players, workers=args.workers, progress=progress, **settings)
+    elapsed = time.perf_counter() - started
+    print(f"Concluído em {elapsed:.1f} s: {totals['files']} arquivos, {totals['sessions']} sessões, "
+          f"{totals['trials']} tentativas, {totals['mouse']} amostras de mouse, "
+          f"{totals['bytes'] / 1024 ** 2:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""
+Características cinemáticas do mouse por tentativa, calculadas com NumPy
+
+O rastreamento do mouse de cada sessão é um fluxo único de amostras
+(timestamp, x, y). As amostras de cada tentativa são localizadas com
+searchsorted nos timestamps e todas as tentativas da sessão são reduzidas
+de uma vez com somas acumuladas, sem laços por amostra em Python.
+
+Unidades: pixels e segundos. Cada intervalo entre duas amostras consecutivas
+pertence a uma tentativa se as duas amostras pertencem a ela.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.mouse_store import mouse_samples
+
+# Velocidade (px/s) a partir da qual o mouse é considerado em movimento
+MOVEMENT_SPEED = 50.0
+# Duração mínima (s) de um trecho parado para contar como pausa
+MIN_PAUSE_DURATION = 0.1
+# Velocidade mínima (px/s) de um pico para contar como submovimento
+SUBMOVEMENT_MIN_SPEED = 100.0
+# Menor intervalo entre amostras considerado no cálculo das derivadas
+MIN_DT = 1e-3
+
+FEATURE_COLUMNS = [
+    'session_index', 'trial_index', 'username', 'game_mode', 'samples', 'duration',
+    'path_length', 'straight_distance', 'path_efficiency', 'mean_velocity', 'peak_velocity',
+    'mean_acceleration', 'peak_acceleration', 'mean_jerk', 'mean_curvature',
+    'pause_count', 'pause_duration', 'submovements', 'initial_latency'
+]
+
+
+def _range_sum(values, starts, ends):
+    """Soma de values[starts[i]:ends[i]] para todos os i (intervalos vazios somam 0)"""
+    cumulative = np.concatenate(([0.0], np.cumsum(values, dtype=float)))
+    # Derivadas de ordem k têm k elementos a menos que as amostras
+    starts = np.minimum(starts, len(values))
+    ends = np.clip(ends, starts, len(values))
+    return cumulative[ends] - cumulative[starts]
+
+
+def _range_max(values, starts, ends):
+    """Máximo de values[starts[i]:ends[i]]; NaN em intervalos vazios"""
+    result = np.full(len(starts), np.nan)
+    starts = np.minimum(starts, len(values))
+    ends = np.minimum(ends, len(values))
+    valid = ends > starts
+    if not valid.any() or len(values) == 0:
+        return result
+    # Sentinela no fim para que ends possa ser igual a len(values)
+    padded = np.append(values, -np.inf)
+    bounds = np.column_stack((starts[valid], ends[valid])).ravel()
+    result[valid] = np.maximum.reduceat(padded, bounds)[::2]
+    return result
+
+
+def _first_time(trial, *keys):
+    """Primeiro dos campos de tempo que não seja None (NaN se nenhum existir)"""
+    for key in keys:
+        if trial.get(key) is not None:
+            return trial[key]
+    return np.nan
+
+
+def _assign_runs(run_starts, run_ends, first, last, valid):
+    """Tentativa dona de cada sequência de intervalos (pela posição do início)
+
+    Só as tentativas válidas (com horário de início) são candidatas, ordenadas
+    pela primeira amostra; tentativas sem horário não entram na busca.
+    Retorna o índice da tentativa, o fim da sequência cortado no fim da
+    tentativa e a máscara das sequências que caem dentro de alguma tentativa.
+    """
+    candidates = np.flatnonzero(valid)
+    if not len(candidates):
+        return (np.zeros(len(run_starts), dtype=int), run_ends,
+                np.zeros(len(run_starts), dtype=bool))
+    candidates = candidates[np.argsort(first[candidates], kind='stable')]
+    position = np.searchsorted(first[candidates], run_starts, side='right') - 1
+    inside = position >= 0
+    owner = candidates[np.clip(position, 0, len(candidates) - 1)]
+    clipped_ends = np.minimum(run_ends, last[owner] - 1)
+    inside &= clipped_ends > run_starts
+    return owner, clipped_ends, inside
+
+
+def _runs(mask):
+    """Início e fim (exclusivo) de cada sequência de True"""
+    edges = np.diff(np.concatenate(([False], mask, [False])).astype(int))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+def session_features(session):
+    """Características de todas as tentativas de uma sessão (dicionário coluna -> array)"""
+    trials = session.get('trials', [])
+    t, x, y, _ = mouse_samples(session)
+    order = np.argsort(t, kind='stable')
+    t, x, y = t[order], x[order].astype(float), y[order].astype(float)
+
+    n_trials = len(trials)
+    starts = np.array([_first_time(trial, 'trial_start_time') for trial in trials], dtype=float)
+    ends = np.array([_first_time(trial, 'selection_time', 'trial_start_time')
+                     for trial in trials], dtype=float)
+    # Referência da latência: aparição do alvo ou, no modo seta, o início da tentativa
+    references = np.array([_first_time(trial, 'target_spawn_time', 'trial_start_time')
+                           for trial in trials], dtype=float)
+    valid_trials = ~np.isnan(starts)
+    starts_filled = np.where(valid_trials, starts, 0.0)
+    ends_filled = np.where(valid_trials, ends, 0.0)
+
+    # Primeira amostra e fim (exclusivo) de cada tentativa
+    first = np.searchsorted(t, starts_filled, side='left')
+    last = np.searchsorted(t, ends_filled, side='right')
+    last = np.where(valid_trials, np.maximum(last, first), first)
+    counts = last - first
+
+    # Derivadas ao longo do fluxo inteiro; cada ordem tem um elemento a menos
+    dt = np.maximum(np.diff(t), MIN_DT)
+    dx, dy = np.diff(x), np.diff(y)
+    distance = np.hypot(dx, dy)
+    velocity = distance / dt
+    acceleration = np.diff(velocity) / dt[1:]
+    jerk = np.diff(acceleration) / dt[2:]
+    heading = np.arctan2(dy, dx)
+    turning = np.abs((np.diff(heading) + np.pi) % (2 * np.pi) - np.pi)
+    # Ângulo só é definido se os dois deslocamentos forem não nulos
+    turning = np.where((distance[:-1] > 0) & (distance[1:] > 0), turning, 0.0)
+
+    # Intervalos da tentativa: [first, last - k) para derivadas de ordem k
+    def window(order):
+        return first, np.maximum(last - order, first)
+
+    path_length = _range_sum(distance, *window(1))
+    movement_time = _range_sum(dt, *window(1))
+    peak_velocity = _range_max(velocity, *window(1))
+    acceleration_sum = _range_sum(np.abs(acceleration), *window(2))
+    peak_acceleration = _range_max(np.abs(acceleration), *window(2))
+    jerk_sum = _range_sum(np.abs(jerk), *window(3))
+    turning_sum = _range_sum(turning, *window(2))
+
+    # Submovimentos: trechos contínuos de movimento (velocidade suavizada acima de
+    # MOVEMENT_SPEED) cujo pico passa de SUBMOVEMENT_MIN_SPEED; a suavização evita
+    # que o ruído de uma amostra divida um movimento em dois
+    smooth = np.convolve(velocity, np.ones(5) / 5, mode='same') if len(velocity) else velocity
+    submovements = np.zeros(n_trials)
+    run_starts, run_ends = _runs(smooth >= MOVEMENT_SPEED)
+    if len(run_starts) and n_trials:
+        owner, clipped_ends, inside = _assign_runs(run_starts, run_ends, first, last, valid_trials)
+        peak = _range_max(smooth, run_starts, np.maximum(clipped_ends, run_starts))
+        inside &= peak >= SUBMOVEMENT_MIN_SPEED
+        submovements = np.bincount(owner[inside], minlength=n_trials).astype(float)
+
+    # Pausas: sequências de intervalos parados com duração mínima, cortadas no fim da tentativa
+    still = velocity < MOVEMENT_SPEED
+    pause_count = np.zeros(n_trials)
+    pause_duration = np.zeros(n_trials)
+    run_starts, run_ends = _runs(still)
+    if len(run_starts) and n_trials:
+        owner, clipped_ends, inside = _assign_runs(run_starts, run_ends, first, last, valid_trials)
+        elapsed = np.concatenate(([0.0], np.cumsum(dt)))
+        durations = elapsed[np.maximum(clipped_ends, run_starts)] - elapsed[run_starts]
+        inside &= durations >= MIN_PAUSE_DURATION
+        pause_count = np.bincount(owner[inside], minlength=n_trials).astype(float)
+        # bincount sem elementos devolve inteiros mesmo com weights
+        pause_duration = np.bincount(owner[inside], weights=durations[inside],
+                                     minlength=n_trials).astype(float)
+
+    # Latência inicial: primeiro intervalo em movimento depois da referência
+    initial_latency = np.full(n_trials, np.nan)
+    moving = np.flatnonzero(~still)
+    if len(moving) and n_trials:
+        reference_index = np.searchsorted(t, np.nan_to_num(references), side='left')
+        position = np.searchsorted(moving, reference_index)
+        found = position < len(moving)
+        candidate = moving[np.minimum(position, len(moving) - 1)]
+        found &= candidate < last - 1
+        initial_latency[found] = t[candidate[found]] - references[found]
+
+    # Eficiência: distância em linha reta entre a primeira e a última amostra / caminho
+    has_samples = counts > 0
+    first_index = np.minimum(first, max(len(t) - 1, 0))
+    last_index = np.maximum(last - 1, 0)
+    straight = np.zeros(n_trials)
+    if len(t):
+        straight = np.where(has_samples, np.hypot(x[last_index] - x[first_index],
+                                                  y[last_index] - y[first_index]), 0.0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        intervals = np.maximum(counts - 1, 0)
+        features = {
+            'samples': counts,
+            'duration': ends - starts,
+            'path_length': path_length,
+            'straight_distance': straight,
+            'path_efficiency': np.where(path_length > 0, straight / path_length, np.nan),
+            'mean_velocity': np.where(movement_time > 0, path_length / movement_time, np.nan),
+            'peak_velocity': peak_velocity,
+            'mean_acceleration': np.where(intervals > 1, acceleration_sum / (intervals - 1), np.nan),
+            'peak_acceleration': peak_acceleration,
+            'mean_jerk': np.where(intervals > 2, jerk_sum / (intervals - 2), np.nan),
+            'mean_curvature': np.where(path_length > 0, turning_sum / path_length, np.nan),
+            'pause_count': pause_count,
+            'pause_duration': pause_duration,
+            'submovements': submovements,
+            'initial_latency': initial_latency
+        }
+    return features
+
+
+def trajectory_features(sessions):
+    """Tabela com uma linha por tentativa e as características do mouse em colunas"""
+    frames = []
+    for session_index, session in enumerate(sessions):
+        trials = session.get('trials', [])
+        if not trials:
+            continue
+        frame = pd.DataFrame(session_features(session))
+        frame.insert(0, 'session_index', session_index)
+        frame.insert(1, 'trial_index', np.arange(len(trials)))
+        frame.insert(2, 'username', session.get('username', 'Anônimo'))
+        frame.insert(3, 'game_mode', [int(trial['game_mode']) if trial.get('game_mode') is not None
+                                      else None for trial in trials])
+        frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=FEATURE_COLUMNS)
+    table = pd.concat(frames, ignore_index=True)
+    for column in ('samples', 'pause_count', 'submovements'):
+        table[column] = table[column].astype(int)
+    return table[FEATURE_COLUMNS]
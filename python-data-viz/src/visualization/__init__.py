@@ -1,22 +1,45 @@
 """
 Módulo de visualização para análise de dados do jogo Memory Escalator.
 Fornece funções para gerar mapas de calor e análises detalhadas por modo de jogo.
+
+Os submódulos (e com eles pandas, matplotlib, seaborn e numpy) só são
+importados quando um dos nomes abaixo é usado pela primeira vez, para a
+ferramenta abrir rápido.
 """
+import importlib
+
+# Nome exportado -> submódulo que o define
+_EXPORTS = {
+    'generate_heatmap': 'heatmap',
+    'build_heatmap_figure': 'heatmap',
+    'generate_comprehensive_report': 'game_mode_analysis',
+    'build_report': 'game_mode_analysis',
+    'display_report_window': 'game_mode_analysis',
+    'extract_trials_by_mode': 'game_mode_analysis',
+    'analyze_reaction_times': 'game_mode_analysis',
+    'analyze_success_rates': 'game_mode_analysis',
+    'LiveMonitor': 'live_monitor',
+    'TelemetryReceiver': 'live_monitor'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
+
 
-from .heatmap import generate_heatmap
-from .game_mode_analysis import (
-    generate_comprehensive_report,
-    display_report_window,
-    extract_trials_by_mode,
-    analyze_reaction_times,
-    analyze_success_rates
-)
-
-__all__ = [
-    'generate_heatmap',
-    'generate_comprehensive_report',
-    'display_report_window',
-    'extract_trials_by_mode',
-    'analyze_reaction_times',
-    'analyze_success_rates'
-]
+def preload():
+    """Importa os submódulos e as bibliotecas pesadas (pode rodar em outra thread)"""
+    for module in sorted(set(_EXPORTS.values())):
+        importlib.import_module(f'.{module}', __name__)
+    import seaborn  # noqa: F401  (usado pelo mapa de calor)
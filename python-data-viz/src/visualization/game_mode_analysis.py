@@ -9,9 +9,10 @@ Fornece visualizações e estatísticas detalhadas para:
 
 import pandas as pd
 import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 
+from utils.schema import is_validated
+
 # Constantes dos modos de jogo
 GAME_MODE_SINGLE = 0
 GAME_MODE_ALTERNATING = 1
@@ -52,6 +53,16 @@ def extract_trials_by_mode(data):
         GAME_MODE_ARROW: []
     }
     
+    if is_validated(sessions):
+        # Sessões validadas pelo esquema: game_mode é sempre um inteiro de 0 a 3
+        for session in sessions:
+            username = session['username']
+            for trial in session['trials']:
+                trial_copy = trial.copy()
+                trial_copy['username'] = username
+                trials_by_mode[trial['game_mode']].append(trial_copy)
+        return trials_by_mode
+    
     for session in sessions:
         username = session.get('username', 'Anônimo')
         trials = session.get('trials', [])
@@ -129,6 +140,40 @@ def analyze_success_rates(trials_by_mode):
     
     return pd.DataFrame(stats)
 
+# Características do mouse resumidas no relatório (coluna -> rótulo)
+TRAJECTORY_SUMMARY = {
+    'path_efficiency': 'Eficiência do Caminho',
+    'mean_velocity': 'Velocidade Média (px/s)',
+    'peak_velocity': 'Velocidade de Pico (px/s)',
+    'mean_curvature': 'Curvatura (rad/px)',
+    'pause_count': 'Pausas',
+    'pause_duration': 'Tempo Parado (s)',
+    'submovements': 'Submovimentos',
+    'initial_latency': 'Latência Inicial (s)'
+}
+
+def analyze_trajectories(mouse_features):
+    """
+    Resume as características do mouse por modo de jogo (medianas por tentativa)
+    
+    Args:
+        mouse_features: DataFrame de utils.trajectory.trajectory_features
+        
+    Returns:
+        DataFrame com uma linha por modo
+    """
+    stats = []
+    if mouse_features is None or mouse_features.empty:
+        return pd.DataFrame(stats)
+    
+    for mode, features in mouse_features.groupby('game_mode'):
+        row = {'Modo': get_mode_name(int(mode)), 'Tentativas': len(features)}
+        for column, label in TRAJECTORY_SUMMARY.items():
+            row[label] = features[column].median()
+        stats.append(row)
+    
+    return pd.DataFrame(stats)
+
 def plot_reaction_times_comparison(trials_by_mode):
     """
     Cria gráficos comparativos de tempo de reação entre modos
@@ -150,10 +195,12 @@ def plot_reaction_times_comparison(trials_by_mode):
     
     # Cria layout baseado na quantidade de modos com dados
     n_modes = len(modes_with_data)
+    # Boxplot + um histograma por modo, em duas colunas
+    n_rows = (n_modes + 2) // 2
     if n_modes == 1:
         fig, axes = plt.subplots(1, 2, figsize=(15, 6))
     else:
-        fig, axes = plt.subplots(2, 2, figsize=(15, 12))
+        fig, axes = plt.subplots(n_rows, 2, figsize=(15, 6 * n_rows))
     
     fig.suptitle('Análise de Tempos de Reação por Modo de Jogo', fontsize=16, fontweight='bold')
     
@@ -167,7 +214,9 @@ def plot_reaction_times_comparison(trials_by_mode):
     else:
         ax_box = axes[0, 0]
     
-    ax_box.boxplot(data_for_boxplot, labels=labels_for_boxplot)
+    # Rótulos definidos à parte: o parâmetro labels= foi removido no matplotlib 3.11
+    ax_box.boxplot(data_for_boxplot)
+    ax_box.set_xticks(range(1, len(labels_for_boxplot) + 1), labels_for_boxplot)
     ax_box.set_title('Comparação de Tempos de Reação (Boxplot)', fontweight='bold')
     ax_box.set_ylabel('Tempo de Reação (segundos)')
     ax_box.grid(True, alpha=0.3)
@@ -214,8 +263,8 @@ def plot_reaction_times_comparison(trials_by_mode):
         pass  # Layout 1x2, sem subplots extras
     else:
         total_plots = n_modes + 1  # +1 para o boxplot
-        if total_plots < 4:
-            for i in range(total_plots, 4):
+        if total_plots < n_rows * 2:
+            for i in range(total_plots, n_rows * 2):
                 row = i // 2
                 col = i % 2
                 fig.delaxes(axes[row, col])
@@ -427,12 +476,27 @@ def generate_comprehensive_report(data):
     Returns:
         dict: Dicionário contendo DataFrames e figuras
     """
-    trials_by_mode = extract_trials_by_mode(data)
+    from utils.dataset import get_sessions
+    from utils.trajectory import trajectory_features
     
+    return build_report(extract_trials_by_mode(data), trajectory_features(get_sessions(data)))
+
+def build_report(trials_by_mode, mouse_features=None):
+    """
+    Gera as estatísticas e figuras do relatório a partir das tentativas por modo
+    
+    Args:
+        trials_by_mode: Dicionário com tentativas organizadas por modo
+        mouse_features: Características do mouse por tentativa (opcional)
+        
+    Returns:
+        dict: Dicionário contendo DataFrames e figuras
+    """
     report = {
         'trials_by_mode': trials_by_mode,
         'reaction_time_stats': analyze_reaction_times(trials_by_mode),
         'success_rate_stats': analyze_success_rates(trials_by_mode),
+        'trajectory_stats': analyze_trajectories(mouse_features),
         'figures': {
             'reaction_times_comparison': plot_reaction_times_comparison(trials_by_mode),
             'success_rate_comparison': plot_success_rate_comparison(trials_by_mode),
@@ -503,4 +567,14 @@ def display_report_window(report):
     canvas4.draw()
     canvas4.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
     
+    # Aba 5: Trajetória do Mouse
+    if not report['trajectory_stats'].empty:
+        stats_frame5 = ttk.Frame(notebook)
+        notebook.add(stats_frame5, text="Trajetória do Mouse")
+        
+        text5 = tk.Text(stats_frame5, wrap='none')
+        text5.pack(fill='both', expand=True, padx=10, pady=10)
+        text5.insert('1.0', report['trajectory_stats'].to_string(index=False))
+        text5.config(state='disabled')
+    
     return window
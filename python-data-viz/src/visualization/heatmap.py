@@ -1,36 +1,51 @@
 import pandas as pd
-import seaborn as sns
 import matplotlib.pyplot as plt
 
-def generate_heatmap(data):
-    # Extrair apenas os arrays completos de mouse_tracking
-    mouse_data = []
-    for entry in data['mouse_tracking']:
-        if 'x' in entry and 'y' in entry:
-            mouse_data.append({
-                'x': entry['x'],
-                'y': entry['y'],
-                'game_state': entry['game_state']
-            })
-    
-    # Converte para DataFrame
-    heatmap_data = pd.DataFrame(mouse_data)
-    
-    # Cria o Heatmap usando seaborn
-    plt.figure(figsize=(12, 8))
-    
+from utils.mouse_store import mouse_samples
+
+def build_heatmap_figure(data, max_points=None, time_range=None):
+    """
+    Cria a figura do mapa de calor do movimento do mouse sem exibi-la
+
+    Args:
+        data: Sessão (ou dicionário) com a lista 'mouse_tracking' ou a
+            referência 'mouse_tracking_chunks' do armazenamento em blocos
+        max_points: Se dado, usa uma amostra uniforme de no máximo max_points
+            posições (o custo do KDE cresce com o número de pontos)
+        time_range: (início, fim) em segundos; só os blocos desse trecho são lidos
+    """
+    # seaborn é o import mais lento; só é carregado quando um mapa é gerado
+    import seaborn as sns
+
+    start, end = time_range or (None, None)
+    _, x, y, game_state = mouse_samples(data, start, end)
+    heatmap_data = pd.DataFrame({'x': x, 'y': y, 'game_state': game_state})
+    if max_points is not None and len(heatmap_data) > max_points:
+        heatmap_data = heatmap_data.iloc[::-(-len(heatmap_data) // max_points)]
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+
     # Gera heatmap com coordenadas x e y
-    sns.kdeplot(
-        data=heatmap_data,
-        x='x',
-        y='y',
-        cmap='hot',
-        fill=True
-    )
-    
-    plt.title('Mouse Movement Heatmap')
-    plt.xlabel('X Coordinate')
-    plt.ylabel('Y Coordinate')
-    
+    if len(heatmap_data) > 1:
+        sns.kdeplot(
+            data=heatmap_data,
+            x='x',
+            y='y',
+            cmap='hot',
+            fill=True,
+            ax=ax
+        )
+    else:
+        ax.text(0.5, 0.5, 'Sem dados de movimento do mouse', ha='center', va='center',
+                transform=ax.transAxes)
+
+    ax.set_title('Mouse Movement Heatmap')
+    ax.set_xlabel('X Coordinate')
+    ax.set_ylabel('Y Coordinate')
+    return fig
+
+def generate_heatmap(data):
+    build_heatmap_figure(data)
+
     # Mostra o gráfico
-    plt.show()
\ No newline at end of file
+    plt.show()
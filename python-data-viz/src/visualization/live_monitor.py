@@ -0,0 +1,253 @@
+"""
+Monitor ao vivo da telemetria enviada pelos jogos em execução
+
+Recebe por UDP os eventos publicados pelo refactored/telemetry.py de um ou
+mais quiosques e mostra, atualizando de forma incremental:
+  - uma tabela com o estado atual de cada quiosque (jogador, modo, pontuação,
+    tempo de reação, lapsos, FPS e eventos perdidos);
+  - o tempo de reação de cada tentativa, uma linha por quiosque;
+  - o p95 do tempo de frame de cada quiosque ao longo do tempo.
+
+O socket é lido em uma thread de fundo; a janela só consome a fila a cada
+atualização, então nada bloqueia a interface.
+
+Uso (em python-data-viz/src):
+    python -m visualization.live_monitor --port 47800
+"""
+import json
+import time
+import queue
+import socket
+import argparse
+import threading
+from collections import deque
+
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 47800
+# Pontos mantidos em cada gráfico, por quiosque
+HISTORY = 300
+MODE_NAMES = {0: 'Aparição Única', 1: 'Alternado', 2: 'Infinito', 3: 'Seta'}
+# Estados de jogo do refactored/config.py
+STATE_NAMES = {0: 'Menu', 1: 'Memorizando', 2: 'Jogando', 6: 'Fim de jogo',
+               7: 'Recordes', 8: 'Instruções', 9: 'Confirmando jogador'}
+
+
+class TelemetryReceiver:
+    """Lê datagramas de telemetria em uma thread e os entrega por uma fila"""
+    def __init__(self, port=DEFAULT_PORT, host='0.0.0.0'):
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.socket.bind((host, port))
+        self.socket.settimeout(0.5)
+        self.queue = queue.SimpleQueue()
+        self.invalid = 0
+        self.running = True
+        self.thread = threading.Thread(target=self._receive, name='telemetry-receiver', daemon=True)
+        self.thread.start()
+
+    def _receive(self):
+        while self.running:
+            try:
+                payload, _ = self.socket.recvfrom(65535)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            try:
+                message = json.loads(payload)
+            except ValueError:
+                self.invalid += 1
+                continue
+            if isinstance(message, dict) and message.get('v') == PROTOCOL_VERSION:
+                self.queue.put(message)
+            else:
+                self.invalid += 1
+
+    def drain(self, limit=10000):
+        """Mensagens recebidas desde a última chamada"""
+        messages = []
+        while len(messages) < limit:
+            try:
+                messages.append(self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return messages
+
+    def close(self):
+        self.running = False
+        self.socket.close()
+
+
+class KioskState:
+    """Último estado e histórico recente de um quiosque"""
+    def __init__(self, kiosk):
+        self.kiosk = kiosk
+        self.last_seq = None
+        self.lost = 0
+        self.last_seen = 0.0
+        self.metrics = {}
+        self.frames = {}
+        self.trial_count = 0
+        self.reaction_times = deque(maxlen=HISTORY)  # (nº da tentativa, tempo de reação)
+        self.frame_p95 = deque(maxlen=HISTORY)       # (horário, p95 do frame em ms)
+        self.changed = False
+
+    def apply(self, message):
+        """Atualiza o estado com uma mensagem; lacunas na sequência contam como perdas"""
+        seq = message['seq']
+        if self.last_seq is not None:
+            if seq <= self.last_seq:
+                if seq < self.last_seq - 1000:
+                    self.last_seq = None  # o jogo foi reiniciado
+                else:
+                    return  # duplicada ou fora de ordem
+            else:
+                self.lost += seq - self.last_seq - 1
+        self.last_seq = seq
+        self.last_seen = time.time()
+
+        kind, data = message['kind'], message['data']
+        if kind == 'trial':
+            self.trial_count += 1
+            if data.get('reaction_time') is not None:
+                self.reaction_times.append((self.trial_count, data['reaction_time']))
+                self.changed = True
+        elif kind == 'frames':
+            self.frames = data
+            if data.get('frames'):
+                self.frame_p95.append((message['time'], data['interval_p95_ms']))
+                self.changed = True
+        elif kind == 'metrics':
+            self.metrics = data
+        elif kind == 'session_start':
+            self.metrics = dict(self.metrics, **data, score=0)
+
+    def row(self, now):
+        """Valores da linha do quiosque na tabela do monitor"""
+        metrics, attention = self.metrics, self.metrics.get('attention', {})
+        return (
+            self.kiosk,
+            metrics.get('username', '-'),
+            MODE_NAMES.get(metrics.get('game_mode'), '-'),
+            STATE_NAMES.get(metrics.get('game_state'), '-'),
+            metrics.get('score', '-'),
+            attention.get('trials', self.trial_count),
+            f"{attention['rt_mean']:.2f}" if attention.get('trials') else '-',
+            f"{attention['rt_cv'] * 100:.0f}%" if attention.get('trials') else '-',
+            attention.get('lapses', '-'),
+            attention.get('idle_periods', '-'),
+            f"{self.frames['fps']:.0f}" if self.frames.get('frames') else '-',
+            f"{self.frames['interval_p95_ms']:.1f}" if self.frames.get('frames') else '-',
+            self.lost,
+            f"{now - self.last_seen:.0f} s"
+        )
+
+
+class LiveMonitor:
+    """Janela Tkinter com a tabela de quiosques e os gráficos atualizados incrementalmente"""
+    COLUMNS = ('Quiosque', 'Jogador', 'Modo', 'Estado', 'Pontuação', 'Tentativas',
+               'TR médio (s)', 'CV do TR', 'Lapsos', 'Pausas', 'FPS', 'p95 frame (ms)',
+               'Perdidos', 'Último evento')
+
+    def __init__(self, receiver, master=None, refresh_ms=500):
+        import tkinter as tk
+        from tkinter import ttk
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+        self.receiver = receiver
+        self.refresh_ms = refresh_ms
+        self.kiosks = {}
+        self.lines = {}
+        self.window = tk.Toplevel(master) if master else tk.Tk()
+        self.window.title('Monitor ao Vivo - Memory Escalator')
+        self.window.geometry('1200x800')
+        self.window.protocol('WM_DELETE_WINDOW', self.close)
+
+        self.status = tk.Label(self.window, anchor='w',
+                               text='Aguardando telemetria...', font=('Arial', 10))
+        self.status.pack(fill='x', padx=10, pady=(10, 0))
+
+        self.tree = ttk.Treeview(self.window, columns=self.COLUMNS, show='headings', height=6)
+        for column in self.COLUMNS:
+            self.tree.heading(column, text=column)
+            self.tree.column(column, width=85, anchor='center')
+        self.tree.pack(fill='x', padx=10, pady=10)
+
+        self.figure = Figure(figsize=(12, 6))
+        self.rt_axis = self.figure.add_subplot(1, 2, 1)
+        self.rt_axis.set_title('Tempo de reação por tentativa')
+        self.rt_axis.set_xlabel('Tentativa')
+        self.rt_axis.set_ylabel('Tempo de reação (s)')
+        self.frame_axis = self.figure.add_subplot(1, 2, 2)
+        self.frame_axis.set_title('Tempo de frame (p95)')
+        self.frame_axis.set_xlabel('Segundos atrás')
+        self.frame_axis.set_ylabel('ms')
+        self.figure.tight_layout()
+        self.canvas = FigureCanvasTkAgg(self.figure, self.window)
+        self.canvas.get_tk_widget().pack(fill='both', expand=True, padx=10, pady=10)
+
+        self.window.after(self.refresh_ms, self.refresh)
+
+    def _lines_for(self, kiosk):
+        """Cria as linhas do quiosque nos dois gráficos na primeira mensagem"""
+        if kiosk not in self.lines:
+            rt_line, = self.rt_axis.plot([], [], marker='o', markersize=3, label=kiosk)
+            frame_line, = self.frame_axis.plot([], [], color=rt_line.get_color(), label=kiosk)
+            self.lines[kiosk] = (rt_line, frame_line)
+            self.rt_axis.legend(loc='upper left', fontsize=8)
+        return self.lines[kiosk]
+
+    def refresh(self):
+        """Consome a fila, atualiza só o que mudou e agenda a próxima atualização"""
+        messages = self.receiver.drain()
+        for message in messages:
+            kiosk = str(message.get('kiosk'))
+            self.kiosks.setdefault(kiosk, KioskState(kiosk)).apply(message)
+
+        now = time.time()
+        redraw = False
+        for kiosk, state in self.kiosks.items():
+            rt_line, frame_line = self._lines_for(kiosk)
+            if state.changed:
+                if state.reaction_times:
+                    rt_line.set_data(*zip(*state.reaction_times))
+                state.changed = False
+                redraw = True
+            if state.frame_p95:
+                times, values = zip(*state.frame_p95)
+                frame_line.set_data([t - now for t in times], values)
+                redraw = True
+            values = state.row(now)
+            if self.tree.exists(kiosk):
+                self.tree.item(kiosk, values=values)
+            else:
+                self.tree.insert('', 'end', iid=kiosk, values=values)
+
+        if redraw:
+            for axis in (self.rt_axis, self.frame_axis):
+                axis.relim()
+                axis.autoscale_view()
+            self.canvas.draw_idle()
+        self.status.config(text=f'{len(self.kiosks)} quiosque(s), {len(messages)} evento(s) '
+                                f'na última atualização, {self.receiver.invalid} inválido(s)')
+        self.window.after(self.refresh_ms, self.refresh)
+
+    def close(self):
+        self.receiver.close()
+        self.window.destroy()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Monitor ao vivo da telemetria dos jogos')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--host', default='0.0.0.0', help='interface de escuta')
+    parser.add_argument('--refresh', type=int, default=500, help='intervalo de atualização (ms)')
+    args = parser.parse_args()
+
+    monitor = LiveMonitor(TelemetryReceiver(args.port, args.host), refresh_ms=args.refresh)
+    monitor.window.mainloop()
+
+
+if __name__ == '__main__':
+    main()
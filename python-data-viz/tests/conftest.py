@@ -0,0 +1,28 @@
+"""
+Fixtures compartilhadas pelos testes da ferramenta de análise
+"""
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+# Nomes que também existem no jogo (refactored/config.py, refactored/main.py)
+SHARED_MODULES = ('main', 'config', 'utils', 'visualization')
+
+
+@pytest.fixture
+def dataviz(monkeypatch):
+    """Importa os módulos de src isolados dos módulos de mesmo nome do jogo"""
+    saved = {name: module for name, module in sys.modules.items()
+             if name.split('.')[0] in SHARED_MODULES}
+    for name in saved:
+        del sys.modules[name]
+    monkeypatch.syspath_prepend(SRC_DIR)
+    try:
+        import main
+        yield main
+    finally:
+        for name in [name for name in sys.modules if name.split('.')[0] in SHARED_MODULES]:
+            del sys.modules[name]
+        sys.modules.update(saved)
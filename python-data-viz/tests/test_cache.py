@@ -0,0 +1,56 @@
+"""
+Testes do cache das tabelas derivadas (utils.cache) e da abertura de arquivos em main.py
+
+Executar em python-data-viz:
+    pytest tests/
+"""
+import pytest
+
+
+@pytest.fixture
+def data_file(tmp_path, dataviz):
+    from utils.synthetic_data import generate_dataset
+
+    (path, *_), = generate_dataset(str(tmp_path / 'dados'), players=1, sessions=2,
+                                   trials_per_mode={0: 3, 1: 3, 2: 3, 3: 3},
+                                   mouse_rate=10, workers=1, start_time=1_700_000_000)
+    return path
+
+
+def test_cache_miss_reads_json_and_stores_tables(dataviz, data_file, tmp_path):
+    from utils.cache import DatasetCache
+
+    cache = DatasetCache(str(tmp_path / 'cache'), storage_format='pickle')
+    data, tables = dataviz.open_dataset(data_file, cache)
+    assert len(data['sessions']) == 2
+    assert set(tables) == {'trials', 'games', 'mouse_features'}
+    assert cache.cached_tables(data_file) is not None
+
+
+def test_cache_hit_never_reads_json(dataviz, data_file, tmp_path, monkeypatch):
+    import utils.dataset
+    from utils.cache import DatasetCache
+
+    cache_dir = str(tmp_path / 'cache')
+    expected, _ = DatasetCache(cache_dir, storage_format='pickle').get_tables(data_file)
+
+    def fail(path):
+        raise AssertionError(f'read_json chamado com o cache válido: {path}')
+
+    monkeypatch.setattr(dataviz, 'read_json', fail)
+    monkeypatch.setattr(utils.dataset, 'read_json', fail)
+    data, tables = dataviz.open_dataset(data_file, DatasetCache(cache_dir, storage_format='pickle'))
+    assert data is None
+    assert tables['games'].equals(expected['games'])
+    assert tables['trials'].equals(expected['trials'])
+
+
+def test_changed_file_is_read_again(dataviz, data_file, tmp_path):
+    from utils.cache import DatasetCache
+
+    cache = DatasetCache(str(tmp_path / 'cache'), storage_format='pickle')
+    cache.get_tables(data_file)
+    with open(data_file, 'a', encoding='utf-8') as f:
+        f.write('\n')
+    data, tables = dataviz.open_dataset(data_file, cache)
+    assert data is not None and tables is not None
@@ -0,0 +1,56 @@
+"""
+Testes da leitura das sessões pela posição nos segmentos diários (utils.session_index)
+
+Executar em python-data-viz:
+    pytest tests/
+"""
+import glob
+import os
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture
+def segment(tmp_path, dataviz):
+    from utils.synthetic_data import generate_dataset
+
+    generate_dataset(str(tmp_path / 'sessions'), players=6, sessions=2,
+                     trials_per_mode={0: 2, 1: 2, 2: 2, 3: 2}, mouse_rate=10,
+                     workers=1, start_time=datetime(2026, 3, 1, 12).timestamp(),
+                     layout='segments')
+    path, = glob.glob(str(tmp_path / 'sessions' / 'quiosque_1' / '*' / 'sessions_*.jsonl'))
+    return path
+
+
+def test_reader_seeks_without_parsing_the_segment(dataviz, segment, monkeypatch):
+    import utils.dataset
+    from utils.dataset import load_sessions
+    from utils.session_index import SessionReader
+
+    expected = load_sessions(segment)
+
+    def fail(path):
+        raise AssertionError(f'segmento lido inteiro: {path}')
+
+    monkeypatch.setattr(utils.dataset, 'read_json', fail)
+    reader = SessionReader(segment)
+    assert [reader[i] for i in reversed(range(len(expected)))] == expected[::-1]
+
+
+def test_sessions_missing_from_the_index_are_found(dataviz, segment):
+    from utils.dataset import load_sessions
+    from utils.session_index import SessionReader
+
+    expected = load_sessions(segment)
+    index_path = os.path.join(os.path.dirname(os.path.dirname(segment)), 'index.jsonl')
+    with open(index_path, encoding='utf-8') as f:
+        lines = f.readlines()
+    # Queda entre a gravação do segmento e a do índice
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.writelines(lines[:3])
+    reader = SessionReader(segment)
+    assert [reader[i] for i in range(len(expected))] == expected
+    os.remove(index_path)
+    reader = SessionReader(segment)
+    assert [reader[i] for i in range(len(expected))] == expected
@@ -0,0 +1,47 @@
+"""
+Testes das características do mouse por tentativa (utils.trajectory)
+
+Executar em python-data-viz:
+    pytest tests/
+"""
+import numpy as np
+
+
+def mouse_session(trials):
+    """Sessão com dois movimentos separados por pausas dentro de cada tentativa"""
+    t = np.arange(0.0, 8.0, 0.01)
+    x = np.zeros_like(t)
+    for start in (1.0, 2.5, 5.0, 6.5):
+        moving = (t >= start) & (t < start + 0.5)
+        x[moving] = 400 * (t[moving] - start)
+        x[t >= start + 0.5] += 200
+    return {
+        'trials': trials,
+        'mouse_tracking': [{'timestamp': float(ts), 'x': float(px), 'y': 0.0, 'game_state': 2}
+                           for ts, px in zip(t, x)]
+    }
+
+
+def test_trial_without_start_does_not_shift_the_others(dataviz):
+    from utils.trajectory import session_features
+
+    first = {'trial_start_time': 0.5, 'selection_time': 4.0, 'game_mode': 2}
+    last = {'trial_start_time': 4.5, 'selection_time': 7.9, 'game_mode': 2}
+    empty = {'trial_start_time': None, 'selection_time': None, 'game_mode': 2}
+    expected = session_features(mouse_session([first, last]))
+    features = session_features(mouse_session([first, empty, last]))
+    assert expected['submovements'].tolist() == [2, 2]
+    assert expected['pause_count'].tolist() == [2, 2]
+    for name in ('submovements', 'pause_count', 'pause_duration', 'path_length'):
+        assert features[name][[0, 2]].tolist() == expected[name].tolist()
+        assert features[name][1] == 0
+
+
+def test_trial_after_the_last_sample(dataviz):
+    from utils.trajectory import session_features
+
+    session = mouse_session([{'trial_start_time': 7.995, 'selection_time': 9.0, 'game_mode': 2}])
+    features = session_features(session)
+    assert features['samples'].tolist() == [0]
+    assert np.isnan(features['mean_jerk'][0])
+    assert features['pause_duration'].dtype == float
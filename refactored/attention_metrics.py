@@ -0,0 +1,113 @@
+"""
+Métricas de atenção calculadas em tempo real durante a partida
+
+Cada amostra do mouse e cada seleção atualizam os acumuladores em O(1),
+sem percorrer a sessão inteira: o jogo pode consultar as métricas a qualquer
+momento (dificuldade adaptativa, resumo no fim da partida).
+"""
+import math
+
+from config import ATTENTION_IDLE_THRESHOLD, ATTENTION_LAPSE_SD, ATTENTION_MIN_TRIALS
+
+
+class RunningStats:
+    """Média e variância incrementais (algoritmo de Welford)"""
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self):
+        """Variância amostral (0 com menos de duas amostras)"""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def sd(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def cv(self):
+        """Coeficiente de variação (desvio padrão / média)"""
+        return self.sd / self.mean if self.count > 1 and self.mean > 0 else 0.0
+
+
+class AttentionMetrics:
+    """Pausas de atenção pelo movimento do mouse e variabilidade do tempo de reação
+
+    Uma pausa é um período de pelo menos idle_threshold segundos sem o mouse
+    se mover mais que movement_threshold pixels entre amostras; ela é contada
+    quando o movimento recomeça. Um lapso é uma reação mais lenta que a média
+    das anteriores mais lapse_sd desvios padrão (só depois de min_trials reações).
+    """
+    def __init__(self, idle_threshold=ATTENTION_IDLE_THRESHOLD, movement_threshold=5,
+                 lapse_sd=ATTENTION_LAPSE_SD, min_trials=ATTENTION_MIN_TRIALS):
+        self.idle_threshold = idle_threshold
+        self.movement_threshold = movement_threshold
+        self.lapse_sd = lapse_sd
+        self.min_trials = min_trials
+        self.reset()
+
+    def reset(self, now=None):
+        """Zera as métricas (início de uma nova sessão)"""
+        self.reaction_times = RunningStats()
+        self.successes = 0
+        self.lapses = 0
+        self.idle_periods = 0
+        self.idle_time = 0.0
+        self.last_pos = None
+        self.last_movement_time = now
+
+    def update_mouse(self, pos, now, active=True):
+        """Processa uma amostra do mouse; fora da partida (active=False) não conta pausas"""
+        moved = (self.last_pos is not None and
+                 math.hypot(pos[0] - self.last_pos[0], pos[1] - self.last_pos[1])
+                 > self.movement_threshold)
+        self.last_pos = pos
+        if not active or self.last_movement_time is None:
+            self.last_movement_time = now
+            return
+        if moved:
+            idle = now - self.last_movement_time
+            if idle >= self.idle_threshold:
+                self.idle_periods += 1
+                self.idle_time += idle
+            self.last_movement_time = now
+
+    def current_idle(self, now):
+        """Segundos desde o último movimento do mouse"""
+        if self.last_movement_time is None:
+            return 0.0
+        return max(0.0, now - self.last_movement_time)
+
+    def record_reaction(self, reaction_time, success):
+        """Registra uma seleção; retorna True se a reação foi um lapso"""
+        stats = self.reaction_times
+        lapse = (stats.count >= self.min_trials and
+                 reaction_time > stats.mean + self.lapse_sd * stats.sd)
+        self.lapses += lapse
+        self.successes += bool(success)
+        stats.add(reaction_time)
+        return lapse
+
+    def snapshot(self, now=None):
+        """Dicionário serializável com as métricas atuais"""
+        trials = self.reaction_times.count
+        return {
+            "trials": trials,
+            "rt_mean": self.reaction_times.mean,
+            "rt_sd": self.reaction_times.sd,
+            "rt_cv": self.reaction_times.cv,
+            "lapses": self.lapses,
+            "lapse_rate": self.lapses / trials if trials else 0.0,
+            "accuracy": self.successes / trials if trials else 0.0,
+            "idle_periods": self.idle_periods,
+            "idle_time": self.idle_time,
+            "current_idle": self.current_idle(now) if now is not None else 0.0
+        }
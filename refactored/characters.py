@@ -5,6 +5,10 @@ import pygame
 import random
 import os
 from config import CHARACTER_SIZE, HEIGHT
+from trait_space import TraitSpace, CombinationSampler
+
+# Característica do personagem -> lista de assets correspondente
+TRAIT_SLOTS = (("body", "bodies"), ("face", "faces"), ("head", "heads"), ("hat", "hats"))
 
 def load_assets():
     """Carrega todos os assets visuais dos personagens"""
@@ -91,11 +95,18 @@ def load_assets():
 
 class Character:
     """Representa um personagem no jogo"""
+    __slots__ = ('x', 'y', 'traits', 'size', 'escalator_index',
+                 'step_position', 'current_step')
+
     def __init__(self, x, y, traits):
+        self.size = CHARACTER_SIZE
+        self.reset(x, y, traits)
+    
+    def reset(self, x, y, traits):
+        """Reinicia o personagem para ser reaproveitado pelo pool"""
         self.x = x
         self.y = y
         self.traits = traits
-        self.size = CHARACTER_SIZE
         self.escalator_index = None
         self.step_position = 0
         self.current_step = 0
@@ -132,27 +143,82 @@ class Character:
                 self.y <= my <= self.y + self.size)
 
 
+class CharacterPool:
+    """Pool de personagens reutilizáveis (lista livre)
+    
+    Personagens que saem da tela voltam para o pool em vez de serem
+    descartados, de modo que o jogo em regime não aloca novos objetos.
+    """
+    def __init__(self, initial_size=0):
+        self.free = [Character(0, 0, None) for _ in range(initial_size)]
+    
+    def acquire(self, x, y, traits):
+        """Obtém um personagem do pool (ou cria um se o pool estiver vazio)"""
+        if self.free:
+            character = self.free.pop()
+            character.reset(x, y, traits)
+            return character
+        return Character(x, y, traits)
+    
+    def release(self, character):
+        """Devolve um personagem ao pool"""
+        character.traits = None
+        self.free.append(character)
+
+
 class CharacterFactory:
-    """Fábrica para criar personagens aleatórios"""
-    def __init__(self, assets):
-        self.assets = assets
-        self.used_combinations = set()
+    """Fábrica para criar personagens aleatórios
     
-    def create_random_character(self, x, y):
-        """Cria um personagem com características aleatórias"""
-        traits = {
-            "body": random.choice(self.assets["bodies"]),
-            "face": random.choice(self.assets["faces"]),
-            "head": random.choice(self.assets["heads"]),
-            "hat": random.choice(self.assets["hats"])
+    As combinações são sorteadas sem repetição até que todas tenham sido
+    usadas (ver trait_space.CombinationSampler).
+    """
+    def __init__(self, assets, pool=None, rng=None):
+        self.assets = assets
+        self.pool = pool if pool is not None else CharacterPool(initial_size=32)
+        self.space = TraitSpace([len(assets[slot]) for _, slot in TRAIT_SLOTS])
+        self.sampler = CombinationSampler(self.space.size, rng)
+        # Dicionários de características reaproveitados por combinação
+        self.traits_cache = {}
+        self.part_indices = {
+            slot: {id(part): i for i, part in enumerate(assets[slot])}
+            for _, slot in TRAIT_SLOTS
         }
+    
+    def traits_for_code(self, code):
+        """Retorna o dicionário (compartilhado) de características da combinação"""
+        traits = self.traits_cache.get(code)
+        if traits is None:
+            traits = {
+                trait: self.assets[slot][index]
+                for (trait, slot), index in zip(TRAIT_SLOTS, self.space.decode(code))
+            }
+            self.traits_cache[code] = traits
+        return traits
+    
+    def code_for_traits(self, traits):
+        """Retorna o código inteiro da combinação de um dicionário de características"""
+        return self.space.encode([self.part_indices[slot][id(traits[trait])]
+                                  for trait, slot in TRAIT_SLOTS])
+    
+    def create_character(self, x, y, code):
+        """Cria um personagem com uma combinação específica"""
+        return self.pool.acquire(x, y, self.traits_for_code(code))
+    
+    def create_random_character(self, x, y, exclude=()):
+        """Cria um personagem com características aleatórias ainda não usadas
         
-        combination = (traits["body"]["name"], traits["face"]["name"],
-                      traits["head"]["name"], traits["hat"]["name"])
-        self.used_combinations.add(combination)
+        exclude: códigos de combinações que não podem ser sorteadas (ex.: o alvo)
+        """
+        code = self.sampler.draw(exclude)
+        if code is None:
+            print("Aviso: Não há mais combinações únicas disponíveis!")
+            self.sampler.reset()
+            code = self.sampler.draw(exclude)
+            if code is None:
+                raise ValueError("Todas as combinações de características estão excluídas")
         
-        return Character(x, y, traits)
+        return self.create_character(x, y, code)
     
     def reset(self):
         """Reseta as combinações usadas"""
-        self.used_combinations.clear()
+        self.sampler.reset()
@@ -1,10 +1,8 @@
 """
 Configurações e constantes do jogo
 """
-import pygame
-
-# Inicializa o pygame
-pygame.init()
+import os
+from runtime import runtime
 
 # Variáveis de configuração da tela
 WIDTH, HEIGHT = 1400, 1000
@@ -38,10 +36,70 @@ QUADRANT_COLORS = [
     (255, 255, 100)   # Amarelo claro - Inferior direito
 ]
 
+# Velocidade da seta é dada em graus por frame nesta taxa de quadros
+ARROW_NOMINAL_FPS = 60
+
 # Propriedades do personagem
 CHARACTER_SIZE = 120
 CHARACTER_SPAWN_RATE = 60  # Frames entre aparições
 
+# Agendamento de spawns (em segundos, independente do FPS)
+CHARACTER_SPAWN_INTERVAL = CHARACTER_SPAWN_RATE / 60
+SPAWN_MIN_GAP = 10  # Pixels livres entre personagens da mesma escada
+SINGLE_MODE_TARGET_DELAY = 5  # Segundos até o alvo aparecer no modo aparição única
+# Tempo até o alvo aparecer nos modos alternado e infinito:
+# ("fixed", s), ("uniform", mín, máx) ou ("exponential", média[, mínimo])
+TARGET_INTERARRIVAL = ("uniform", 3.0, 7.0)
+# Ajusta a densidade de distratores ao desempenho do jogador
+ADAPTIVE_SPAWN_DENSITY = False
+ADAPTIVE_TARGET_ACCURACY = 0.75
+
+# Métricas de atenção calculadas durante a partida (ver attention_metrics.py)
+ATTENTION_IDLE_THRESHOLD = 3.0  # Segundos sem mover o mouse para contar uma pausa
+ATTENTION_LAPSE_SD = 2.0  # Reação acima de média + N desvios padrão é um lapso
+ATTENTION_MIN_TRIALS = 5  # Reações necessárias antes de detectar lapsos
+
+# Identificação do quiosque nos dados salvos e na telemetria (None usa o nome da máquina)
+KIOSK_ID = None
+
+# Sessões salvas em um segmento JSON Lines por quiosque e por dia, com um
+# índice das sessões (ver session_store.py)
+SESSION_STORE_DIR = os.path.join("playerdata", "sessions")
+
+# Telemetria ao vivo para o monitor do python-data-viz (ver telemetry.py).
+# Para supervisionar vários quiosques, aponte todos para o IP da estação do monitor.
+TELEMETRY_ENABLED = False
+TELEMETRY_ADDRESS = ("127.0.0.1", 47800)
+TELEMETRY_INTERVAL = 1.0  # Segundos entre relatórios de frames e métricas
+TELEMETRY_KIOSK_ID = KIOSK_ID
+
+# Captura do mouse em taxa cheia (todos os eventos, não só um por frame) por um
+# buffer em memória compartilhada esvaziado por um processo gravador (ver mouse_ring.py)
+MOUSE_RING_ENABLED = False
+MOUSE_RING_CAPACITY = 65536  # Registros no buffer (~1 min de eventos a 1000 Hz)
+MOUSE_RING_DIR = os.path.join("playerdata", "mouse_raw")
+
+# Armazenamento do rastreamento do mouse ao salvar: "chunked" grava blocos
+# comprimidos em um arquivo .mouse ao lado dos dados salvos (ver mouse_chunks.py);
+# "json" mantém a lista "mouse_tracking" dentro do JSON
+MOUSE_TRACKING_STORAGE = "chunked"
+MOUSE_CHUNK_SECONDS = 10  # Duração máxima de um bloco (também há um bloco por tentativa)
+
+# Backend da simulação das escadas: "python" (objetos Character) ou
+# "numpy" (arrays vetorizados, ver lane_simulation.py)
+LANE_BACKEND = "python"
+
+# Mistura de dificuldade dos distratores: {características diferentes do alvo: peso}
+# 1 = quase igual ao alvo (difícil) ... 4 = totalmente diferente (fácil).
+# None mantém o sorteio uniforme entre todas as combinações.
+DISTRACTOR_DIFFICULTY_MIX = None
+
+# Banco SQLite dos highscores (histórico completo de pontuações).
+# Para compartilhar o ranking entre PCs, aponte para o mesmo arquivo na rede
+# e use o modo de journal "DELETE": o WAL não funciona em compartilhamentos de rede.
+HIGHSCORE_DB_PATH = os.path.join("playerdata", "highscore", "highscores.db")
+HIGHSCORE_JOURNAL_MODE = "WAL"
+
 # Estados do jogo
 GAME_STATE_MENU = 0
 GAME_STATE_DISPLAY_TARGET = 1
@@ -60,33 +118,34 @@ GAME_MODE_ALTERNATING = 1  # Alvo alterna a cada acerto
 GAME_MODE_INFINITE = 2  # Infinito, ganha tempo ao clicar
 GAME_MODE_ARROW = 3  # Modo da seta girando
 
-# Fontes
-FONT = pygame.font.SysFont('Arial', 42)
-SMALL_FONT = pygame.font.SysFont('Arial', 24)
-TINY_FONT = pygame.font.SysFont('Arial', 18)
-TITLE_FONT = pygame.font.SysFont('Arial', 56, bold=True)
+# Fontes distribuídas com o jogo, para as métricas serem iguais em todo PC
+# (carregadas no primeiro uso, ver runtime.py)
+FONT_REGULAR_PATH = os.path.join("assets", "fonts", "DejaVuSans.ttf")
+FONT_BOLD_PATH = os.path.join("assets", "fonts", "DejaVuSans-Bold.ttf")
+# A DejaVu Sans é ~25% mais larga que a Trebuchet MS/Arial para as quais o
+# layout foi desenhado; os tamanhos abaixo são reduzidos nessa proporção
+FONT_SIZE_SCALE = 0.8
+
+
+def _font(path, size):
+    return runtime.lazy_font(path, round(size * FONT_SIZE_SCALE))
+
+
+FONT = _font(FONT_REGULAR_PATH, 42)
+SMALL_FONT = _font(FONT_REGULAR_PATH, 24)
+TINY_FONT = _font(FONT_REGULAR_PATH, 18)
+TITLE_FONT = _font(FONT_BOLD_PATH, 56)
 
 # Fontes para estilo de jogo
-try:
-    GAME_TITLE_FONT = pygame.font.SysFont('Trebuchet MS', 72, bold=True)
-    GAME_SUBTITLE_FONT = pygame.font.SysFont('Trebuchet MS', 38, bold=True)
-    MENU_FONT = pygame.font.SysFont('Trebuchet MS', 24)
-    BUTTON_FONT = pygame.font.SysFont('Trebuchet MS', 28, bold=True)
-    INSTRUCTIONS_TITLE_FONT = pygame.font.SysFont('Trebuchet MS', 64, bold=True)
-    INSTRUCTIONS_TEXT_FONT = pygame.font.SysFont('Trebuchet MS', 28, bold=True)
-    HIGHSCORE_TITLE_FONT = pygame.font.SysFont('Trebuchet MS', 64, bold=True)
-    HIGHSCORE_TEXT_FONT = pygame.font.SysFont('Trebuchet MS', 36, bold=True)
-except:
-    GAME_TITLE_FONT = pygame.font.SysFont('Arial', 72, bold=True)
-    GAME_SUBTITLE_FONT = pygame.font.SysFont('Arial', 38, bold=True)
-    MENU_FONT = pygame.font.SysFont('Arial', 24)
-    BUTTON_FONT = pygame.font.SysFont('Arial', 28, bold=True)
-    INSTRUCTIONS_TITLE_FONT = pygame.font.SysFont('Arial', 64, bold=True)
-    INSTRUCTIONS_TEXT_FONT = pygame.font.SysFont('Arial', 28, bold=True)
-    HIGHSCORE_TITLE_FONT = pygame.font.SysFont('Arial', 64, bold=True)
-    HIGHSCORE_TEXT_FONT = pygame.font.SysFont('Arial', 36, bold=True)
-
-# Inicializa a tela
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("Memory Escalator - Jogo da Memória na Escada Rolante")
-clock = pygame.time.Clock()
+GAME_TITLE_FONT = _font(FONT_BOLD_PATH, 72)
+GAME_SUBTITLE_FONT = _font(FONT_BOLD_PATH, 38)
+MENU_FONT = _font(FONT_REGULAR_PATH, 24)
+BUTTON_FONT = _font(FONT_BOLD_PATH, 28)
+INSTRUCTIONS_TITLE_FONT = _font(FONT_BOLD_PATH, 64)
+INSTRUCTIONS_TEXT_FONT = _font(FONT_BOLD_PATH, 28)
+HIGHSCORE_TITLE_FONT = _font(FONT_BOLD_PATH, 64)
+HIGHSCORE_TEXT_FONT = _font(FONT_BOLD_PATH, 36)
+
+# A tela e o relógio são criados sob demanda: use runtime.screen e runtime.clock
+runtime.size = (WIDTH, HEIGHT)
+runtime.caption = "Memory Escalator - Jogo da Memória na Escada Rolante"
@@ -2,15 +2,27 @@
 Sistema de coleta de dados de jogabilidade
 """
 import os
-import json
 import time
 from datetime import datetime
+from persistence import TrialJournal, JOURNAL_PATH
+from attention_metrics import AttentionMetrics
+from config import GAME_STATE_PLAYING, MOUSE_TRACKING_STORAGE
+from mouse_chunks import write_sessions
+from session_store import SessionStore
 
 
 class GameDataCollector:
     """Coleta e armazena dados de jogabilidade para análise"""
-    def __init__(self):
-        self.all_sessions = self.load_existing_data()
+    def __init__(self, journal_path=JOURNAL_PATH, telemetry=None, mouse_recorder=None,
+                 mouse_storage=MOUSE_TRACKING_STORAGE, store=None):
+        self.telemetry = telemetry
+        self.mouse_storage = mouse_storage
+        self.mouse_recorder = mouse_recorder
+        self.store = store or SessionStore()
+        self.recover_journal(journal_path)
+        self.journal = TrialJournal(journal_path)
+        # Sessões concluídas nesta execução e ainda não gravadas no segmento do dia
+        self.all_sessions = {"sessions": []}
         self.current_session = {
             "session_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
             "username": "Anônimo",
@@ -34,27 +46,34 @@ class GameDataCollector:
         self.mouse_movement_count = 0
         self.last_mouse_pos = None
         self.total_mouse_distance = 0
+        self.attention = AttentionMetrics()
     
-    def load_existing_data(self):
-        """Carrega dados existentes ou cria novo arquivo"""
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        date_str_no_dash = datetime.now().strftime("%Y%m%d")
-        time_str = datetime.now().strftime("%H%M%S")
-        base_dir = "playerdata"
-        date_dir = os.path.join(base_dir, date_str)
-        
-        os.makedirs(date_dir, exist_ok=True)
-        
-        filename = os.path.join(date_dir, f"game_data_{date_str_no_dash}_{time_str}.json")
-        
-        if os.path.exists(filename):
+    def recover_journal(self, journal_path=JOURNAL_PATH):
+        """Salva as tentativas de uma execução anterior que terminou sem salvar"""
+        records = TrialJournal.replay(journal_path)
+        if records:
+            sessions = {}
+            for record in records:
+                session = sessions.setdefault(record["session_id"], {
+                    "session_id": record["session_id"],
+                    "username": record["username"],
+                    "game_mode": record["game_mode"],
+                    "trials": [],
+                    "mouse_tracking": [],
+                    "session_metrics": {},
+                    "recovered_from_journal": True
+                })
+                session["trials"].append(record["trial"])
+            
             try:
-                with open(filename, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, FileNotFoundError):
-                return {"sessions": []}
+                self.store.append(list(sessions.values()))
+            except OSError as e:
+                print(f"Erro ao recuperar tentativas do journal: {e}")
+                return
+            print(f"Recuperadas {len(records)} tentativas não salvas em {self.store.segment_path()}")
         
-        return {"sessions": []}
+        if os.path.exists(journal_path):
+            os.remove(journal_path)
     
     def set_username(self, username):
         """Define o nome do usuário"""
@@ -106,6 +125,21 @@ class GameDataCollector:
             self.current_trial["target_spawn_time"] = time.time()
             self.target_spawn_time = time.time()
 
+    def record_distractor_spawn(self, character_traits, differing_traits):
+        """Registra o aparecimento de um distrator e sua semelhança com o alvo"""
+        if self.current_trial:
+            self.current_trial.setdefault("distractors", []).append({
+                "spawn_time": time.time(),
+                "character": {
+                    'head': {'name': character_traits['head']['name']},
+                    'face': {'name': character_traits['face']['name']},
+                    'body': {'name': character_traits['body']['name']},
+                    'hat': {'name': character_traits['hat']['name']}
+                },
+                "differing_traits": differing_traits,
+                "shared_traits": 4 - differing_traits
+            })
+
     def record_mouse_position(self, mouse_pos, game_state):
         """Registra a posição do mouse"""
         current_time = time.time()
@@ -137,12 +171,19 @@ class GameDataCollector:
                 "focus_breaks": 0
             }
         
-        if current_time - self.last_interaction_time > 3.0:
-            self.current_session["session_metrics"]["focus_breaks"] += 1
+        # Pausas de atenção: períodos sem movimento durante a partida
+        self.attention.update_mouse(mouse_pos, current_time,
+                                    active=game_state == GAME_STATE_PLAYING)
+        self.current_session["session_metrics"]["focus_breaks"] = self.attention.idle_periods
         
         self.last_interaction_time = current_time
         self.last_mouse_pos = mouse_pos
     
+    def record_mouse_event(self, timestamp, mouse_pos, game_state, buttons, event):
+        """Envia um evento do mouse em taxa cheia ao buffer compartilhado (ver mouse_ring.py)"""
+        if self.mouse_recorder:
+            self.mouse_recorder.write(timestamp, mouse_pos[0], mouse_pos[1], game_state, buttons, event)
+    
     def record_click(self, position, success):
         """Registra um clique"""
         self.clicks_positions.append({
@@ -174,12 +215,15 @@ class GameDataCollector:
             self.current_trial["trial_metrics"]["clicks_before_success"] += 1
     
     def record_selection(self, success):
-        """Registra uma seleção de personagem"""
+        """Registra uma seleção de personagem; retorna True se a reação foi um lapso"""
+        lapse = False
         if self.current_trial and self.target_spawn_time:
             selection_time = time.time()
             self.current_trial["selection_time"] = selection_time
             self.current_trial["success"] = success
             self.current_trial["reaction_time"] = selection_time - self.target_spawn_time
+            lapse = self.attention.record_reaction(self.current_trial["reaction_time"], success)
+            self.current_trial["lapse"] = lapse
             
             trial_duration = selection_time - self.current_trial["trial_start_time"]
             self.current_trial["trial_metrics"]["mouse_movements"] = self.mouse_movement_count
@@ -195,20 +239,24 @@ class GameDataCollector:
             self.current_trial["clicks"] = self.clicks_positions.copy()
             
             self.current_session["trials"].append(self.current_trial)
+            self._journal_trial(self.current_trial)
             self.current_trial = None
             
             self.clicks_positions = []
             self.mouse_movement_count = 0
             self.total_mouse_distance = 0
+        return lapse
     
     def record_arrow_selection(self, success, clicked_quadrant, target_quadrant, 
-                              arrow_angle, arrow_speed, arrow_in_zone):
+                              arrow_angle, arrow_speed, arrow_in_zone, timing=None):
         """Registra uma seleção do modo seta"""
         if self.current_trial:
             selection_time = time.time()
             self.current_trial["selection_time"] = selection_time
             self.current_trial["success"] = success
             self.current_trial["reaction_time"] = selection_time - self.current_trial["trial_start_time"]
+            self.current_trial["lapse"] = self.attention.record_reaction(
+                self.current_trial["reaction_time"], success)
             
             self.current_trial["arrow_metrics"] = {
                 "clicked_quadrant": clicked_quadrant,
@@ -219,6 +267,11 @@ class GameDataCollector:
                 "timing_accuracy": "perfect" if arrow_in_zone else "missed_timing",
                 "quadrant_accuracy": "correct" if clicked_quadrant == target_quadrant else "wrong_quadrant"
             }
+            if timing:
+                # Ângulo reconstruído no instante do clique e erro de timing com sinal
+                self.current_trial["arrow_metrics"].update(
+                    (key, value) for key, value in timing.items()
+                    if key not in ("arrow_angle", "arrow_in_target_zone"))
             
             trial_duration = selection_time - self.current_trial["trial_start_time"]
             self.current_trial["trial_metrics"]["mouse_movements"] = self.mouse_movement_count
@@ -230,6 +283,7 @@ class GameDataCollector:
             self.current_trial["clicks"] = self.clicks_positions.copy()
             
             self.current_session["trials"].append(self.current_trial)
+            self._journal_trial(self.current_trial)
             self.current_trial = None
             
             self.clicks_positions = []
@@ -258,6 +312,69 @@ class GameDataCollector:
                 "focus_breaks": 0
             }
         }
+        self.attention.reset()
+        if self.telemetry:
+            self.telemetry.publish("session_start", {
+                "session_id": self.current_session["session_id"],
+                "username": self.current_session["username"],
+                "game_mode": game_mode
+            })
+    
+    def attention_summary(self):
+        """Métricas de atenção da sessão atual, atualizadas a cada amostra"""
+        return self.attention.snapshot(time.time())
+    
+    def _journal_trial(self, trial):
+        """Envia a tentativa concluída ao journal (gravado em segundo plano)"""
+        self.journal.append({
+            "session_id": self.current_session["session_id"],
+            "username": self.current_session["username"],
+            "game_mode": self.current_session["game_mode"],
+            "trial": self.serialize_trial(trial)
+        })
+        if self.telemetry:
+            self.telemetry.publish("trial", {
+                "session_id": self.current_session["session_id"],
+                "username": self.current_session["username"],
+                "game_mode": trial["game_mode"],
+                "trial_index": len(self.current_session["trials"]) - 1,
+                "success": trial["success"],
+                "reaction_time": trial["reaction_time"],
+                "score": trial.get("score", 0),
+                "lapse": trial.get("lapse", False),
+                "distractors": len(trial.get("distractors", []))
+            })
+    
+    def serialize_trial(self, trial):
+        """Converte uma tentativa em um dicionário serializável em JSON"""
+        serializable_trial = {
+            "trial_start_time": trial["trial_start_time"],
+            "game_mode": trial["game_mode"],
+            "target_spawn_time": trial["target_spawn_time"],
+            "selection_time": trial["selection_time"],
+            "success": trial["success"],
+            "reaction_time": trial["reaction_time"],
+            "score": trial.get("score", 0),
+            "trial_metrics": trial.get("trial_metrics", {}),
+            "clicks": trial.get("clicks", []),
+            "lapse": trial.get("lapse", False)
+        }
+        
+        if trial.get("target_character"):
+            serializable_trial["target_character"] = {
+                'head': {'name': trial["target_character"]["head"]["name"]},
+                'face': {'name': trial["target_character"]["face"]["name"]},
+                'body': {'name': trial["target_character"]["body"]["name"]},
+                'hat': {'name': trial["target_character"]["hat"]["name"]}
+            }
+        
+        if trial.get("arrow_metrics"):
+            serializable_trial["arrow_metrics"] = trial["arrow_metrics"]
+        
+        if trial.get("distractors"):
+            serializable_trial["distractors"] = trial["distractors"]
+        
+        return serializable_trial
     
     def prepare_session_for_saving(self, session):
         """Prepara a sessão para ser salva em JSON"""
@@ -278,6 +395,14 @@ class GameDataCollector:
                                                         session["trials"][-1]["trial_start_time"])
             session["session_metrics"]["session_duration"] = last_trial_time - first_trial_time
         
+        if session is self.current_session:
+            attention = self.attention.snapshot()
+            del attention["current_idle"]
+            session["session_metrics"]["attention"] = attention
+            if self.mouse_recorder:
+                # Eventos do mouse perdidos por buffer cheio desde o início do jogo
+                session["session_metrics"]["mouse_ring_overruns"] = self.mouse_recorder.overruns
+        
         serializable_session = {
             "session_id": session["session_id"],
             "username": session["username"],
@@ -288,48 +413,26 @@ class GameDataCollector:
         }
         
         for trial in session["trials"]:
-            serializable_trial = {
-                "trial_start_time": trial["trial_start_time"],
-                "game_mode": trial["game_mode"],
-                "target_spawn_time": trial["target_spawn_time"],
-                "selection_time": trial["selection_time"],
-                "success": trial["success"],
-                "reaction_time": trial["reaction_time"],
-                "score": trial.get("score", 0),
-                "trial_metrics": trial.get("trial_metrics", {}),
-                "clicks": trial.get("clicks", [])
-            }
-            
-            if trial.get("target_character"):
-                serializable_trial["target_character"] = {
-                    'head': {'name': trial["target_character"]["head"]["name"]},
-                    'face': {'name': trial["target_character"]["face"]["name"]},
-                    'body': {'name': trial["target_character"]["body"]["name"]},
-                    'hat': {'name': trial["target_character"]["hat"]["name"]}
-                }
-            
-            if trial.get("arrow_metrics"):
-                serializable_trial["arrow_metrics"] = trial["arrow_metrics"]
-                
-            serializable_session["trials"].append(serializable_trial)
+            serializable_session["trials"].append(self.serialize_trial(trial))
             
         return serializable_session
     
     def save_session_data(self):
-        """Salva os dados da sessão em arquivo"""
+        """Acrescenta as sessões concluídas ao segmento do dia do quiosque"""
         if self.current_session and len(self.current_session["trials"]) > 0:
             serializable_session = self.prepare_session_for_saving(self.current_session)
             self.all_sessions["sessions"].append(serializable_session)
+            # Evita gravar a mesma sessão de novo se o salvamento for chamado outra vez
+            self.current_session["trials"] = []
         
-        date_str = datetime.now().strftime("%Y-%m-%d")
-        date_str_no_dash = datetime.now().strftime("%Y%m%d")
-        time_str = datetime.now().strftime("%H%M%S")
-        base_dir = "playerdata"
-        date_dir = os.path.join(base_dir, date_str)
-        
-        os.makedirs(date_dir, exist_ok=True)
-        
-        filename = os.path.join(date_dir, f"game_data_{date_str_no_dash}_{time_str}.json")
-        
-        with open(filename, 'w') as f:
-            json.dump(self.all_sessions, f, indent=2)
+        sessions = self.all_sessions["sessions"]
+        if sessions:
+            now = datetime.now()
+            if self.mouse_storage == "chunked" and any(s.get("mouse_tracking") for s in sessions):
+                # O arquivo de blocos é gravado antes, para o segmento nunca apontar para um arquivo ausente
+                sessions = write_sessions(self.store.segment_path(now), sessions,
+                                          self.store.mouse_path(now))
+            self.store.append(sessions, now)
+            self.all_sessions["sessions"] = []
+        # Tudo que estava no journal agora está no arquivo salvo
+        self.journal.discard()
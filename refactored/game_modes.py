@@ -3,12 +3,46 @@ Lógica específica para cada modo de jogo
 """
 import random
 import math
+import time
 import pygame
 from config import *
 
+# Centro angular (graus) da zona em que a seta aponta para cada quadrante
+QUADRANT_ZONE_CENTERS = {0: 225, 1: 315, 2: 135, 3: 45}
+
+# Resolução da tabela de geometria da seta (passos por volta: 0,5°)
+ARROW_LUT_STEPS = 720
+ARROW_LENGTH = 80
+
+
+def build_arrow_lut(center_x, center_y, steps=ARROW_LUT_STEPS):
+    """Pré-calcula os pontos da seta (e da sombra) para cada ângulo da tabela"""
+    lut = []
+    for i in range(steps):
+        angle_rad = math.radians(i * 360 / steps)
+        base_angle1 = angle_rad + math.radians(150)
+        base_angle2 = angle_rad + math.radians(210)
+        
+        arrow_points = (
+            (center_x + ARROW_LENGTH * math.cos(angle_rad),
+             center_y + ARROW_LENGTH * math.sin(angle_rad)),
+            (center_x + (ARROW_LENGTH - 30) * math.cos(base_angle1),
+             center_y + (ARROW_LENGTH - 30) * math.sin(base_angle1)),
+            (center_x + (ARROW_LENGTH - 30) * math.cos(base_angle2),
+             center_y + (ARROW_LENGTH - 30) * math.sin(base_angle2)),
+        )
+        shadow_points = tuple((p[0] + 2, p[1] + 2) for p in arrow_points)
+        lut.append((arrow_points, shadow_points))
+    return lut
+
 
 class ArrowMode:
-    """Lógica específica do modo seta"""
+    """Lógica específica do modo seta
+    
+    O tabuleiro é pré-renderizado uma vez por quadrante alvo e estado de
+    destaque, e a geometria da seta vem de uma tabela por ângulo, então cada
+    frame é um blit do tabuleiro mais o polígono da seta.
+    """
     def __init__(self):
         self.arrow_angle = 0
         self.arrow_rotation_speed = 4.0
@@ -16,28 +50,56 @@ class ArrowMode:
         self.arrow_color = (255, 255, 255)
         self.arrow_in_target_zone = False
         self.last_quadrant_pointed = -1
+        # Ângulo modelado como função contínua do tempo (time.perf_counter)
+        self.angle_origin = 0.0
+        self.time_origin = time.perf_counter()
+        self.boards = {}
+        self.arrow_luts = {}
+        self.hub = None
         self.select_new_target()
     
-    def select_new_target(self):
+    def reset(self, now=None):
+        """Reinicia a seta apontando para 0° no instante now"""
+        self.angle_origin = 0.0
+        self.time_origin = time.perf_counter() if now is None else now
+        self.arrow_angle = 0
+        self.arrow_in_target_zone = False
+        self.last_quadrant_pointed = -1
+    
+    def select_new_target(self, now=None):
         """Seleciona um novo quadrante alvo"""
+        if now is None:
+            now = time.perf_counter()
+        # Reancora o modelo para a seta não saltar ao mudar de velocidade
+        self.angle_origin = self.angle_at(now)
+        self.time_origin = now
+        
         self.target_quadrant = random.randint(0, 3)
         self.arrow_color = QUADRANT_COLORS[self.target_quadrant]
         self.arrow_rotation_speed = random.uniform(2.0, 8.0)
     
-    def update(self):
+    def angular_velocity(self):
+        """Velocidade da seta em graus por segundo"""
+        return self.arrow_rotation_speed * ARROW_NOMINAL_FPS
+    
+    def angle_at(self, t):
+        """Ângulo da seta no instante t (segundos de time.perf_counter)"""
+        return (self.angle_origin + self.angular_velocity() * (t - self.time_origin)) % 360
+    
+    def update(self, now=None):
         """Atualiza a rotação da seta"""
-        self.arrow_angle += self.arrow_rotation_speed
-        if self.arrow_angle >= 360:
-            self.arrow_angle = 0
+        if now is None:
+            now = time.perf_counter()
+        self.arrow_angle = self.angle_at(now)
         
         pointed_quadrant = self.get_arrow_pointed_quadrant()
         self.arrow_in_target_zone = (pointed_quadrant == self.target_quadrant 
                                      and pointed_quadrant != -1)
         self.last_quadrant_pointed = pointed_quadrant
     
-    def get_arrow_pointed_quadrant(self):
+    def get_arrow_pointed_quadrant(self, angle=None):
         """Determina para qual quadrante a seta está apontando"""
-        angle = self.arrow_angle % 360
+        angle = (self.arrow_angle if angle is None else angle) % 360
         
         if 270 <= angle or angle < 90:
             if 270 <= angle or angle < 0:
@@ -52,6 +114,24 @@ class ArrowMode:
         else:
             return -1
     
+    def click_timing(self, click_time):
+        """Reconstrói o ângulo da seta no instante do clique
+        
+        Retorna o ângulo, se a seta estava na zona alvo e o erro de timing
+        com sinal em relação ao centro do quadrante alvo (positivo = atrasado).
+        """
+        angle = self.angle_at(click_time)
+        in_zone = self.get_arrow_pointed_quadrant(angle) == self.target_quadrant
+        
+        zone_center = QUADRANT_ZONE_CENTERS[self.target_quadrant]
+        error_deg = (angle - zone_center + 180) % 360 - 180
+        return {
+            "arrow_angle": angle,
+            "arrow_in_target_zone": in_zone,
+            "timing_error_deg": error_deg,
+            "timing_error_ms": error_deg / self.angular_velocity() * 1000
+        }
+    
     def get_clicked_quadrant(self, mouse_pos):
         """Determina qual quadrante foi clicado"""
         mx, my = mouse_pos
@@ -66,99 +146,122 @@ class ArrowMode:
         else:
             return 3  # Inferior direito
     
-    def draw(self, screen):
-        """Desenha a interface do modo seta"""
+    def render_board(self, target_quadrant, in_target_zone):
+        """Renderiza o tabuleiro de quadrantes para um alvo e estado de destaque"""
         center_x, center_y = WIDTH // 2, HEIGHT // 2
+        board = pygame.Surface((WIDTH, HEIGHT))
         
         # Desenha os quadrantes coloridos
         for i in range(4):
             quadrant_color = QUADRANT_COLORS[i]
             
-            if i == self.target_quadrant and self.arrow_in_target_zone:
+            if i == target_quadrant and in_target_zone:
                 bright_color = tuple(min(255, c + 50) for c in quadrant_color)
                 quadrant_color = bright_color
-            elif i == self.target_quadrant:
+            elif i == target_quadrant:
                 dark_color = tuple(max(50, c - 30) for c in quadrant_color)
                 quadrant_color = dark_color
             
             if i == 0:  # Superior esquerdo
-                pygame.draw.rect(screen, quadrant_color, (0, 0, center_x, center_y))
+                pygame.draw.rect(board, quadrant_color, (0, 0, center_x, center_y))
             elif i == 1:  # Superior direito
-                pygame.draw.rect(screen, quadrant_color, (center_x, 0, center_x, center_y))
+                pygame.draw.rect(board, quadrant_color, (center_x, 0, center_x, center_y))
             elif i == 2:  # Inferior esquerdo
-                pygame.draw.rect(screen, quadrant_color, (0, center_y, center_x, center_y))
+                pygame.draw.rect(board, quadrant_color, (0, center_y, center_x, center_y))
             else:  # Inferior direito
-                pygame.draw.rect(screen, quadrant_color, (center_x, center_y, center_x, center_y))
+                pygame.draw.rect(board, quadrant_color, (center_x, center_y, center_x, center_y))
         
         # Desenha linhas divisórias
-        pygame.draw.line(screen, GAME_BLACK, (center_x, 0), (center_x, HEIGHT), 4)
-        pygame.draw.line(screen, GAME_BLACK, (0, center_y), (WIDTH, center_y), 4)
+        pygame.draw.line(board, GAME_BLACK, (center_x, 0), (center_x, HEIGHT), 4)
+        pygame.draw.line(board, GAME_BLACK, (0, center_y), (WIDTH, center_y), 4)
+        
+        # Mesmo formato de pixel da tela para o blit ser uma cópia direta
+        if pygame.display.get_surface() is not None:
+            board = board.convert()
+        return board
+    
+    def get_board(self, target_quadrant, in_target_zone):
+        """Retorna o tabuleiro pré-renderizado (criado na primeira vez que é usado)"""
+        key = (target_quadrant, in_target_zone)
+        board = self.boards.get(key)
+        if board is None:
+            board = self.render_board(target_quadrant, in_target_zone)
+            self.boards[key] = board
+        return board
+    
+    def draw(self, screen):
+        """Desenha a interface do modo seta"""
+        screen.blit(self.get_board(self.target_quadrant, self.arrow_in_target_zone), (0, 0))
         
         # Desenha a seta no centro
-        self.draw_arrow(screen, center_x, center_y)
+        self.draw_arrow(screen, WIDTH // 2, HEIGHT // 2)
     
     def draw_arrow(self, screen, center_x, center_y):
         """Desenha a seta girando"""
-        arrow_length = 80
-        angle_rad = math.radians(self.arrow_angle)
+        lut = self.arrow_luts.get((center_x, center_y))
+        if lut is None:
+            lut = build_arrow_lut(center_x, center_y)
+            self.arrow_luts[(center_x, center_y)] = lut
         
-        tip_x = center_x + arrow_length * math.cos(angle_rad)
-        tip_y = center_y + arrow_length * math.sin(angle_rad)
+        step = int(round(self.arrow_angle * ARROW_LUT_STEPS / 360)) % ARROW_LUT_STEPS
+        arrow_points, shadow_points = lut[step]
         
-        base_angle1 = angle_rad + math.radians(150)
-        base_angle2 = angle_rad + math.radians(210)
-        
-        base1_x = center_x + (arrow_length - 30) * math.cos(base_angle1)
-        base1_y = center_y + (arrow_length - 30) * math.sin(base_angle1)
-        
-        base2_x = center_x + (arrow_length - 30) * math.cos(base_angle2)
-        base2_y = center_y + (arrow_length - 30) * math.sin(base_angle2)
-        
-        arrow_points = [(tip_x, tip_y), (base1_x, base1_y), (base2_x, base2_y)]
-        
-        shadow_points = [(p[0] + 2, p[1] + 2) for p in arrow_points]
         pygame.draw.polygon(screen, GAME_BLACK, shadow_points)
-        
         pygame.draw.polygon(screen, self.arrow_color, arrow_points)
         pygame.draw.polygon(screen, GAME_BLACK, arrow_points, 3)
         
-        pygame.draw.circle(screen, GAME_BLACK, (center_x, center_y), 15)
-        pygame.draw.circle(screen, GAME_WHITE, (center_x, center_y), 12)
+        # Eixo central (pré-renderizado)
+        if self.hub is None:
+            self.hub = pygame.Surface((30, 30), pygame.SRCALPHA)
+            pygame.draw.circle(self.hub, GAME_BLACK, (15, 15), 15)
+            pygame.draw.circle(self.hub, GAME_WHITE, (15, 15), 12)
+        screen.blit(self.hub, (center_x - 15, center_y - 15))
 
 
 class CharacterMode:
     """Lógica base para modos que usam personagens"""
-    def __init__(self, character_factory):
+    def __init__(self, character_factory, distractor_generator=None):
         self.character_factory = character_factory
+        # Se definido, controla a semelhança dos distratores com o alvo
+        self.distractor_generator = distractor_generator
         self.target_character = None
         self.target_traits = None
+        self.target_code = None
         self.has_target_spawned = False
         self.target_spawn_count = 0
         self.target_spawned_time = 0
     
     def select_new_target(self, x, y):
         """Cria um novo personagem alvo"""
+        if self.target_character is not None:
+            self.character_factory.pool.release(self.target_character)
         self.target_character = self.character_factory.create_random_character(x, y)
         self.target_traits = self.target_character.traits
+        self.target_code = self.character_factory.code_for_traits(self.target_traits)
         self.has_target_spawned = False
         self.target_spawn_count = 0
     
+    def distance_to_target(self, traits):
+        """Quantas características (0 a 4) diferem do personagem alvo"""
+        return self.character_factory.space.hamming(
+            self.character_factory.code_for_traits(traits), self.target_code)
+    
     def spawn_character(self, escalator, target=False):
         """Gera um personagem na escada"""
-        from characters import Character
         char_x = escalator.x + (escalator.width - CHARACTER_SIZE) // 2
         char_y = 0 - CHARACTER_SIZE
         
         if target:
-            character = Character(char_x, char_y, self.target_traits)
+            character = self.character_factory.pool.acquire(char_x, char_y, self.target_traits)
             self.has_target_spawned = True
             self.target_spawned_time = 0  # será definido externamente
             self.target_spawn_count += 1
+        elif self.distractor_generator is not None:
+            code, _ = self.distractor_generator.sample(self.target_code)
+            character = self.character_factory.create_character(char_x, char_y, code)
         else:
-            while True:
-                character = self.character_factory.create_random_character(char_x, char_y)
-                if character.traits != self.target_traits:
-                    break
+            character = self.character_factory.create_random_character(
+                char_x, char_y, exclude=(self.target_code,))
         
         escalator.add_character(character)
         return character
@@ -1,103 +1,232 @@
 """
 Sistema de highscores (pontuações máximas)
+
+As pontuações ficam em um banco SQLite com o histórico completo, indexado por
+modo e pontuação. Um histograma (modo, pontuação) -> quantidade é mantido por
+gatilho, então a posição de qualquer pontuação no histórico inteiro é obtida
+somando poucas linhas, independente do número de partidas registradas.
+
+O top 10 também é exportado para highscores.json a cada pontuação, e o JSON é
+importado de novo sempre que fica mais novo que a última importação (o jogo
+monolítico game.py ainda grava só nele), então os dois jogos compartilham o
+mesmo ranking.
 """
 import os
 import json
+import sqlite3
 from datetime import datetime
+from config import HIGHSCORE_DB_PATH, HIGHSCORE_JOURNAL_MODE
+from persistence import atomic_write_json
+
+MODE_NAMES = {
+    0: "single",
+    1: "alternating",
+    2: "infinite",
+    3: "arrow"
+}
+
+# Só os modos INFINITE e ARROW entram no ranking
+RANKED_MODES = (2, 3)
+
+TOP_SIZE = 10
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scores (
+    id INTEGER PRIMARY KEY,
+    mode TEXT NOT NULL,
+    name TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_scores_mode_score ON scores (mode, score DESC, id);
+CREATE TABLE IF NOT EXISTS score_counts (
+    mode TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (mode, score)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS trg_scores_count AFTER INSERT ON scores
+BEGIN
+    INSERT INTO score_counts (mode, score, count) VALUES (NEW.mode, NEW.score, 1)
+    ON CONFLICT (mode, score) DO UPDATE SET count = count + 1;
+END;
+"""
 
 
 class HighscoreManager:
     """Gerencia as melhores pontuações dos jogadores"""
-    def __init__(self):
+    def __init__(self, db_path=HIGHSCORE_DB_PATH, journal_mode=HIGHSCORE_JOURNAL_MODE):
+        self.db_path = db_path
+        self.json_path = None if db_path == ":memory:" else \
+            os.path.join(os.path.dirname(db_path) or ".", "highscores.json")
+        self.connection = self._connect(db_path, journal_mode)
         self.highscores = self.load_highscores()
     
+    def _connect(self, db_path, journal_mode):
+        """Abre o banco; se não for possível, usa um banco em memória"""
+        try:
+            if db_path != ":memory:":
+                os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            connection = sqlite3.connect(db_path, timeout=5.0)
+            connection.execute(f"PRAGMA journal_mode={journal_mode}")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            with connection:
+                connection.executescript(SCHEMA)
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            print(f"Erro ao abrir banco de highscores: {e}")
+            connection = sqlite3.connect(":memory:")
+            connection.executescript(SCHEMA)
+            return connection
+    
+    def _imported_mtime(self):
+        row = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'json_mtime_ns'").fetchone()
+        return int(row[0]) if row else None
+    
+    def _set_imported_mtime(self, mtime_ns):
+        self.connection.execute(
+            "INSERT INTO meta (key, value) VALUES ('json_mtime_ns', ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value", (str(mtime_ns),))
+    
+    def _import_json(self):
+        """Importa o highscores.json se ele mudou desde a última importação
+        
+        Só entram as pontuações que ainda não estão no banco (mesmo modo, nome,
+        pontuação e data), então o top 10 exportado por este gerenciador ou
+        regravado pelo game.py não é duplicado.
+        """
+        if self.json_path is None:
+            return
+        try:
+            mtime_ns = os.stat(self.json_path).st_mtime_ns
+        except OSError:
+            return
+        last = self._imported_mtime()
+        if last is not None and mtime_ns <= last:
+            return
+        try:
+            with open(self.json_path, 'r', encoding='utf-8') as f:
+                exported = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Erro ao importar highscores do JSON: {e}")
+            return
+        
+        wanted = {}
+        for mode_key, entries in exported.items():
+            for entry in entries:
+                key = (mode_key, entry["name"], entry["score"], entry.get("date", ""))
+                wanted[key] = wanted.get(key, 0) + 1
+        rows = []
+        for (mode_key, name, score, date), count in wanted.items():
+            (present,) = self.connection.execute(
+                "SELECT COUNT(*) FROM scores WHERE mode = ? AND name = ? AND score = ? AND date = ?",
+                (mode_key, name, score, date)).fetchone()
+            rows.extend([(mode_key, name, score, date, 0.0)] * (count - present))
+        with self.connection:
+            self.connection.executemany(
+                "INSERT INTO scores (mode, name, score, date, created_at) VALUES (?, ?, ?, ?, ?)",
+                rows)
+            self._set_imported_mtime(mtime_ns)
+    
+    def _top_scores(self, mode_key, limit=TOP_SIZE):
+        rows = self.connection.execute(
+            "SELECT name, score, date FROM scores WHERE mode = ? "
+            "ORDER BY score DESC, id LIMIT ?", (mode_key, limit))
+        return [{"name": name, "score": score, "date": date} for name, score, date in rows]
+    
     def load_highscores(self):
-        """Carrega os highscores do arquivo"""
+        """Carrega o top 10 de cada modo a partir do banco"""
         try:
-            highscore_path = os.path.join("playerdata", "highscore", "highscores.json")
-            if os.path.exists(highscore_path):
-                with open(highscore_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return {"single": [], "alternating": [], "infinite": [], "arrow": []}
-        except:
-            return {"single": [], "alternating": [], "infinite": [], "arrow": []}
+            self._import_json()
+            return {mode_key: self._top_scores(mode_key) for mode_key in MODE_NAMES.values()}
+        except sqlite3.Error as e:
+            print(f"Erro ao carregar highscores: {e}")
+            return {mode_key: [] for mode_key in MODE_NAMES.values()}
     
     def add_highscore(self, name, score, mode):
         """Adiciona uma nova pontuação ao ranking - APENAS para modos INFINITE e ARROW"""
-        # Só salva no highscore se for modo INFINITE ou ARROW
-        if mode not in [2, 3]:  # GAME_MODE_INFINITE = 2, GAME_MODE_ARROW = 3
+        if mode not in RANKED_MODES:
             return
-            
-        mode_names = {
-            0: "single",
-            1: "alternating", 
-            2: "infinite",
-            3: "arrow"
-        }
-        
-        mode_key = mode_names.get(mode, "infinite")
-        
-        if mode_key not in self.highscores:
-            self.highscores[mode_key] = []
         
+        mode_key = MODE_NAMES.get(mode, "infinite")
         clean_name = name.strip() if name and name.strip() else "Anônimo"
-        new_score = {
-            "name": clean_name,
-            "score": score,
-            "date": datetime.now().strftime("%d/%m/%Y %H:%M")
-        }
-        
-        self.highscores[mode_key].append(new_score)
-        
-        # Ordena por pontuação (maior primeiro) e mantém apenas top 10
-        self.highscores[mode_key].sort(key=lambda x: x["score"], reverse=True)
-        self.highscores[mode_key] = self.highscores[mode_key][:10]
+        now = datetime.now()
         
+        try:
+            self._import_json()
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO scores (mode, name, score, date, created_at) VALUES (?, ?, ?, ?, ?)",
+                    (mode_key, clean_name, score, now.strftime("%d/%m/%Y %H:%M"), now.timestamp()))
+            self.highscores = {key: self._top_scores(key) for key in MODE_NAMES.values()}
+        except sqlite3.Error as e:
+            print(f"Erro ao salvar highscore: {e}")
+            return
         self.save_highscores()
     
     def is_highscore(self, score, mode):
         """Verifica se a pontuação é um highscore - APENAS para modos INFINITE e ARROW"""
-        # Só considera highscore se for modo INFINITE ou ARROW
-        if mode not in [2, 3]:
+        if mode not in RANKED_MODES:
             return False
-            
-        mode_names = {
-            0: "single",
-            1: "alternating",
-            2: "infinite",
-            3: "arrow"
-        }
-        
-        mode_key = mode_names.get(mode, "infinite")
-        scores = self.highscores[mode_key]
         
-        # Se tem menos de 10 pontuações, sempre é highscore
-        if len(scores) < 10:
-            return True
+        mode_key = MODE_NAMES.get(mode, "infinite")
+        try:
+            self._import_json()
+        except sqlite3.Error as e:
+            print(f"Erro ao importar highscores do JSON: {e}")
+        # Menor pontuação do top 10; se ainda não há 10, sempre é highscore
+        row = self.connection.execute(
+            "SELECT score FROM scores WHERE mode = ? ORDER BY score DESC, id LIMIT 1 OFFSET ?",
+            (mode_key, TOP_SIZE - 1)).fetchone()
+        return row is None or score > row[0]
+    
+    def get_rank(self, score, mode):
+        """Posição e percentil de uma pontuação em todo o histórico do modo
         
-        # Se a pontuação é maior que a menor do top 10
-        return score > scores[-1]["score"]
+        Retorna {"rank", "total", "percentile"}; percentil é a porcentagem
+        das pontuações registradas que ficaram abaixo de score.
+        """
+        mode_key = MODE_NAMES.get(mode, "infinite")
+        above, below, total = self.connection.execute(
+            "SELECT COALESCE(SUM(CASE WHEN score > ? THEN count END), 0), "
+            "COALESCE(SUM(CASE WHEN score < ? THEN count END), 0), "
+            "COALESCE(SUM(count), 0) FROM score_counts WHERE mode = ?",
+            (score, score, mode_key)).fetchone()
+        return {
+            "rank": above + 1,
+            "total": total,
+            "percentile": 100.0 * below / total if total else 0.0
+        }
     
-    def save_highscores(self):
-        """Salva os highscores no arquivo"""
+    def save_highscores(self, path=None):
+        """Exporta o top 10 de cada modo em JSON, lido pelo game.py
+        
+        Chamado a cada pontuação por add_highscore; o banco em memória só
+        exporta se path for dado.
+        """
+        path = path or self.json_path
+        if path is None:
+            return
         try:
-            highscore_dir = os.path.join("playerdata", "highscore")
-            os.makedirs(highscore_dir, exist_ok=True)
-            
-            highscore_path = os.path.join(highscore_dir, "highscores.json")
-            with open(highscore_path, 'w', encoding='utf-8') as f:
-                json.dump(self.highscores, f, indent=2, ensure_ascii=False)
-        except Exception as e:
+            atomic_write_json(path, self.highscores, indent=2, ensure_ascii=False)
+            if path == self.json_path:
+                # O próprio export não precisa ser importado de volta
+                with self.connection:
+                    self._set_imported_mtime(os.stat(path).st_mtime_ns)
+        except (OSError, sqlite3.Error) as e:
             print(f"Erro ao salvar highscores: {e}")
     
     def get_mode_highscores(self, mode):
         """Retorna os highscores de um modo específico"""
-        mode_names = {
-            0: "single",
-            1: "alternating",
-            2: "infinite",
-            3: "arrow"
-        }
-        mode_key = mode_names.get(mode, "infinite")
+        mode_key = MODE_NAMES.get(mode, "infinite")
         return self.highscores.get(mode_key, [])
+    
+    def close(self):
+        """Fecha a conexão com o banco"""
+        self.connection.close()
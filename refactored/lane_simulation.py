@@ -0,0 +1,192 @@
+"""
+Simulação vetorizada das escadas rolantes (backend NumPy)
+
+Guarda posições, degraus e combinações de características de todos os
+personagens de uma escada em arrays (struct-of-arrays) e avança todos de uma
+vez por frame. Produz exatamente as mesmas posições de Character.update.
+"""
+import numpy as np
+import pygame
+from config import CHARACTER_SIZE, HEIGHT
+from ui_components import Escalator, ENTRY_STEP, STEP_HEIGHT
+
+
+class LaneArrays:
+    """Estado dos personagens de uma escada em arrays NumPy"""
+    def __init__(self, capacity=64):
+        self.count = 0
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        self.capacity = capacity
+        self.step_position = np.zeros(capacity, dtype=np.float64)
+        self.current_step = np.zeros(capacity, dtype=np.int64)
+        self.y = np.zeros(capacity, dtype=np.float64)
+        self.codes = np.zeros(capacity, dtype=np.int64)
+        # Buffers de trabalho reutilizados a cada frame
+        self._wrapped = np.zeros(capacity, dtype=bool)
+        self._scratch = np.zeros(capacity, dtype=np.float64)
+
+    def _grow(self):
+        n = self.count
+        old = (self.step_position, self.current_step, self.y, self.codes)
+        self._allocate(self.capacity * 2)
+        for new_array, old_array in zip(
+                (self.step_position, self.current_step, self.y, self.codes), old):
+            new_array[:n] = old_array[:n]
+
+    def append(self, y, code, current_step=ENTRY_STEP, step_position=0.0):
+        """Adiciona um personagem no fim da escada"""
+        if self.count == self.capacity:
+            self._grow()
+        i = self.count
+        self.y[i] = y
+        self.codes[i] = code
+        self.current_step[i] = current_step
+        self.step_position[i] = step_position
+        self.count += 1
+
+    def advance(self, speed):
+        """Avança todos os personagens um frame (mesma semântica de Character.update)"""
+        n = self.count
+        if n == 0:
+            return
+        step_position = self.step_position[:n]
+        current_step = self.current_step[:n]
+        wrapped = self._wrapped[:n]
+        scratch = self._scratch[:n]
+
+        step_position += speed / STEP_HEIGHT
+        np.greater_equal(step_position, 1, out=wrapped)
+        current_step += wrapped
+        step_position -= wrapped
+
+        np.multiply(current_step, STEP_HEIGHT, out=self.y[:n], casting='unsafe')
+        np.multiply(step_position, STEP_HEIGHT, out=scratch)
+        self.y[:n] += scratch
+
+    def cull(self, max_y):
+        """Remove (com máscara booleana) os personagens abaixo de max_y"""
+        n = self.count
+        keep = self.y[:n] <= max_y
+        if keep.all():
+            return
+        kept = int(keep.sum())
+        for array in (self.step_position, self.current_step, self.y, self.codes):
+            array[:kept] = array[:n][keep]
+        self.count = kept
+
+    def remove(self, index):
+        """Remove um personagem específico mantendo a ordem"""
+        n = self.count
+        for array in (self.step_position, self.current_step, self.y, self.codes):
+            array[index:n - 1] = array[index + 1:n]
+        self.count -= 1
+
+    def clear(self):
+        self.count = 0
+
+
+class VectorizedEscalator(Escalator):
+    """Escada rolante cujos personagens são simulados em arrays NumPy
+
+    Tem a mesma interface de Escalator. Os objetos Character recebidos em
+    add_character voltam ao pool no próximo update; check_character_click
+    devolve um Character temporário, válido até o próximo clique ou remoção.
+    """
+    def __init__(self, x, width, speed, color, factory, pool=None, capacity=64):
+        if pool is None:
+            pool = factory.pool
+        super().__init__(x, width, speed, color, pool=pool)
+        self.factory = factory
+        self.lane = LaneArrays(capacity)
+        self.character_x = x + (width - CHARACTER_SIZE) // 2
+        self._clicked = None
+        self._clicked_index = -1
+        self._added = []
+
+    def __len__(self):
+        return self.lane.count
+
+    def add_character(self, character):
+        """Adiciona um personagem à escada"""
+        self.lane.append(character.y, self.factory.code_for_traits(character.traits))
+        # Quem chamou ainda pode usar o objeto até o fim do frame
+        self._added.append(character)
+
+    def entry_is_clear(self, min_gap=0):
+        """Verifica se há espaço no topo da escada para um novo personagem"""
+        if self.lane.count == 0:
+            return True
+        return self.lane.y[self.lane.count - 1] >= ENTRY_STEP * STEP_HEIGHT + CHARACTER_SIZE + min_gap
+
+    def _release_clicked(self):
+        if self._clicked is not None:
+            self.pool.release(self._clicked)
+        self._clicked = None
+        self._clicked_index = -1
+
+    def remove_character(self, character):
+        """Remove o personagem devolvido pelo último check_character_click"""
+        if character is not self._clicked:
+            raise ValueError("Personagem não pertence a esta escada")
+        self.lane.remove(self._clicked_index)
+        self._release_clicked()
+
+    def clear(self):
+        """Remove todos os personagens da escada"""
+        self._release_clicked()
+        self.lane.clear()
+
+    def update(self):
+        """Atualiza a escada e seus personagens"""
+        self.step_offset = (self.step_offset + self.speed) % 20
+        while self._added:
+            self.pool.release(self._added.pop())
+        self.lane.advance(self.speed)
+        self.lane.cull(HEIGHT)
+
+    def draw(self, screen):
+        """Desenha a escada e seus personagens"""
+        pygame.draw.rect(screen, self.color, (self.x, 0, self.width, HEIGHT))
+
+        for y in range(0, HEIGHT + STEP_HEIGHT, STEP_HEIGHT):
+            adjusted_y = (y + self.step_offset) % (HEIGHT + STEP_HEIGHT)
+            pygame.draw.line(screen, (50, 50, 50),
+                           (self.x, adjusted_y),
+                           (self.x + self.width, adjusted_y), 2)
+
+        segment_height = CHARACTER_SIZE // 3
+        traits_cache = self.factory.traits_cache
+        x = self.character_x
+        blits = []
+        for y, code in zip(self.lane.y[:self.lane.count].tolist(),
+                           self.lane.codes[:self.lane.count].tolist()):
+            traits = traits_cache[code]
+            blits.append((traits["body"]["image"], (x, y + segment_height * 2)))
+            blits.append((traits["head"]["image"], (x, y + segment_height)))
+            blits.append((traits["face"]["image"], (x, y + segment_height)))
+            blits.append((traits["hat"]["image"], (x, y)))
+        screen.blits(blits, doreturn=False)
+
+    def check_character_click(self, mouse_pos):
+        """Verifica se algum personagem foi clicado"""
+        mx, my = mouse_pos
+        n = self.lane.count
+        x = self.character_x
+        if n == 0 or not (x <= mx <= x + CHARACTER_SIZE):
+            return None
+        y = self.lane.y[:n]
+        hits = np.flatnonzero((y <= my) & (my <= y + CHARACTER_SIZE))
+        if hits.size == 0:
+            return None
+
+        index = int(hits[0])
+        self._release_clicked()
+        traits = self.factory.traits_for_code(int(self.lane.codes[index]))
+        character = self.pool.acquire(x, float(y[index]), traits)
+        character.current_step = int(self.lane.current_step[index])
+        character.step_position = float(self.lane.step_position[index])
+        self._clicked = character
+        self._clicked_index = index
+        return character
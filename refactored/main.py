@@ -2,10 +2,11 @@
 Memory Escalator - Jogo da Memória na Escada Rolante
 Arquivo principal refatorado
 """
+import time
+_IMPORT_START = time.perf_counter()
+
 import pygame
 import sys
-import time
-import random
 import os
 
 # Adiciona o diretório pai ao path para importar os módulos
@@ -18,27 +19,45 @@ from refactored.ui_components import Button, TextInput, Escalator
 from refactored.data_collector import GameDataCollector
 from refactored.highscore_manager import HighscoreManager
 from refactored.game_modes import ArrowMode, CharacterMode
+from refactored.trait_space import DistractorGenerator
+from refactored.spawn_scheduler import SpawnScheduler, SPAWN_TARGET
+from refactored.telemetry import TelemetryPublisher
+from refactored.mouse_ring import MouseRecorder, EVENT_MOTION, EVENT_BUTTON_DOWN, EVENT_BUTTON_UP
 from refactored import rendering
 
+runtime.record("imports", time.perf_counter() - _IMPORT_START)
+
 
 class Game:
     """Classe principal do jogo"""
     def __init__(self):
+        # Abre a janela e carrega as fontes antes do primeiro frame
+        runtime.init()
+        
         self.running = True
         self.game_state = GAME_STATE_MENU
         self.game_mode = GAME_MODE_SINGLE
         
         # Sistemas do jogo
-        self.data_collector = GameDataCollector()
+        self.telemetry = TelemetryPublisher() if TELEMETRY_ENABLED else None
+        self.mouse_recorder = MouseRecorder() if MOUSE_RING_ENABLED else None
+        self.data_collector = GameDataCollector(telemetry=self.telemetry,
+                                                mouse_recorder=self.mouse_recorder)
         self.highscore_manager = HighscoreManager()
         
         # Carrega assets e cria fábrica de personagens
+        assets_start = time.perf_counter()
         self.character_assets = load_assets()
+        runtime.record("assets", time.perf_counter() - assets_start)
         self.character_factory = CharacterFactory(self.character_assets)
         
         # Modos de jogo
         self.arrow_mode = ArrowMode()
-        self.character_mode = CharacterMode(self.character_factory)
+        self.distractor_generator = None
+        if DISTRACTOR_DIFFICULTY_MIX:
+            self.distractor_generator = DistractorGenerator(
+                self.character_factory.space, DISTRACTOR_DIFFICULTY_MIX)
+        self.character_mode = CharacterMode(self.character_factory, self.distractor_generator)
         
         # Variáveis de jogo
         self.score = 0
@@ -55,8 +74,10 @@ class Game:
         self.is_first_target = True
         self.time_bonus = 5
         
-        # Variáveis de spawn
-        self.spawn_counter = 0
+        # Agendamento de spawns
+        self.spawn_scheduler = SpawnScheduler(
+            CHARACTER_SPAWN_INTERVAL, TARGET_INTERARRIVAL, min_gap=SPAWN_MIN_GAP,
+            adaptive=ADAPTIVE_SPAWN_DENSITY, target_accuracy=ADAPTIVE_TARGET_ACCURACY)
         
         # Rastreamento de seleção
         self.selections_total = 0
@@ -66,12 +87,23 @@ class Game:
         self.escalators = []
         for i in range(3):
             x = ESCALATOR_START_X + i * (ESCALATOR_WIDTH + ESCALATOR_SPACING)
-            escalator = Escalator(x, ESCALATOR_WIDTH, ESCALATOR_SPEEDS[i], ESCALATOR_COLORS[i])
-            self.escalators.append(escalator)
+            self.escalators.append(self._create_escalator(x, i))
         
         # Cria botões e inputs
         self._create_ui_elements()
     
+    def _create_escalator(self, x, i):
+        """Cria uma escada usando o backend de simulação configurado"""
+        if LANE_BACKEND == "numpy":
+            try:
+                from refactored.lane_simulation import VectorizedEscalator
+                return VectorizedEscalator(x, ESCALATOR_WIDTH, ESCALATOR_SPEEDS[i],
+                                           ESCALATOR_COLORS[i], self.character_factory)
+            except ImportError as e:
+                print(f"Backend numpy indisponível ({e}), usando backend python")
+        return Escalator(x, ESCALATOR_WIDTH, ESCALATOR_SPEEDS[i], ESCALATOR_COLORS[i],
+                         pool=self.character_factory.pool)
+    
     def _create_ui_elements(self):
         """Cria todos os elementos de UI"""
         button_width, button_height = 280, 60
@@ -104,10 +136,10 @@ class Game:
     def reset_game(self):
         """Reinicia o estado do jogo"""
         for escalator in self.escalators:
-            escalator.characters = []
+            escalator.clear()
         
         self.character_factory.reset()
-        self.spawn_counter = 0
+        self.spawn_scheduler.reset_density()
         self.start_time = 0
         self.score = 0
         self.selections_total = 0
@@ -116,9 +148,7 @@ class Game:
         
         if self.game_mode == GAME_MODE_ARROW:
             self.arrow_mode.select_new_target()
-            self.arrow_mode.arrow_angle = 0
-            self.arrow_mode.arrow_in_target_zone = False
-            self.arrow_mode.last_quadrant_pointed = -1
+            self.arrow_mode.reset()
             self.time_limit = 90
             self.start_time = time.time()
         else:
@@ -145,11 +175,40 @@ class Game:
                 self._handle_keydown(event)
             
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                self._handle_mousedown(mouse_pos)
+                self._handle_mousedown(mouse_pos, self._event_time(event))
+            
+            if self.mouse_recorder and event.type in self.MOUSE_EVENTS:
+                self._record_mouse_event(event)
         
         # Atualiza estados de hover
         self._update_button_hovers(mouse_pos)
     
+    MOUSE_EVENTS = {pygame.MOUSEMOTION: EVENT_MOTION,
+                    pygame.MOUSEBUTTONDOWN: EVENT_BUTTON_DOWN,
+                    pygame.MOUSEBUTTONUP: EVENT_BUTTON_UP}
+    
+    def _record_mouse_event(self, event):
+        """Grava o evento do mouse em taxa cheia, com o horário em time.time()"""
+        if event.type == pygame.MOUSEMOTION:
+            buttons = sum(1 << i for i, pressed in enumerate(event.buttons) if pressed)
+        else:
+            buttons = (1 << (event.button - 1)) & 0xFF
+        timestamp = time.time() - (time.perf_counter() - self._event_time(event))
+        self.data_collector.record_mouse_event(
+            timestamp, event.pos, self.game_state, buttons, self.MOUSE_EVENTS[event.type])
+    
+    def _event_time(self, event):
+        """Instante do evento em segundos de time.perf_counter
+        
+        Usa o timestamp do SDL quando o pygame o expõe; senão, o instante
+        em que a fila de eventos foi lida.
+        """
+        now = time.perf_counter()
+        timestamp = getattr(event, "timestamp", None)
+        if timestamp is None:
+            return now
+        return now - max(0, pygame.time.get_ticks() - timestamp) / 1000.0
+    
     def _handle_keydown(self, event):
         """Processa teclas pressionadas"""
         if event.key == pygame.K_ESCAPE:
@@ -171,13 +230,13 @@ class Game:
                 self.data_collector.set_username(result if result else "Anônimo")
                 self.game_state = GAME_STATE_MENU
     
-    def _handle_mousedown(self, mouse_pos):
+    def _handle_mousedown(self, mouse_pos, click_time=None):
         """Processa cliques do mouse"""
         if self.game_state == GAME_STATE_MENU:
             self._handle_menu_clicks(mouse_pos)
         
         elif self.game_state == GAME_STATE_PLAYING:
-            self._handle_playing_clicks(mouse_pos)
+            self._handle_playing_clicks(mouse_pos, click_time)
         
         elif self.game_state == GAME_STATE_INSTRUCTIONS or self.game_state == GAME_STATE_HIGHSCORE:
             if self.back_button.is_clicked(mouse_pos):
@@ -218,21 +277,27 @@ class Game:
         elif self.highscore_button.is_clicked(mouse_pos):
             self.game_state = GAME_STATE_HIGHSCORE
     
-    def _handle_playing_clicks(self, mouse_pos):
+    def _handle_playing_clicks(self, mouse_pos, click_time=None):
         """Processa cliques durante o jogo"""
         if self.game_mode == GAME_MODE_ARROW:
-            self._handle_arrow_mode_click(mouse_pos)
+            self._handle_arrow_mode_click(mouse_pos, click_time)
         else:
             self._handle_character_mode_click(mouse_pos)
     
-    def _handle_arrow_mode_click(self, mouse_pos):
+    def _handle_arrow_mode_click(self, mouse_pos, click_time=None):
         """Processa cliques no modo seta"""
         clicked_quadrant = self.arrow_mode.get_clicked_quadrant(mouse_pos)
         if clicked_quadrant is not None:
             self.selections_total += 1
             
+            # Posição da seta no instante do clique, não no último frame desenhado
+            if click_time is None:
+                click_time = time.perf_counter()
+            timing = self.arrow_mode.click_timing(click_time)
+            timing["arrow_angle_at_frame"] = self.arrow_mode.arrow_angle
+            
             if (clicked_quadrant == self.arrow_mode.target_quadrant and 
-                self.arrow_mode.arrow_in_target_zone):
+                timing["arrow_in_target_zone"]):
                 # Acerto!
                 self.score += 1
                 self.selections_correct += 1
@@ -240,8 +305,8 @@ class Game:
                 self.data_collector.update_trial_score(self.score)
                 self.data_collector.record_arrow_selection(
                     True, clicked_quadrant, self.arrow_mode.target_quadrant, 
-                    self.arrow_mode.arrow_angle, self.arrow_mode.arrow_rotation_speed, 
-                    self.arrow_mode.arrow_in_target_zone)
+                    timing["arrow_angle"], self.arrow_mode.arrow_rotation_speed, 
+                    timing["arrow_in_target_zone"], timing)
                 
                 self.arrow_mode.select_new_target()
                 self.data_collector.start_new_trial(self.game_mode)
@@ -251,8 +316,8 @@ class Game:
                 self.data_collector.update_trial_score(self.score)
                 self.data_collector.record_arrow_selection(
                     False, clicked_quadrant, self.arrow_mode.target_quadrant, 
-                    self.arrow_mode.arrow_angle, self.arrow_mode.arrow_rotation_speed, 
-                    self.arrow_mode.arrow_in_target_zone)
+                    timing["arrow_angle"], self.arrow_mode.arrow_rotation_speed, 
+                    timing["arrow_in_target_zone"], timing)
     
     def _handle_character_mode_click(self, mouse_pos):
         """Processa cliques nos modos com personagens"""
@@ -266,13 +331,14 @@ class Game:
                     self.selections_correct += 1
                     self.data_collector.record_click(mouse_pos, True)
                     self.data_collector.update_trial_score(self.score)
-                    self.data_collector.record_selection(True)
+                    lapse = self.data_collector.record_selection(True)
+                    self.spawn_scheduler.report_outcome(True, lapse)
                     
                     if self.game_mode == GAME_MODE_SINGLE:
                         self.last_score = self.score
                         self.game_state = GAME_STATE_NAME_INPUT
                     else:
-                        escalator.characters.remove(clicked_character)
+                        escalator.remove_character(clicked_character)
                         
                         if self.game_mode == GAME_MODE_ALTERNATING:
                             self.character_mode.select_new_target(
@@ -286,13 +352,15 @@ class Game:
                         elif self.game_mode == GAME_MODE_INFINITE:
                             self.time_limit += self.time_bonus
                             self.character_mode.has_target_spawned = False
+                            self.spawn_scheduler.schedule_target(time.time())
                             self.data_collector.start_new_trial(self.game_mode)
                 else:
                     # Personagem errado
                     self.selections_total += 1
                     self.data_collector.record_click(mouse_pos, False)
                     self.data_collector.update_trial_score(self.score)
-                    self.data_collector.record_selection(False)
+                    lapse = self.data_collector.record_selection(False)
+                    self.spawn_scheduler.report_outcome(False, lapse)
                     
                     if self.game_mode == GAME_MODE_INFINITE:
                         self.time_limit -= 3
@@ -333,6 +401,7 @@ class Game:
                 self.game_state = GAME_STATE_PLAYING
                 if self.start_time == 0:
                     self.start_time = current_time
+                self._start_spawn_schedule(current_time)
         
         # Atualiza escadas rolantes
         for escalator in self.escalators:
@@ -360,31 +429,37 @@ class Game:
         if self.game_mode != GAME_MODE_ARROW:
             self._spawn_characters(current_time)
     
+    def _start_spawn_schedule(self, current_time):
+        """Inicia o agendamento de spawns ao começar (ou retomar) a partida"""
+        if self.game_mode == GAME_MODE_SINGLE:
+            # O alvo aparece uma única vez, alguns segundos após o início
+            delay = max(0, SINGLE_MODE_TARGET_DELAY - (current_time - self.start_time))
+            self.spawn_scheduler.start(current_time, target_delay=delay)
+        else:
+            self.spawn_scheduler.start(current_time)
+    
     def _spawn_characters(self, current_time):
         """Controla o spawn de personagens"""
-        self.spawn_counter += 1
-        if self.spawn_counter >= CHARACTER_SPAWN_RATE:
-            self.spawn_counter = 0
-            
-            escalator = random.choice(self.escalators)
-            
-            if self.game_mode == GAME_MODE_SINGLE:
-                if not self.character_mode.has_target_spawned and current_time - self.start_time >= 5:
-                    character = self.character_mode.spawn_character(escalator, target=True)
+        for kind, escalator in self.spawn_scheduler.due_spawns(current_time, self.escalators):
+            if kind == SPAWN_TARGET:
+                if not self.character_mode.has_target_spawned:
+                    self.character_mode.spawn_character(escalator, target=True)
                     self.data_collector.record_target_spawn(self.character_mode.target_traits)
-                else:
-                    self.character_mode.spawn_character(escalator, target=False)
-            
-            elif self.game_mode in [GAME_MODE_ALTERNATING, GAME_MODE_INFINITE]:
-                if not self.character_mode.has_target_spawned and random.random() < 0.2:
-                    character = self.character_mode.spawn_character(escalator, target=True)
-                    self.data_collector.record_target_spawn(self.character_mode.target_traits)
-                else:
-                    self.character_mode.spawn_character(escalator, target=False)
+            else:
+                self._spawn_distractor(escalator)
+    
+    def _spawn_distractor(self, escalator):
+        """Gera um distrator e registra sua semelhança com o alvo"""
+        character = self.character_mode.spawn_character(escalator, target=False)
+        self.data_collector.record_distractor_spawn(
+            character.traits, self.character_mode.distance_to_target(character.traits))
     
     def draw(self):
         """Desenha o jogo na tela"""
-        screen.fill(BACKGROUND_COLOR)
+        screen = runtime.screen
+        # O tabuleiro do modo seta cobre a tela inteira
+        if not (self.game_state == GAME_STATE_PLAYING and self.game_mode == GAME_MODE_ARROW):
+            screen.fill(BACKGROUND_COLOR)
         
         if self.game_state == GAME_STATE_MENU:
             buttons = [self.single_mode_button, self.alternating_mode_button,
@@ -440,7 +515,8 @@ class Game:
         elif self.game_state == GAME_STATE_NAME_INPUT:
             rendering.draw_name_input(
                 screen, self.is_new_highscore, self.last_score,
-                self.highscore_input, self.highscore_confirm_button)
+                self.highscore_input, self.highscore_confirm_button,
+                self.data_collector.attention_summary())
         
         elif self.game_state == GAME_STATE_INSTRUCTIONS:
             rendering.draw_instructions(screen, self.back_button)
@@ -454,17 +530,44 @@ class Game:
     def run(self):
         """Loop principal do jogo"""
         while self.running:
+            work_start = time.perf_counter()
             self.handle_events()
             self.update()
             self.draw()
-            clock.tick(60)
+            work = time.perf_counter() - work_start
+            interval = runtime.clock.tick(60) / 1000
+            if self.telemetry:
+                self.telemetry.frame(interval, work, time.time(), self._telemetry_metrics)
         
         self.data_collector.save_session_data()
+        self.highscore_manager.close()
+        if self.telemetry:
+            self.telemetry.close()
+        if self.mouse_recorder:
+            stats = self.mouse_recorder.stop()
+            print(f"Mouse em taxa cheia: {stats['written']} eventos em {self.mouse_recorder.path}, "
+                  f"{stats['overruns']} perdidos")
+    
+    def _telemetry_metrics(self):
+        """Estado atual da partida e métricas da sessão para a telemetria"""
+        session = self.data_collector.current_session
+        return {
+            "session_id": session["session_id"],
+            "username": session["username"],
+            "game_mode": self.game_mode,
+            "game_state": self.game_state,
+            "score": self.score,
+            "selections_total": self.selections_total,
+            "selections_correct": self.selections_correct,
+            "session_metrics": session["session_metrics"],
+            "attention": self.data_collector.attention_summary()
+        }
 
 
 def main():
     """Função principal"""
     game = Game()
+    print(runtime.startup_report())
     game.run()
     pygame.quit()
     sys.exit()
@@ -0,0 +1,180 @@
+"""
+Armazenamento comprimido e em blocos do rastreamento do mouse
+
+Em vez de uma lista JSON com um objeto por amostra, o mouse de cada sessão
+vai para um arquivo binário ao lado dos dados (sessions_....mouse), dividido
+em blocos: um novo bloco começa a cada tentativa e a cada
+MOUSE_CHUNK_SECONDS segundos. Cada bloco guarda as colunas com codificação
+delta (tempo em microssegundos, x e y como diferenças inteiras, estado do
+jogo) comprimidas com zlib, e um índice no fim do arquivo diz onde está cada
+bloco e qual intervalo de tempo ele cobre. Assim a análise descomprime só os
+blocos do trecho que precisa (ver python-data-viz/src/utils/mouse_store.py).
+
+Formato do arquivo:
+  cabeçalho   "MTCK", versão (u16), reservado (u16)
+  blocos      zlib(contagem u32, t0 f64, x0 i32, y0 i32,
+                   dt[i32 * n], dx[i32 * n], dy[i32 * n], estado[u8 * n])
+  índice      zlib(JSON {"version", "time_unit", "chunks": [{"session", "trial",
+                   "start", "end", "samples", "offset", "length"}]})
+  rodapé      posição do índice (u64), tamanho do índice (u32), "MTIX"
+Todos os inteiros são little-endian.
+"""
+import os
+import sys
+import json
+import zlib
+import struct
+import tempfile
+from array import array
+
+from config import MOUSE_CHUNK_SECONDS
+
+VERSION = 1
+FILE_HEADER = struct.Struct("<4sHH")
+FILE_MAGIC = b"MTCK"
+CHUNK_HEADER = struct.Struct("<Idii")
+FOOTER = struct.Struct("<QI4s")
+FOOTER_MAGIC = b"MTIX"
+TIME_UNIT = 1e-6  # Resolução dos timestamps gravados (segundos)
+COMPRESS_LEVEL = 6
+
+
+def _little_endian(values):
+    if sys.byteorder == "big":
+        values.byteswap()
+    return values.tobytes()
+
+
+def encode_chunk(samples):
+    """Comprime uma lista de amostras {"timestamp", "x", "y", "game_state"}"""
+    t0 = samples[0]["timestamp"]
+    x0, y0 = int(round(samples[0]["x"])), int(round(samples[0]["y"]))
+    dt, dx, dy, states = array("i"), array("i"), array("i"), array("B")
+    previous_t, previous_x, previous_y = 0, x0, y0
+    for sample in samples:
+        # Deltas sobre os valores já quantizados: o erro não se acumula
+        t = int(round((sample["timestamp"] - t0) / TIME_UNIT))
+        x, y = int(round(sample["x"])), int(round(sample["y"]))
+        dt.append(t - previous_t)
+        dx.append(x - previous_x)
+        dy.append(y - previous_y)
+        states.append(sample.get("game_state", 0) & 0xFF)
+        previous_t, previous_x, previous_y = t, x, y
+    payload = b"".join((CHUNK_HEADER.pack(len(samples), t0, x0, y0), _little_endian(dt),
+                        _little_endian(dx), _little_endian(dy), states.tobytes()))
+    return zlib.compress(payload, COMPRESS_LEVEL)
+
+
+def split_chunks(samples, trial_starts=(), max_seconds=MOUSE_CHUNK_SECONDS):
+    """Divide as amostras (em ordem de tempo) em blocos; retorna [(tentativa, amostras)]
+
+    Um bloco termina no início de cada tentativa ou quando passa de max_seconds.
+    tentativa é o índice da tentativa em andamento no início do bloco (None antes da primeira).
+    """
+    chunks = []
+    boundaries = sorted(trial_starts)
+    trial = None
+    next_trial = 0
+    current = []
+    for sample in samples:
+        timestamp = sample["timestamp"]
+        new_trial = False
+        while next_trial < len(boundaries) and timestamp >= boundaries[next_trial]:
+            trial = next_trial
+            next_trial += 1
+            new_trial = True
+        if current and (new_trial or timestamp - current[0]["timestamp"] >= max_seconds):
+            chunks.append((chunk_trial, current))
+            current = []
+        if not current:
+            chunk_trial = trial
+        current.append(sample)
+    if current:
+        chunks.append((chunk_trial, current))
+    return chunks
+
+
+class MouseChunkWriter:
+    """Grava as sessões em um arquivo de blocos (temporário + os.replace ao fechar)"""
+    def __init__(self, path, max_seconds=MOUSE_CHUNK_SECONDS):
+        self.path = path
+        self.max_seconds = max_seconds
+        self.index = []
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, self.temp_path = tempfile.mkstemp(
+            prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+        self.file = os.fdopen(fd, "wb")
+        self.file.write(FILE_HEADER.pack(FILE_MAGIC, VERSION, 0))
+
+    def add_session(self, session_id, samples, trial_starts=()):
+        """Grava o rastreamento de uma sessão; retorna a referência guardada no JSON"""
+        samples = [s for s in samples if "x" in s and "y" in s]
+        samples.sort(key=lambda s: s["timestamp"])
+        chunks = split_chunks(samples, trial_starts, self.max_seconds)
+        for trial, chunk in chunks:
+            data = encode_chunk(chunk)
+            self.index.append({
+                "session": session_id,
+                "trial": trial,
+                "start": chunk[0]["timestamp"],
+                "end": chunk[-1]["timestamp"],
+                "samples": len(chunk),
+                "offset": self.file.tell(),
+                "length": len(data)
+            })
+            self.file.write(data)
+        return {"file": os.path.basename(self.path), "samples": len(samples),
+                "chunks": len(chunks)}
+
+    def close(self):
+        """Grava o índice e o rodapé e move o arquivo para o destino"""
+        try:
+            index = zlib.compress(json.dumps(
+                {"version": VERSION, "time_unit": TIME_UNIT, "chunks": self.index},
+                separators=(",", ":")).encode("utf-8"), COMPRESS_LEVEL)
+            offset = self.file.tell()
+            self.file.write(index)
+            self.file.write(FOOTER.pack(offset, len(index), FOOTER_MAGIC))
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.file.close()
+            os.replace(self.temp_path, self.path)
+        except BaseException:
+            self.file.close()
+            if os.path.exists(self.temp_path):
+                os.remove(self.temp_path)
+            raise
+
+
+def sidecar_path(json_path):
+    """Arquivo de blocos que acompanha um arquivo de dados JSON"""
+    return os.path.splitext(json_path)[0] + ".mouse"
+
+
+def write_sessions(json_path, sessions, mouse_path=None):
+    """Grava o mouse das sessões no arquivo de blocos do json_path
+
+    mouse_path, se dado, substitui o arquivo padrão (precisa estar no mesmo
+    diretório do JSON, pois a referência guarda só o nome do arquivo).
+    Retorna cópias das sessões com "mouse_tracking" vazio e a referência em
+    "mouse_tracking_chunks" (as sessões originais não são alteradas).
+    """
+    writer = MouseChunkWriter(mouse_path or sidecar_path(json_path))
+    stored = []
+    try:
+        for session in sessions:
+            samples = session.get("mouse_tracking") or []
+            if not samples:
+                stored.append(session)
+                continue
+            trial_starts = [trial["trial_start_time"] for trial in session.get("trials", [])
+                            if trial.get("trial_start_time") is not None]
+            reference = writer.add_session(session["session_id"], samples, trial_starts)
+            stored.append(dict(session, mouse_tracking=[], mouse_tracking_chunks=reference))
+    except BaseException:
+        writer.file.close()
+        os.remove(writer.temp_path)
+        raise
+    writer.close()
+    return stored
@@ -0,0 +1,224 @@
+"""
+Captura do mouse em taxa cheia por um buffer circular em memória compartilhada
+
+Cada evento do mouse (movimento e botões, não só uma amostra por frame) vira
+um registro binário de tamanho fixo em um buffer circular de
+multiprocessing.shared_memory. O jogo é o único produtor e um processo
+gravador separado é o único consumidor, então não há travas: o jogo escreve
+o registro e só depois avança o índice de escrita; o gravador copia os
+registros até esse índice e depois avança o índice de leitura. Se o buffer
+estiver cheio, a amostra é descartada e o contador de perdas é incrementado.
+
+Os índices são contadores de 64 bits alinhados que só crescem (a posição no
+buffer é índice % capacidade) e cada um tem um único escritor. Eles usam o
+formato nativo do struct, copiado com um único memcpy alinhado; o formato
+"<Q" grava byte a byte e o outro processo poderia ler um valor pela metade.
+
+O gravador comprime os registros em um arquivo gzip com um cabeçalho de 16
+bytes (assinatura, versão, tamanho do registro); read_samples lê o arquivo,
+mesmo que a gravação tenha sido interrompida.
+"""
+import os
+import json
+import time
+import gzip
+import zlib
+import struct
+import multiprocessing
+from datetime import datetime
+from multiprocessing import shared_memory
+
+from config import MOUSE_RING_CAPACITY, MOUSE_RING_DIR
+
+# Registro: timestamp (time.time()), x, y, estado do jogo, botões pressionados
+# (bit 0 = esquerdo, 1 = meio, 2 = direito) e tipo do evento
+RECORD = struct.Struct("<diiBBBx")
+EVENT_MOTION = 0
+EVENT_BUTTON_DOWN = 1
+EVENT_BUTTON_UP = 2
+
+# Cabeçalho da memória compartilhada: assinatura, versão, tamanho do registro,
+# capacidade e, em campos de 8 bytes alinhados, índices de escrita e leitura,
+# perdas e a sinalização de encerramento
+HEADER = struct.Struct("<4sHHQ")
+MAGIC = b"MRNG"
+VERSION = 1
+WRITE_OFFSET = 16
+READ_OFFSET = 24
+OVERRUN_OFFSET = 32
+CLOSED_OFFSET = 40
+DATA_OFFSET = 64
+COUNTER = struct.Struct("Q")
+
+FILE_HEADER = struct.Struct("<4sHH8x")
+FILE_MAGIC = b"MRAW"
+
+
+class MouseRing:
+    """Buffer circular de registros do mouse em memória compartilhada"""
+    def __init__(self, shm, capacity, owner):
+        self.shm = shm
+        self.buffer = shm.buf
+        self.capacity = capacity
+        self.owner = owner
+        # Cópia local do índice de escrita: o produtor é o único que o altera
+        self.write_index = COUNTER.unpack_from(self.buffer, WRITE_OFFSET)[0]
+
+    @classmethod
+    def create(cls, capacity=MOUSE_RING_CAPACITY):
+        """Cria o buffer (no processo do jogo)"""
+        shm = shared_memory.SharedMemory(create=True, size=DATA_OFFSET + capacity * RECORD.size)
+        shm.buf[:DATA_OFFSET] = bytes(DATA_OFFSET)
+        HEADER.pack_into(shm.buf, 0, MAGIC, VERSION, RECORD.size, capacity)
+        return cls(shm, capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name):
+        """Abre um buffer existente pelo nome (no processo gravador)"""
+        shm = shared_memory.SharedMemory(name=name)
+        magic, version, record_size, capacity = HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            shm.close()
+            raise ValueError(f"Buffer {name} não é um buffer de mouse compatível")
+        return cls(shm, capacity, owner=False)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def _counter(self, offset):
+        return COUNTER.unpack_from(self.buffer, offset)[0]
+
+    @property
+    def overruns(self):
+        """Amostras descartadas porque o buffer estava cheio"""
+        return self._counter(OVERRUN_OFFSET)
+
+    @property
+    def closed(self):
+        return self._counter(CLOSED_OFFSET) != 0
+
+    def write(self, timestamp, x, y, game_state, buttons=0, event=EVENT_MOTION):
+        """Produtor: grava um registro; retorna False se o buffer estava cheio"""
+        index = self.write_index
+        if index - COUNTER.unpack_from(self.buffer, READ_OFFSET)[0] >= self.capacity:
+            COUNTER.pack_into(self.buffer, OVERRUN_OFFSET, self.overruns + 1)
+            return False
+        RECORD.pack_into(self.buffer, DATA_OFFSET + (index % self.capacity) * RECORD.size,
+                         timestamp, x, y, game_state, buttons, event)
+        # O índice só avança depois que o registro inteiro foi escrito
+        self.write_index = index + 1
+        COUNTER.pack_into(self.buffer, WRITE_OFFSET, self.write_index)
+        return True
+
+    def read_available(self):
+        """Consumidor: bytes de todos os registros ainda não lidos"""
+        start = self._counter(READ_OFFSET)
+        end = self._counter(WRITE_OFFSET)
+        if end <= start or end - start > self.capacity:
+            return b""  # nada novo (ou leitura inconsistente; tenta de novo depois)
+        chunks = []
+        first = start % self.capacity
+        count = end - start
+        head = min(count, self.capacity - first)
+        chunks.append(bytes(self.buffer[DATA_OFFSET + first * RECORD.size:
+                                        DATA_OFFSET + (first + head) * RECORD.size]))
+        if count > head:
+            chunks.append(bytes(self.buffer[DATA_OFFSET:DATA_OFFSET + (count - head) * RECORD.size]))
+        # Só libera o espaço depois de copiar os registros
+        COUNTER.pack_into(self.buffer, READ_OFFSET, end)
+        return b"".join(chunks)
+
+    def close_writer(self):
+        """Sinaliza ao gravador que não haverá mais registros"""
+        COUNTER.pack_into(self.buffer, CLOSED_OFFSET, 1)
+
+    def stats(self):
+        return {"written": self._counter(WRITE_OFFSET), "read": self._counter(READ_OFFSET),
+                "overruns": self.overruns, "capacity": self.capacity}
+
+    def release(self):
+        """Fecha o mapeamento; o dono também remove a memória compartilhada"""
+        self.buffer = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def drain_to_file(name, path, poll_interval=0.05, compresslevel=6):
+    """Processo gravador: copia os registros do buffer para um arquivo gzip até o encerramento"""
+    ring = MouseRing.attach(name)
+    records = 0
+    try:
+        with gzip.open(path, "wb", compresslevel=compresslevel) as f:
+            f.write(FILE_HEADER.pack(FILE_MAGIC, VERSION, RECORD.size))
+            while True:
+                # Lê o sinal antes dos dados: o que foi escrito antes dele será copiado
+                closed = ring.closed
+                data = ring.read_available()
+                if data:
+                    f.write(data)
+                    # Sincroniza o fluxo comprimido para que uma queda perca só o último lote
+                    f.flush()
+                    records += len(data) // RECORD.size
+                elif closed:
+                    break
+                else:
+                    time.sleep(poll_interval)
+        stats = dict(ring.stats(), records=records, path=path)
+        with open(path + ".json", "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+    finally:
+        ring.release()
+
+
+class MouseRecorder:
+    """Cria o buffer no processo do jogo e o processo gravador que o esvazia"""
+    def __init__(self, directory=MOUSE_RING_DIR, capacity=MOUSE_RING_CAPACITY):
+        now = datetime.now()
+        date_dir = os.path.join(directory, now.strftime("%Y-%m-%d"))
+        os.makedirs(date_dir, exist_ok=True)
+        self.path = os.path.join(date_dir, f"mouse_{now.strftime('%Y%m%d_%H%M%S')}.bin.gz")
+        self.ring = MouseRing.create(capacity)
+        self.process = multiprocessing.Process(
+            target=drain_to_file, args=(self.ring.name, self.path),
+            name="mouse-recorder", daemon=True)
+        self.process.start()
+
+    def write(self, timestamp, x, y, game_state, buttons=0, event=EVENT_MOTION):
+        return self.ring.write(timestamp, x, y, game_state, buttons, event)
+
+    @property
+    def overruns(self):
+        return self.ring.overruns
+
+    def stop(self, timeout=10):
+        """Espera o gravador esvaziar o buffer e libera a memória compartilhada"""
+        stats = self.ring.stats()
+        self.ring.close_writer()
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self.ring.release()
+        return stats
+
+
+def read_samples(path):
+    """Lê um arquivo do gravador; retorna [(timestamp, x, y, estado, botões, evento)]
+
+    Um arquivo cuja gravação foi interrompida é lido até o último registro completo.
+    """
+    decompressor = zlib.decompressobj(wbits=31)
+    data = bytearray()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            try:
+                data += decompressor.decompress(chunk)
+            except zlib.error:
+                break
+    magic, version, record_size = FILE_HEADER.unpack_from(data, 0)
+    if magic != FILE_MAGIC or record_size != RECORD.size:
+        raise ValueError(f"{path} não é um arquivo de mouse compatível")
+    body = memoryview(data)[FILE_HEADER.size:]
+    usable = len(body) - len(body) % RECORD.size
+    return list(RECORD.iter_unpack(body[:usable]))
@@ -0,0 +1,116 @@
+"""
+Gravação segura dos dados em disco
+
+Arquivos são escritos em um temporário no mesmo diretório, sincronizados com
+fsync e só então renomeados sobre o destino (os.replace é atômico), então uma
+queda de energia deixa o arquivo antigo ou o novo, nunca um pela metade.
+As tentativas concluídas também vão para um journal JSONL gravado em uma
+thread de fundo, que é reaproveitado na próxima inicialização se o jogo
+terminar sem salvar.
+"""
+import os
+import json
+import queue
+import tempfile
+import threading
+
+JOURNAL_PATH = os.path.join("playerdata", "journal", "trials.jsonl")
+
+
+def _fsync_directory(directory):
+    """Garante que a renomeação foi gravada no diretório (apenas POSIX)"""
+    if os.name != "posix":
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_json(path, data, **dump_options):
+    """Salva data em JSON de forma atômica (temporário + fsync + os.replace)"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, **dump_options)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+
+
+class TrialJournal:
+    """Journal de tentativas concluídas (uma linha JSON por registro)
+
+    append só coloca o registro em uma fila; a escrita, o flush e o fsync
+    acontecem em uma thread de fundo, fora do loop de frames.
+    """
+    def __init__(self, path=JOURNAL_PATH):
+        self.path = path
+        self.queue = queue.Queue()
+        self.thread = None
+
+    def _ensure_thread(self):
+        if self.thread is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.thread = threading.Thread(target=self._writer, name="trial-journal", daemon=True)
+            self.thread.start()
+
+    def _writer(self):
+        with open(self.path, 'a', encoding='utf-8') as f:
+            running = True
+            while running:
+                records = [self.queue.get()]
+                # Agrupa o que já estiver na fila em um único fsync
+                while True:
+                    try:
+                        records.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+                for record in records:
+                    if record is None:
+                        running = False
+                        continue
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+
+    def append(self, record):
+        """Enfileira um registro para gravação"""
+        self._ensure_thread()
+        self.queue.put(record)
+
+    def close(self):
+        """Grava o que estiver pendente e encerra a thread"""
+        if self.thread is not None:
+            self.queue.put(None)
+            self.thread.join()
+            self.thread = None
+
+    def discard(self):
+        """Apaga o journal depois que os dados foram salvos definitivamente"""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    @staticmethod
+    def replay(path=JOURNAL_PATH):
+        """Lê os registros de um journal, ignorando uma última linha incompleta"""
+        records = []
+        if not os.path.exists(path):
+            return records
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break  # gravação interrompida no meio da linha
+        return records
@@ -189,8 +189,9 @@ def draw_playing_state(screen, escalators, game_mode, score, time_limit, start_t
         screen.blit(hat_img, (mini_x, mini_y))
 
 
-def draw_name_input(screen, is_new_highscore, last_score, highscore_input, confirm_button):
-    """Desenha a tela de entrada de nome"""
+def draw_name_input(screen, is_new_highscore, last_score, highscore_input, confirm_button,
+                    attention_summary=None):
+    """Desenha a tela de entrada de nome e, se houver, o resumo de atenção da partida"""
     draw_gradient_background(screen)
     
     if is_new_highscore:
@@ -212,6 +213,17 @@ def draw_name_input(screen, is_new_highscore, last_score, highscore_input, confi
     instruction = TINY_FONT.render("Pressione Enter ou clique em Salvar", 
                                    True, GAME_WHITE)
     screen.blit(instruction, (WIDTH//2 - instruction.get_width()//2, HEIGHT//2 + 150))
+    
+    if attention_summary and attention_summary["trials"]:
+        lines = [
+            f"Tempo de reação médio: {attention_summary['rt_mean']:.2f} s "
+            f"(variação {attention_summary['rt_cv'] * 100:.0f}%)",
+            f"Lapsos de atenção: {attention_summary['lapses']}   "
+            f"Pausas: {attention_summary['idle_periods']}"
+        ]
+        for i, line in enumerate(lines):
+            text = TINY_FONT.render(line, True, GAME_WHITE)
+            screen.blit(text, (WIDTH//2 - text.get_width()//2, HEIGHT//2 + 200 + i * 30))
 
 
 def draw_instructions(screen, back_button):
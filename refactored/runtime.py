@@ -0,0 +1,109 @@
+"""
+Inicialização sob demanda do pygame (tela, relógio e fontes)
+
+Importar config e os módulos de lógica não importa o pygame, não inicializa
+o SDL nem abre janela: a tela, o relógio e as fontes só são criados no
+primeiro uso ou em runtime.init(), que também mede quanto tempo cada etapa
+levou.
+"""
+import os
+import time
+
+
+class LazyFont:
+    """Fonte que só é carregada quando usada pela primeira vez"""
+    def __init__(self, runtime, path, size, bold=False):
+        self._runtime = runtime
+        self._key = (path, size, bold)
+        self._font = None
+
+    def resolve(self):
+        """Retorna o pygame.font.Font real, carregando-o se necessário"""
+        if self._font is None:
+            self._font = self._runtime.font(*self._key)
+        return self._font
+
+    def __getattr__(self, attribute):
+        return getattr(self.resolve(), attribute)
+
+
+class GameRuntime:
+    """Recursos do pygame criados sob demanda e tempos de inicialização"""
+    def __init__(self, size=(0, 0), caption=""):
+        self.size = size
+        self.caption = caption
+        self.timings = {}
+        self.fonts = {}
+        self.lazy_fonts = []
+        self._screen = None
+        self._clock = None
+
+    def _timed(self, phase, function, *args):
+        start = time.perf_counter()
+        result = function(*args)
+        self.timings[phase] = self.timings.get(phase, 0.0) + time.perf_counter() - start
+        return result
+
+    def record(self, phase, seconds):
+        """Registra o tempo de uma etapa medida fora do runtime"""
+        self.timings[phase] = seconds
+
+    def lazy_font(self, path, size, bold=False):
+        """Cria uma fonte preguiçosa registrada para pré-carregamento"""
+        font = LazyFont(self, path, size, bold)
+        self.lazy_fonts.append(font)
+        return font
+
+    def font(self, path, size, bold=False):
+        """Retorna a fonte do arquivo path, carregando-a só na primeira vez
+        
+        bold aplica negrito sintético; prefira o arquivo da variante negrito.
+        Sem o arquivo, usa a fonte padrão do pygame.
+        """
+        key = (path, size, bold)
+        if key not in self.fonts:
+            import pygame
+            if not pygame.font.get_init():
+                self._timed("font_init", pygame.font.init)
+            if path is not None and not os.path.exists(path):
+                print(f"Aviso: fonte {path} não encontrada, usando a fonte padrão")
+                path = None
+            font = self._timed("fonts", pygame.font.Font, path, size)
+            font.set_bold(bold)
+            self.fonts[key] = font
+        return self.fonts[key]
+
+    @property
+    def screen(self):
+        """Superfície da janela, criada no primeiro acesso"""
+        if self._screen is None:
+            import pygame
+            if not pygame.display.get_init():
+                self._timed("display_init", pygame.display.init)
+            self._screen = self._timed("set_mode", pygame.display.set_mode, self.size)
+            pygame.display.set_caption(self.caption)
+        return self._screen
+
+    @property
+    def clock(self):
+        """Relógio do loop principal"""
+        if self._clock is None:
+            import pygame
+            self._clock = pygame.time.Clock()
+        return self._clock
+
+    def init(self):
+        """Abre a janela e carrega todas as fontes registradas de uma vez"""
+        self.screen
+        for font in self.lazy_fonts:
+            font.resolve()
+        return self
+
+    def startup_report(self):
+        """Texto com o tempo de cada etapa de inicialização"""
+        parts = [f"{phase} {seconds * 1000:.1f} ms" for phase, seconds in self.timings.items()]
+        total = sum(self.timings.values()) * 1000
+        return f"Inicialização: {total:.1f} ms ({', '.join(parts)})"
+
+
+runtime = GameRuntime()
@@ -0,0 +1,47 @@
+"""
+Formato dos segmentos de sessões e do índice
+
+Só usa a biblioteca padrão e não importa a configuração do jogo, para que o
+gerador de dados sintéticos (python-data-viz/src/utils/synthetic_data.py)
+possa carregá-lo pelo caminho e gravar exatamente o que o SessionStore grava.
+"""
+import json
+
+INDEX_NAME = "index.jsonl"
+
+
+def segment_name(day):
+    return f"sessions_{day.strftime('%Y%m%d')}.jsonl"
+
+
+def segment_path(kiosk, day):
+    """Caminho do segmento do dia relativo à raiz das sessões, com '/'"""
+    return f"{kiosk}/{day.strftime('%Y-%m')}/{segment_name(day)}"
+
+
+def index_entry(session, segment, offset, length, kiosk):
+    """Linha do índice que descreve uma sessão gravada no segmento"""
+    trials = session.get("trials", [])
+    times = [trial["trial_start_time"] for trial in trials
+             if trial.get("trial_start_time") is not None]
+    chunks = session.get("mouse_tracking_chunks")
+    return {
+        "session_id": session["session_id"],
+        "username": session.get("username"),
+        "game_mode": session.get("game_mode"),
+        "modes": sorted({trial["game_mode"] for trial in trials
+                         if trial.get("game_mode") is not None}),
+        "trials": len(trials),
+        "start": min(times) if times else None,
+        "end": max(times) if times else None,
+        "kiosk": kiosk,
+        "segment": segment,
+        "offset": offset,
+        "length": length,
+        "mouse": chunks["file"] if chunks else None
+    }
+
+
+def encode_record(record):
+    """Registro como uma linha de JSON compacto em UTF-8"""
+    return (json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
@@ -0,0 +1,137 @@
+"""
+Armazenamento das sessões em segmentos diários com índice
+
+Em vez de um arquivo JSON novo a cada execução do jogo, cada sessão concluída
+vira uma linha JSON acrescentada ao segmento do dia do quiosque:
+    playerdata/sessions/<quiosque>/<AAAA-MM>/sessions_<AAAAMMDD>.jsonl
+O segmento só cresce; nada já gravado é reescrito. Para cada sessão, uma
+linha vai para o índice do quiosque (playerdata/sessions/<quiosque>/index.jsonl)
+com o id, o jogador, os modos, o número de tentativas, o intervalo de tempo e
+a posição (offset e tamanho em bytes) da linha no segmento. Listar e filtrar
+meses de sessões lê só os índices, e cada sessão é lida com um seek direto
+(ver python-data-viz/src/utils/session_index.py).
+
+O índice é gravado depois do segmento; se o jogo cair entre os dois,
+rebuild_index reconstrói o índice a partir dos segmentos. O formato das linhas
+fica em session_format.py.
+"""
+import os
+import json
+import socket
+from datetime import datetime
+
+from config import SESSION_STORE_DIR, KIOSK_ID
+from session_format import INDEX_NAME, segment_path, index_entry, encode_record
+
+
+def safe_kiosk_id(kiosk_id):
+    """Nome do quiosque utilizável como nome de diretório"""
+    name = "".join(c if c.isalnum() or c in "-_." else "_" for c in str(kiosk_id))
+    return name.strip("._") or "quiosque"
+
+
+def _append_lines(path, lines):
+    """Acrescenta linhas ao arquivo com um único fsync; retorna a posição de cada uma"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    positions = []
+    with open(path, "ab") as f:
+        offset = f.tell()
+        if offset:
+            # Uma gravação interrompida pode ter deixado a última linha incompleta
+            with open(path, "rb") as existing:
+                existing.seek(offset - 1)
+                if existing.read(1) != b"\n":
+                    f.write(b"\n")
+                    offset += 1
+        for line in lines:
+            f.write(line)
+            positions.append((offset, len(line)))
+            offset += len(line)
+        f.flush()
+        os.fsync(f.fileno())
+    return positions
+
+
+class SessionStore:
+    """Segmentos diários e índice das sessões de um quiosque"""
+    def __init__(self, root=SESSION_STORE_DIR, kiosk_id=KIOSK_ID):
+        self.root = root
+        self.kiosk = safe_kiosk_id(kiosk_id or socket.gethostname())
+        self.directory = os.path.join(root, self.kiosk)
+        self.index_path = os.path.join(self.directory, INDEX_NAME)
+
+    def segment_path(self, day=None):
+        """Caminho do segmento do dia (hoje se day for None)"""
+        day = day or datetime.now()
+        return os.path.join(self.root, *segment_path(self.kiosk, day).split("/"))
+
+    def mouse_path(self, now=None):
+        """Arquivo de blocos do mouse de uma gravação, na pasta do segmento do dia"""
+        now = now or datetime.now()
+        return os.path.join(os.path.dirname(self.segment_path(now)),
+                            f"sessions_{now.strftime('%Y%m%d_%H%M%S_%f')}.mouse")
+
+    def append(self, sessions, day=None):
+        """Acrescenta as sessões ao segmento do dia e ao índice; retorna as entradas do índice"""
+        if not sessions:
+            return []
+        path = self.segment_path(day)
+        segment = os.path.relpath(path, self.root).replace(os.sep, "/")
+        positions = _append_lines(path, [encode_record(session) for session in sessions])
+        entries = [index_entry(session, segment, offset, length, self.kiosk)
+                   for session, (offset, length) in zip(sessions, positions)]
+        _append_lines(self.index_path, [encode_record(entry) for entry in entries])
+        return entries
+
+    def entries(self):
+        """Entradas do índice deste quiosque"""
+        return read_index_file(self.index_path)
+
+    def rebuild_index(self):
+        """Reescreve o índice lendo todos os segmentos do quiosque"""
+        entries = []
+        for directory, _, names in sorted(os.walk(self.directory)):
+            for name in sorted(names):
+                if not (name.startswith("sessions_") and name.endswith(".jsonl")):
+                    continue
+                path = os.path.join(directory, name)
+                segment = os.path.relpath(path, self.root).replace(os.sep, "/")
+                offset = 0
+                with open(path, "rb") as f:
+                    for line in f:
+                        try:
+                            session = json.loads(line)
+                        except ValueError:
+                            session = None  # linha interrompida por uma queda
+                        if session is not None and line.endswith(b"\n"):
+                            entries.append(index_entry(session, segment, offset, len(line),
+                                                       self.kiosk))
+                        offset += len(line)
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.writelines(encode_record(entry) for entry in entries)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.index_path)
+        return entries
+
+
+def read_index_file(path):
+    """Entradas de um arquivo de índice, ignorando uma última linha incompleta"""
+    entries = []
+    if not os.path.exists(path):
+        return entries
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+    return entries
+
+
+def read_session(root, entry):
+    """Lê uma sessão do segmento pela posição gravada no índice"""
+    with open(os.path.join(root, *entry["segment"].split("/")), "rb") as f:
+        f.seek(entry["offset"])
+        return json.loads(f.read(entry["length"]))
@@ -0,0 +1,121 @@
+"""
+Agendamento de spawns de personagens baseado em tempo
+"""
+import heapq
+import random
+
+SPAWN_DISTRACTOR = "distractor"
+SPAWN_TARGET = "target"
+
+# Espera antes de tentar de novo quando todas as escadas estão ocupadas
+RETRY_DELAY = 0.05
+
+
+class SpawnScheduler:
+    """Fila de eventos de spawn ordenada pelo horário de vencimento
+
+    Os horários são em segundos (time.time()), então a cadência não depende
+    do FPS. Um evento só é atendido em uma escada com espaço livre no topo,
+    de modo que os personagens nunca se sobrepõem. O tempo até o alvo aparecer
+    segue a distribuição configurada e, no modo adaptativo, o intervalo entre
+    distratores se ajusta ao desempenho do jogador.
+    """
+    def __init__(self, distractor_interval, target_interarrival, min_gap=0,
+                 adaptive=False, target_accuracy=0.75,
+                 min_interval=0.4, max_interval=2.5, rng=None):
+        self.base_interval = distractor_interval
+        self.distractor_interval = distractor_interval
+        self.target_interarrival = target_interarrival
+        self.min_gap = min_gap
+        self.adaptive = adaptive
+        self.target_accuracy = target_accuracy
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.rng = rng or random.Random()
+
+        self.queue = []
+        self.sequence = 0
+        self.target_token = 0
+        self.running_accuracy = target_accuracy
+
+    def _push(self, due, kind, token=0):
+        self.sequence += 1
+        heapq.heappush(self.queue, (due, self.sequence, kind, token))
+
+    def sample_target_delay(self):
+        """Sorteia o tempo até o próximo alvo segundo a distribuição configurada"""
+        kind, *params = self.target_interarrival
+        if kind == "fixed":
+            return params[0]
+        if kind == "uniform":
+            return self.rng.uniform(params[0], params[1])
+        if kind == "exponential":
+            mean = params[0]
+            minimum = params[1] if len(params) > 1 else 0.0
+            return minimum + self.rng.expovariate(1.0 / (mean - minimum))
+        raise ValueError(f"Distribuição de chegada do alvo desconhecida: {kind}")
+
+    def start(self, now, target_delay=None):
+        """Inicia (ou reinicia) o agendamento de um período de jogo"""
+        self.queue.clear()
+        self._push(now + self.distractor_interval, SPAWN_DISTRACTOR)
+        self.schedule_target(now, target_delay)
+
+    def schedule_target(self, now, delay=None):
+        """Agenda o aparecimento do alvo, cancelando um agendamento anterior"""
+        self.target_token += 1
+        if delay is None:
+            delay = self.sample_target_delay()
+        self._push(now + delay, SPAWN_TARGET, self.target_token)
+
+    def cancel_target(self):
+        """Cancela o alvo agendado"""
+        self.target_token += 1
+
+    def due_spawns(self, now, lanes):
+        """Retorna [(tipo, escada)] para os eventos vencidos que cabem em alguma escada"""
+        spawns = []
+        used = []
+        while self.queue and self.queue[0][0] <= now:
+            due, _, kind, token = heapq.heappop(self.queue)
+            if kind == SPAWN_TARGET and token != self.target_token:
+                continue  # agendamento cancelado
+
+            free = [lane for lane in lanes
+                    if lane not in used and lane.entry_is_clear(self.min_gap)]
+            if not free:
+                # Escadas cheias: tenta de novo em breve
+                self._push(now + RETRY_DELAY, kind, token)
+                break
+
+            lane = self.rng.choice(free)
+            used.append(lane)
+            spawns.append((kind, lane))
+
+            if kind == SPAWN_DISTRACTOR:
+                # Próximo distrator conta a partir do vencimento, não do frame atual
+                self._push(max(due + self.distractor_interval, now), SPAWN_DISTRACTOR)
+        return spawns
+
+    def report_outcome(self, success, lapse=False):
+        """Informa o resultado de uma seleção para ajustar a densidade de spawns
+
+        lapse indica uma reação anormalmente lenta (ver attention_metrics.py),
+        tratada como sinal de sobrecarga mesmo quando a seleção foi correta.
+        """
+        self.running_accuracy += 0.2 * ((1.0 if success else 0.0) - self.running_accuracy)
+        if not self.adaptive:
+            return
+
+        # Acima da precisão alvo: mais personagens; abaixo ou após um lapso: menos
+        if self.running_accuracy > self.target_accuracy and not lapse:
+            self.distractor_interval *= 0.9
+        else:
+            self.distractor_interval *= 1.1
+        self.distractor_interval = min(self.max_interval,
+                                       max(self.min_interval, self.distractor_interval))
+
+    def reset_density(self):
+        """Volta à densidade inicial"""
+        self.distractor_interval = self.base_interval
+        self.running_accuracy = self.target_accuracy
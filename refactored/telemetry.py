@@ -0,0 +1,110 @@
+"""
+Telemetria ao vivo do jogo para um monitor externo
+
+Os eventos (tentativas concluídas, início de sessão, métricas da sessão e
+estatísticas de tempo de frame) são enviados como datagramas UDP com JSON
+em um socket não bloqueante: o envio nunca espera pela rede e, se o buffer
+do sistema estiver cheio ou ninguém estiver ouvindo, o evento é descartado.
+Vários quiosques podem enviar para o mesmo monitor (ver
+python-data-viz/src/visualization/live_monitor.py); cada mensagem leva o
+identificador do quiosque e um número de sequência para o monitor detectar
+perdas.
+
+Formato: {"v": 1, "kiosk": str, "seq": int, "time": float, "kind": str, "data": {...}}
+"""
+import json
+import math
+import socket
+import time
+from collections import deque
+
+from config import TELEMETRY_ADDRESS, TELEMETRY_INTERVAL, TELEMETRY_KIOSK_ID
+
+PROTOCOL_VERSION = 1
+# Maior datagrama enviado; acima disso o evento é descartado
+MAX_DATAGRAM = 60000
+# Frames considerados nas estatísticas de cada relatório
+FRAME_WINDOW = 600
+
+
+class FrameStats:
+    """Janela dos últimos tempos de frame (intervalo total e tempo de trabalho)"""
+    def __init__(self, window=FRAME_WINDOW, budget=1 / 60):
+        self.intervals = deque(maxlen=window)
+        self.work = deque(maxlen=window)
+        self.budget = budget
+
+    def add(self, interval, work):
+        self.intervals.append(interval)
+        self.work.append(work)
+
+    def summary(self):
+        """FPS, média, p95 e máximo (em ms) dos frames da janela"""
+        if not self.intervals:
+            return {"frames": 0}
+        intervals = sorted(self.intervals)
+        work = sorted(self.work)
+        p95 = min(len(intervals) - 1, math.ceil(0.95 * len(intervals)) - 1)
+        mean_interval = sum(intervals) / len(intervals)
+        return {
+            "frames": len(intervals),
+            "fps": 1 / mean_interval if mean_interval > 0 else 0.0,
+            "interval_mean_ms": mean_interval * 1000,
+            "interval_p95_ms": intervals[p95] * 1000,
+            "interval_max_ms": intervals[-1] * 1000,
+            "work_mean_ms": sum(work) / len(work) * 1000,
+            "work_p95_ms": work[p95] * 1000,
+            "over_budget": sum(1 for value in intervals if value > 1.5 * self.budget)
+        }
+
+
+class TelemetryPublisher:
+    """Envia eventos de telemetria por UDP sem bloquear o loop do jogo"""
+    def __init__(self, address=TELEMETRY_ADDRESS, kiosk_id=TELEMETRY_KIOSK_ID,
+                 interval=TELEMETRY_INTERVAL):
+        self.address = tuple(address)
+        self.kiosk_id = kiosk_id or socket.gethostname()
+        self.interval = interval
+        self.sequence = 0
+        self.sent = 0
+        self.dropped = 0
+        self.frames = FrameStats()
+        self.next_report = 0.0
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.socket.setblocking(False)
+
+    def publish(self, kind, data):
+        """Envia um evento; retorna False se ele foi descartado"""
+        self.sequence += 1
+        message = {"v": PROTOCOL_VERSION, "kiosk": self.kiosk_id, "seq": self.sequence,
+                   "time": time.time(), "kind": kind, "data": data}
+        payload = json.dumps(message, separators=(",", ":"), default=str).encode("utf-8")
+        if len(payload) > MAX_DATAGRAM:
+            self.dropped += 1
+            return False
+        try:
+            self.socket.sendto(payload, self.address)
+        except OSError:
+            # Buffer cheio (BlockingIOError), rede indisponível ou monitor fechado
+            self.dropped += 1
+            return False
+        self.sent += 1
+        return True
+
+    def frame(self, interval, work, now, metrics=None):
+        """Registra um frame; a cada intervalo envia as estatísticas e as métricas
+
+        metrics é uma função sem argumentos chamada só quando o relatório é enviado.
+        """
+        self.frames.add(interval, work)
+        if now < self.next_report:
+            return
+        self.next_report = now + self.interval
+        frames = self.frames.summary()
+        frames["dropped_events"] = self.dropped
+        self.publish("frames", frames)
+        if metrics is not None:
+            self.publish("metrics", metrics())
+
+    def close(self):
+        self.socket.close()
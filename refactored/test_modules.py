@@ -4,6 +4,7 @@ Testa a importação de todos os módulos
 """
 import sys
 import os
+import json
 
 def test_imports():
     """Testa se todos os módulos importam corretamente"""
@@ -72,6 +73,303 @@ def test_character_factory():
     print(f"  ✅ Personagem criado em posição ({char.x}, {char.y})")
     print("✅ Fábrica de personagens OK!\n")
 
+def test_combination_sampler():
+    """Testa o sorteio de combinações sem repetição"""
+    print("🔍 Testando sorteio de combinações...")
+    from trait_space import TraitSpace, CombinationSampler
+    
+    space = TraitSpace([3, 15, 3, 10])
+    assert space.decode(space.encode((2, 7, 1, 9))) == (2, 7, 1, 9)
+    assert space.hamming(space.encode((0, 0, 0, 0)), space.encode((0, 1, 0, 2))) == 2
+    
+    target = space.encode((1, 1, 1, 1))
+    lookalikes = space.lookalikes(target)
+    assert len(lookalikes) == 2 + 14 + 2 + 9
+    
+    sampler = CombinationSampler(space.size)
+    excluded = lookalikes | {target}
+    drawn = [sampler.draw(exclude=excluded) for _ in range(space.size - len(excluded))]
+    assert len(set(drawn)) == len(drawn)
+    assert not excluded & set(drawn)
+    assert sampler.draw(exclude=excluded) is None
+    assert sampler.is_available(target)
+    print(f"  └─ {len(drawn)} combinações únicas sorteadas")
+    print("✅ Sorteio de combinações OK!\n")
+
+def test_distractor_generator():
+    """Testa a geração de distratores por semelhança com o alvo"""
+    print("🔍 Testando gerador de distratores...")
+    from trait_space import TraitSpace, DistractorGenerator
+    
+    space = TraitSpace([3, 15, 3, 10])
+    generator = DistractorGenerator(space, {1: 1.0})
+    target = space.encode((0, 4, 2, 7))
+    for _ in range(200):
+        code, distance = generator.sample(target)
+        assert distance == 1 and space.hamming(code, target) == 1
+    assert sum(generator.bucket_size(d) for d in range(1, 5)) == space.size - 1
+    print("  └─ Distratores com 1 característica diferente do alvo")
+    print("✅ Gerador de distratores OK!\n")
+
+def test_character_pool():
+    """Testa o reaproveitamento de personagens nas escadas"""
+    print("🔍 Testando pool de personagens...")
+    from characters import load_assets, CharacterFactory
+    from ui_components import Escalator
+    from game_modes import CharacterMode
+    from config import HEIGHT
+    
+    factory = CharacterFactory(load_assets())
+    escalator = Escalator(0, 150, 4, (100, 100, 100), pool=factory.pool)
+    char_mode = CharacterMode(factory)
+    char_mode.select_new_target(0, 0)
+    
+    for _ in range(5):
+        char_mode.spawn_character(escalator)
+    spawned = list(escalator.characters)
+    
+    # Avança até todos saírem da tela
+    for _ in range(HEIGHT):
+        escalator.update()
+    assert len(escalator.characters) == 0
+    
+    # Novos spawns reutilizam os mesmos objetos
+    for _ in range(5):
+        char_mode.spawn_character(escalator)
+    assert all(any(c is old for old in spawned) for c in escalator.characters)
+    print(f"  └─ {len(spawned)} personagens reaproveitados")
+    print("✅ Pool de personagens OK!\n")
+
+def test_vectorized_lane():
+    """Testa se o backend numpy gera as mesmas posições do backend python"""
+    print("🔍 Testando simulação vetorizada das escadas...")
+    from characters import load_assets, CharacterFactory
+    from ui_components import Escalator
+    from lane_simulation import VectorizedEscalator
+    
+    factory = CharacterFactory(load_assets())
+    python_lane = Escalator(0, 150, 3, (100, 100, 100), pool=factory.pool)
+    numpy_lane = VectorizedEscalator(0, 150, 3, (100, 100, 100), factory)
+    
+    for frame in range(600):
+        if frame % 45 == 0:
+            character = factory.create_random_character(15, -120)
+            numpy_lane.add_character(factory.pool.acquire(15, -120, character.traits))
+            python_lane.add_character(character)
+        python_lane.update()
+        numpy_lane.update()
+        assert [c.y for c in python_lane.characters] == \
+            numpy_lane.lane.y[:numpy_lane.lane.count].tolist()
+    
+    clicked = numpy_lane.check_character_click((20, numpy_lane.lane.y[0] + 1))
+    assert clicked.traits is python_lane.characters[0].traits
+    numpy_lane.remove_character(clicked)
+    assert len(numpy_lane) == len(python_lane.characters) - 1
+    print("  └─ Posições idênticas em 600 frames")
+    print("✅ Simulação vetorizada OK!\n")
+
+def test_spawn_scheduler():
+    """Testa o agendamento de spawns por tempo e ocupação das escadas"""
+    print("🔍 Testando agendamento de spawns...")
+    from characters import load_assets, CharacterFactory
+    from ui_components import Escalator
+    from spawn_scheduler import SpawnScheduler, SPAWN_TARGET
+    
+    factory = CharacterFactory(load_assets())
+    lanes = [Escalator(i * 250, 150, speed, (100, 100, 100), pool=factory.pool)
+             for i, speed in enumerate([2, 3, 4])]
+    scheduler = SpawnScheduler(0.1, ("fixed", 2.0), min_gap=10)
+    scheduler.start(0.0)
+    
+    targets = 0
+    for frame in range(600):
+        now = frame / 60
+        for kind, lane in scheduler.due_spawns(now, lanes):
+            assert lane.entry_is_clear(10)
+            targets += kind == SPAWN_TARGET
+            lane.add_character(factory.create_random_character(lane.x, -120))
+        for lane in lanes:
+            lane.update()
+            ys = [c.y for c in lane.characters]
+            # Personagens da mesma escada nunca se sobrepõem
+            assert all(a - b >= 120 for a, b in zip(ys, ys[1:]))
+    assert targets == 1
+    print("  └─ Nenhuma sobreposição em 10 s de spawns")
+    print("✅ Agendamento de spawns OK!\n")
+
+def test_persistence():
+    """Testa a gravação atômica e o journal de tentativas"""
+    print("🔍 Testando persistência...")
+    import tempfile
+    from persistence import atomic_write_json, TrialJournal
+    
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dados", "sessao.json")
+        atomic_write_json(path, {"sessions": [1]})
+        atomic_write_json(path, {"sessions": [1, 2]})
+        with open(path) as f:
+            assert json.load(f) == {"sessions": [1, 2]}
+        assert os.listdir(os.path.dirname(path)) == ["sessao.json"]
+        print("  ├─ Gravação atômica sem temporários restantes")
+        
+        journal_path = os.path.join(directory, "journal", "trials.jsonl")
+        journal = TrialJournal(journal_path)
+        for i in range(100):
+            journal.append({"trial": i})
+        journal.close()
+        # Simula uma queda no meio da escrita da última linha
+        with open(journal_path, "a") as f:
+            f.write('{"trial": 10')
+        records = TrialJournal.replay(journal_path)
+        assert [r["trial"] for r in records] == list(range(100))
+        journal.discard()
+        assert not os.path.exists(journal_path)
+        print("  └─ Journal reaproveitado até a última linha completa")
+    print("✅ Persistência OK!\n")
+
+def test_attention_metrics():
+    """Testa as métricas de atenção incrementais"""
+    print("🔍 Testando métricas de atenção...")
+    import statistics
+    from attention_metrics import AttentionMetrics
+    
+    metrics = AttentionMetrics(idle_threshold=3.0, lapse_sd=2.0, min_trials=5)
+    reactions = [1.0, 1.2, 0.9, 1.1, 1.0, 1.05, 4.0, 0.95]
+    lapses = [metrics.record_reaction(rt, True) for rt in reactions]
+    snapshot = metrics.snapshot()
+    assert abs(snapshot["rt_mean"] - statistics.mean(reactions)) < 1e-9
+    assert abs(snapshot["rt_sd"] - statistics.stdev(reactions)) < 1e-9
+    assert lapses == [False] * 6 + [True, False] and snapshot["lapses"] == 1
+    print(f"  ├─ Welford: média {snapshot['rt_mean']:.3f} s, CV {snapshot['rt_cv']:.2f}")
+    
+    # Amostras a cada frame: só o retorno do movimento após 3 s conta uma pausa
+    now, x = 0.0, 0
+    for frame in range(600):
+        now = frame / 60
+        if not 2 <= now < 6:
+            x += 10
+        metrics.update_mouse((x, 0), now)
+    snapshot = metrics.snapshot(now)
+    assert snapshot["idle_periods"] == 1 and abs(snapshot["idle_time"] - 4.0) < 0.05
+    print(f"  └─ {snapshot['idle_periods']} pausa de {snapshot['idle_time']:.1f} s detectada")
+    print("✅ Métricas de atenção OK!\n")
+
+def test_mouse_ring():
+    """Testa o buffer circular do mouse em memória compartilhada"""
+    print("🔍 Testando buffer circular do mouse...")
+    from mouse_ring import MouseRing, RECORD
+    
+    ring = MouseRing.create(capacity=8)
+    reader = MouseRing.attach(ring.name)
+    try:
+        written = [ring.write(float(i), i, -i, 2) for i in range(10)]
+        assert written == [True] * 8 + [False] * 2 and ring.overruns == 2
+        records = list(RECORD.iter_unpack(reader.read_available()))
+        assert [r[1] for r in records] == list(range(8))
+        # Depois da leitura o espaço é liberado e a escrita dá a volta no buffer
+        for i in range(10, 15):
+            assert ring.write(float(i), i, -i, 2)
+        records = list(RECORD.iter_unpack(reader.read_available()))
+        assert [r[1] for r in records] == list(range(10, 15)) and not reader.read_available()
+        print(f"  └─ {ring.stats()['written']} registros, {ring.overruns} perdidos com o buffer cheio")
+    finally:
+        reader.release()
+        ring.release()
+    print("✅ Buffer circular do mouse OK!\n")
+
+def test_mouse_chunks():
+    """Testa o armazenamento do mouse em blocos comprimidos"""
+    print("🔍 Testando armazenamento do mouse em blocos...")
+    import tempfile
+    import zlib
+    from mouse_chunks import write_sessions, split_chunks, FOOTER
+    
+    samples = [{"timestamp": 100 + i / 60, "x": i, "y": 2 * i, "game_state": 2}
+               for i in range(1800)]
+    chunks = split_chunks(samples, trial_starts=[105, 120], max_seconds=10)
+    # Antes da 1ª tentativa, 1ª tentativa (15 s -> 2 blocos) e 2ª tentativa (10 s)
+    assert [(trial, len(chunk)) for trial, chunk in chunks] == [(None, 300), (0, 600), (0, 300), (1, 600)]
+    
+    with tempfile.TemporaryDirectory() as directory:
+        session = {"session_id": "s1", "trials": [{"trial_start_time": 105}], "mouse_tracking": samples}
+        stored = write_sessions(os.path.join(directory, "dados.json"), [session])
+        assert stored[0]["mouse_tracking"] == [] and len(session["mouse_tracking"]) == 1800
+        assert stored[0]["mouse_tracking_chunks"] == {"file": "dados.mouse", "samples": 1800, "chunks": 4}
+        with open(os.path.join(directory, "dados.mouse"), "rb") as f:
+            data = f.read()
+        offset, length, _ = FOOTER.unpack(data[-FOOTER.size:])
+        index = json.loads(zlib.decompress(data[offset:offset + length]))
+        assert [chunk["samples"] for chunk in index["chunks"]] == [300, 600, 600, 300]
+        print(f"  └─ {len(data)} bytes para {len(samples)} amostras em 4 blocos")
+    print("✅ Armazenamento do mouse OK!\n")
+
+def test_session_store():
+    """Testa os segmentos diários de sessões e o índice"""
+    print("🔍 Testando armazenamento das sessões...")
+    import tempfile
+    from datetime import datetime
+    from session_store import SessionStore, read_session
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = SessionStore(directory, kiosk_id="quiosque 1")
+        day = datetime(2026, 5, 12, 10, 0)
+        sessions = [{"session_id": f"s{i}", "username": "ana", "game_mode": i,
+                     "trials": [{"trial_start_time": 100.0 + i, "game_mode": i}]}
+                    for i in range(3)]
+        store.append(sessions[:2], day)
+        # Simula uma queda no meio da linha antes da próxima execução
+        with open(store.segment_path(day), "a") as f:
+            f.write('{"session_id": "quebrada"')
+        store.append(sessions[2:], day)
+        entries = store.entries()
+        assert [read_session(directory, entry) for entry in entries] == sessions
+        assert entries[2]["segment"] == "quiosque_1/2026-05/sessions_20260512.jsonl"
+        assert entries[2]["modes"] == [2] and entries[2]["trials"] == 1
+        assert store.rebuild_index() == entries
+        print(f"  └─ {len(entries)} sessões lidas pela posição no segmento do dia")
+    print("✅ Armazenamento das sessões OK!\n")
+
+def test_synthetic_data_matches_game():
+    """Testa se o gerador sintético do python-data-viz segue o jogo"""
+    print("🔍 Testando gerador de dados sintéticos...")
+    import tempfile
+    import importlib.util
+    import config
+    import game_modes
+    from characters import load_assets, TRAIT_SLOTS
+    from session_store import SessionStore
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "python-data-viz",
+                        "src", "utils", "synthetic_data.py")
+    spec = importlib.util.spec_from_file_location("synthetic_data", path)
+    synthetic = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(synthetic)
+
+    for name in ("WIDTH", "HEIGHT", "ESCALATOR_WIDTH", "ESCALATOR_SPACING", "GAME_STATE_PLAYING",
+                 "GAME_MODE_ARROW", "SINGLE_MODE_TARGET_DELAY", "ARROW_NOMINAL_FPS"):
+        assert getattr(synthetic, name) == getattr(config, name), name
+    assert synthetic.TARGET_INTERARRIVAL == config.TARGET_INTERARRIVAL[1:]
+    assert synthetic.QUADRANT_ZONE_CENTERS == game_modes.QUADRANT_ZONE_CENTERS
+    # Sem a pasta assets o jogo usa imagens substitutas, com outras quantidades
+    if os.path.isdir("assets"):
+        assets = load_assets()
+        for slot, plural in TRAIT_SLOTS:
+            prefix, count = synthetic.TRAITS[slot]
+            names = {asset["name"] for asset in assets[plural]}
+            assert names == {f"{prefix} {i}" for i in range(1, count + 1)}, slot
+    print("  ├─ Constantes e traços iguais aos do jogo")
+
+    with tempfile.TemporaryDirectory() as directory:
+        synthetic.generate_dataset(directory, 3, sessions=2, workers=1, seed=1, layout="segments",
+                                   kiosks=2, start_time=1_780_000_000.0)
+        for kiosk in ("quiosque_1", "quiosque_2"):
+            store = SessionStore(directory, kiosk_id=kiosk)
+            written = store.entries()
+            key = lambda entry: (entry["segment"], entry["offset"])
+            assert sorted(written, key=key) == sorted(store.rebuild_index(), key=key)
+        print("  └─ Índice gerado igual ao reconstruído pelo SessionStore")
+    print("✅ Gerador de dados sintéticos OK!\n")
+
 def test_game_modes():
     """Testa os modos de jogo"""
     print("🔍 Testando modos de jogo...")
@@ -82,6 +380,17 @@ def test_game_modes():
     arrow = ArrowMode()
     print("✅")
     
+    print("  ├─ Ângulo entre frames...", end=" ")
+    arrow.reset(now=10.0)
+    arrow.target_quadrant = 3
+    omega = arrow.angular_velocity()
+    timing = arrow.click_timing(10.0 + 50 / omega)
+    assert abs(timing["arrow_angle"] - 50) < 1e-9
+    assert timing["arrow_in_target_zone"]
+    assert abs(timing["timing_error_deg"] - 5) < 1e-9
+    assert abs(timing["timing_error_ms"] - 5000 / omega) < 1e-9
+    print("✅")
+    
     print("  ├─ Criando CharacterMode...", end=" ")
     assets = load_assets()
     factory = CharacterFactory(assets)
@@ -99,12 +408,57 @@ def test_highscore():
     print("🔍 Testando sistema de highscores...")
     from highscore_manager import HighscoreManager
     
-    manager = HighscoreManager()
+    manager = HighscoreManager(db_path=":memory:")
     print(f"  ├─ Highscores carregados")
     print(f"  ├─ Modo Infinito: {len(manager.highscores.get('infinite', []))} pontuações")
-    print(f"  └─ Modo Seta: {len(manager.highscores.get('arrow', []))} pontuações")
+    print(f"  ├─ Modo Seta: {len(manager.highscores.get('arrow', []))} pontuações")
+    
+    for score in range(1, 21):
+        manager.add_highscore("Teste", score, 2)
+    manager.add_highscore("Teste", 99, 0)  # modo sem ranking
+    assert [s["score"] for s in manager.get_mode_highscores(2)] == list(range(20, 10, -1))
+    assert manager.is_highscore(12, 2) and not manager.is_highscore(11, 2)
+    assert not manager.highscores["single"]
+    rank = manager.get_rank(15, 2)
+    assert rank["rank"] == 6 and rank["total"] == 20 and rank["percentile"] == 70.0
+    print(f"  └─ Pontuação 15: posição {rank['rank']} de {rank['total']}")
+    manager.close()
     print("✅ Sistema de highscores OK!\n")
 
+def test_highscore_json_sync():
+    """Testa o ranking compartilhado com o highscores.json do game.py"""
+    print("🔍 Testando sincronização dos highscores com o JSON...")
+    import tempfile
+    from highscore_manager import HighscoreManager
+    
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "highscores.db")
+        json_path = os.path.join(directory, "highscores.json")
+        manager = HighscoreManager(db_path=db_path)
+        manager.add_highscore("Ana", 30, 2)
+        with open(json_path, encoding="utf-8") as f:
+            exported = json.load(f)
+        assert [s["name"] for s in exported["infinite"]] == ["Ana"]
+        print("  ├─ Top 10 exportado a cada pontuação ✅")
+        
+        # game.py regrava o JSON com o top 10 que leu mais a sua pontuação
+        exported["infinite"].append({"name": "Bia", "score": 40, "date": "01/03/2026 10:00"})
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump(exported, f)
+        os.utime(json_path, ns=(0, os.stat(json_path).st_mtime_ns + 10**9))
+        assert [s["name"] for s in manager.load_highscores()["infinite"]] == ["Bia", "Ana"]
+        manager.close()
+        
+        # Reabrir não duplica as pontuações já importadas
+        manager = HighscoreManager(db_path=db_path)
+        assert manager.get_rank(0, 2)["total"] == 2
+        manager.add_highscore("Caio", 35, 2)
+        assert [s["score"] for s in manager.get_mode_highscores(2)] == [40, 35, 30]
+        assert manager.get_rank(0, 2)["total"] == 3
+        manager.close()
+    print("  └─ JSON do game.py importado sem duplicar ✅")
+    print("✅ Sincronização dos highscores OK!\n")
+
 def main():
     """Executa todos os testes"""
     print("\n" + "="*60)
@@ -121,8 +475,20 @@ def main():
     try:
         test_config()
         test_character_factory()
+        test_combination_sampler()
+        test_distractor_generator()
+        test_character_pool()
+        test_vectorized_lane()
+        test_spawn_scheduler()
+        test_persistence()
+        test_attention_metrics()
+        test_mouse_ring()
+        test_mouse_chunks()
+        test_session_store()
+        test_synthetic_data_matches_game()
         test_game_modes()
         test_highscore()
+        test_highscore_json_sync()
     except Exception as e:
         print(f"\n❌ Erro durante os testes: {e}\n")
         return
@@ -0,0 +1,187 @@
+"""
+Espaço de combinações de características, sorteio sem repetição e
+geração de distratores por dificuldade
+
+Cada combinação (corpo, rosto, cabeça, chapéu) é codificada como um inteiro
+em base mista, então nenhuma lista de combinações precisa ser materializada.
+"""
+import bisect
+import itertools
+import random
+
+
+class TraitSpace:
+    """Codifica combinações de características como inteiros (base mista)"""
+    def __init__(self, radices):
+        self.radices = tuple(radices)
+        self.size = 1
+        for radix in self.radices:
+            self.size *= radix
+
+    def encode(self, indices):
+        """Converte os índices de cada característica no código da combinação"""
+        code = 0
+        for index, radix in zip(indices, self.radices):
+            code = code * radix + index
+        return code
+
+    def decode(self, code):
+        """Converte o código da combinação nos índices de cada característica"""
+        indices = [0] * len(self.radices)
+        for slot in range(len(self.radices) - 1, -1, -1):
+            code, indices[slot] = divmod(code, self.radices[slot])
+        return tuple(indices)
+
+    def hamming(self, code_a, code_b):
+        """Número de características diferentes entre duas combinações"""
+        distance = 0
+        for radix in reversed(self.radices):
+            code_a, index_a = divmod(code_a, radix)
+            code_b, index_b = divmod(code_b, radix)
+            if index_a != index_b:
+                distance += 1
+        return distance
+
+    def lookalikes(self, code, max_distance=1):
+        """Lista as combinações que diferem de code em até max_distance características"""
+        base = self.decode(code)
+        found = set()
+        for distance in range(1, max_distance + 1):
+            for slots in itertools.combinations(range(len(self.radices)), distance):
+                choices = [
+                    [value for value in range(radix) if value != base[slot]]
+                    if slot in slots else [base[slot]]
+                    for slot, radix in enumerate(self.radices)
+                ]
+                for indices in itertools.product(*choices):
+                    found.add(self.encode(indices))
+        return found
+
+
+class CombinationSampler:
+    """Sorteio de combinações sem reposição em O(1) (Fisher–Yates preguiçoso)
+
+    A permutação é mantida de forma esparsa: só as posições trocadas ficam em
+    dicionários, então o custo de memória e de reset é proporcional ao número
+    de sorteios, não ao tamanho do espaço de combinações.
+    """
+    def __init__(self, size, rng=None):
+        self.size = size
+        self.rng = rng or random.Random()
+        self.remaining = size
+        self.code_at = {}      # posição -> código (apenas posições trocadas)
+        self.position_of = {}  # código -> posição (apenas códigos trocados)
+
+    def _swap(self, i, j):
+        code_i = self.code_at.get(i, i)
+        code_j = self.code_at.get(j, j)
+        self.code_at[i] = code_j
+        self.code_at[j] = code_i
+        self.position_of[code_j] = i
+        self.position_of[code_i] = j
+
+    def is_available(self, code):
+        """Verifica se a combinação ainda pode ser sorteada"""
+        return self.position_of.get(code, code) < self.remaining
+
+    def discard(self, code):
+        """Marca uma combinação como usada sem sorteá-la"""
+        if self.is_available(code):
+            self._swap(self.position_of.get(code, code), self.remaining - 1)
+            self.remaining -= 1
+
+    def draw(self, exclude=()):
+        """Sorteia uma combinação ainda não usada, fora do conjunto exclude
+
+        As combinações excluídas são apenas escondidas durante o sorteio e
+        continuam disponíveis depois. Retorna None se não houver candidatas.
+        """
+        end = self.remaining
+        for code in exclude:
+            position = self.position_of.get(code, code)
+            if position < end:
+                self._swap(position, end - 1)
+                end -= 1
+
+        if end == 0:
+            return None
+
+        position = self.rng.randrange(end)
+        code = self.code_at.get(position, position)
+        # Leva o sorteado para o fim da região ativa; as excluídas continuam dentro dela
+        self._swap(position, self.remaining - 1)
+        self.remaining -= 1
+        return code
+
+    def reset(self):
+        """Torna todas as combinações disponíveis novamente"""
+        self.remaining = self.size
+        self.code_at.clear()
+        self.position_of.clear()
+
+
+class DistractorGenerator:
+    """Sorteia distratores com uma mistura configurada de dificuldade
+
+    A dificuldade é a distância de Hamming ao alvo: 1 = difere em uma só
+    característica (quase igual ao alvo), 4 = difere em todas. O índice de
+    similaridade é pré-calculado uma vez para o espaço inteiro: para cada
+    distância, os conjuntos de características que podem diferir e quantas
+    combinações cada um gera. Assim qualquer alvo é atendido em O(1), sorteando
+    uniformemente dentro da faixa de distância sem listar combinações.
+    """
+    def __init__(self, space, difficulty_mix, rng=None):
+        self.space = space
+        self.rng = rng or random.Random()
+
+        # distância -> (conjuntos de posições, pesos acumulados)
+        self.similarity_index = {}
+        slots = range(len(space.radices))
+        for distance in range(1, len(space.radices) + 1):
+            subsets = []
+            cumulative = []
+            total = 0
+            for subset in itertools.combinations(slots, distance):
+                count = 1
+                for slot in subset:
+                    count *= space.radices[slot] - 1
+                if count:
+                    total += count
+                    subsets.append(subset)
+                    cumulative.append(total)
+            self.similarity_index[distance] = (subsets, cumulative)
+
+        # Mistura de distâncias, ignorando faixas vazias
+        self.distances = []
+        self.mix_cumulative = []
+        total = 0.0
+        for distance, weight in sorted(difficulty_mix.items()):
+            if weight > 0 and self.bucket_size(distance) > 0:
+                total += weight
+                self.distances.append(distance)
+                self.mix_cumulative.append(total)
+        if not self.distances:
+            raise ValueError("A mistura de dificuldade não tem nenhuma distância possível")
+
+    def bucket_size(self, distance):
+        """Quantas combinações estão a exatamente essa distância de qualquer alvo"""
+        cumulative = self.similarity_index.get(distance, ((), ()))[1]
+        return cumulative[-1] if cumulative else 0
+
+    def sample(self, target_code):
+        """Sorteia um distrator para o alvo; retorna (código, distância)"""
+        point = self.rng.random() * self.mix_cumulative[-1]
+        distance = self.distances[bisect.bisect_right(self.mix_cumulative, point)]
+
+        subsets, cumulative = self.similarity_index[distance]
+        pick = self.rng.randrange(cumulative[-1])
+        subset = subsets[bisect.bisect_right(cumulative, pick)]
+
+        indices = list(self.space.decode(target_code))
+        for slot in subset:
+            # Valor diferente do alvo, uniforme entre os demais
+            value = self.rng.randrange(self.space.radices[slot] - 1)
+            if value >= indices[slot]:
+                value += 1
+            indices[slot] = value
+        return self.space.encode(indices), distance
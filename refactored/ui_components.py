@@ -2,7 +2,12 @@
 Componentes de UI do jogo (botões, inputs de texto, etc)
 """
 import pygame
-from config import BUTTON_FONT, SMALL_FONT
+from collections import deque
+from config import BUTTON_FONT, SMALL_FONT, HEIGHT, ESCALATOR_SPEEDS, CHARACTER_SIZE
+
+# Degrau em que os personagens entram na escada (acima da tela)
+ENTRY_STEP = -3
+STEP_HEIGHT = 20
 
 
 class Button:
@@ -114,36 +119,63 @@ class TextInput:
 
 
 class Escalator:
-    """Escada rolante que contém personagens"""
-    def __init__(self, x, width, speed, color):
+    """Escada rolante que contém personagens
+    
+    Os personagens ficam em uma fila (ring buffer): todos entram no topo e
+    descem com a mesma velocidade, então o mais antigo é sempre o primeiro a
+    sair da tela e pode ser removido em O(1) sem copiar a lista.
+    """
+    def __init__(self, x, width, speed, color, pool=None):
         self.x = x
         self.width = width
         self.speed = speed
         self.color = color
-        self.characters = []
+        self.pool = pool
+        self.characters = deque()
         self.step_offset = 0
     
     def add_character(self, character):
         """Adiciona um personagem à escada"""
-        from config import ESCALATOR_SPEEDS
         character.escalator_index = ESCALATOR_SPEEDS.index(self.speed)
-        character.current_step = -3
+        character.current_step = ENTRY_STEP
         character.step_position = 0
         self.characters.append(character)
     
+    def entry_is_clear(self, min_gap=0):
+        """Verifica se há espaço no topo da escada para um novo personagem"""
+        if not self.characters:
+            return True
+        return self.characters[-1].y >= ENTRY_STEP * STEP_HEIGHT + CHARACTER_SIZE + min_gap
+    
+    def remove_character(self, character):
+        """Remove um personagem da escada e devolve ao pool"""
+        self.characters.remove(character)
+        if self.pool is not None:
+            self.pool.release(character)
+    
+    def clear(self):
+        """Remove todos os personagens da escada"""
+        while self.characters:
+            character = self.characters.pop()
+            if self.pool is not None:
+                self.pool.release(character)
+    
     def update(self):
         """Atualiza a escada e seus personagens"""
-        from config import HEIGHT
         self.step_offset = (self.step_offset + self.speed) % 20
         
-        for character in self.characters[:]:
+        characters = self.characters
+        for character in characters:
             character.update(self.speed, self)
-            if character.y > HEIGHT:
-                self.characters.remove(character)
+        
+        # Os que saíram da tela estão sempre no início da fila
+        while characters and characters[0].y > HEIGHT:
+            character = characters.popleft()
+            if self.pool is not None:
+                self.pool.release(character)
     
     def draw(self, screen):
         """Desenha a escada e seus personagens"""
-        from config import HEIGHT
         pygame.draw.rect(screen, self.color, (self.x, 0, self.width, HEIGHT))
         
         step_height = 20